@@ -0,0 +1,4 @@
+"""Microbenchmarks for the NordStar toolkit hot paths.
+
+Run with ``python -m benchmarks.toolkit_bench``.
+"""
@@ -0,0 +1,224 @@
+"""Fixtures for the toolkit microbenchmarks.
+
+Each fixture mirrors the shape of the upstream API response that the toolkit
+consumes (Injective indexer, KuCoin OHLCV, DeFiLlama). Recorded responses can
+be dropped into a fixtures directory as ``<name>.json``; they are cycled to
+reach the requested size. When no recording exists a deterministic synthetic
+payload of the same shape is generated instead, so runs stay comparable
+across commits.
+"""
+
+import json
+import os
+import random
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+SEED = 1234
+
+CATEGORIES = [
+    "Dexes",
+    "Lending",
+    "Liquid Staking",
+    "Bridge",
+    "CDP",
+    "Yield",
+    "Derivatives",
+    "RWA",
+]
+
+CHAINS = [
+    "Ethereum",
+    "Injective",
+    "Solana",
+    "Arbitrum",
+    "Optimism",
+    "Polygon",
+    "Base",
+]
+
+
+def load_recorded(fixtures_dir: Optional[str], name: str) -> Optional[Any]:
+    """Load a recorded API response if one exists.
+
+    Args:
+        fixtures_dir: Directory holding recorded ``<name>.json`` payloads
+        name: Fixture name
+
+    Returns:
+        The decoded payload, or None if nothing was recorded
+    """
+    if not fixtures_dir:
+        return None
+    path = os.path.join(fixtures_dir, f"{name}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def scale(records: List[Any], size: int) -> List[Any]:
+    """Cycle (or truncate) recorded records to exactly ``size`` entries."""
+    if not records:
+        return []
+    return [records[i % len(records)] for i in range(size)]
+
+
+def make_protocols(size: int, fixtures_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """DeFiLlama ``/protocols`` payload with ``size`` protocols."""
+    recorded = load_recorded(fixtures_dir, "protocols")
+    if recorded is not None:
+        return scale(recorded, size)
+
+    rng = random.Random(SEED)
+    protocols = []
+    for i in range(size):
+        chains = rng.sample(CHAINS, rng.randint(1, 4))
+        protocols.append(
+            {
+                "name": f"protocol-{i}",
+                "category": rng.choice(CATEGORIES),
+                "tvl": rng.uniform(1e4, 5e9),
+                "change_1d": rng.uniform(-15, 15),
+                "change_7d": rng.uniform(-40, 40),
+                "chains": chains,
+            }
+        )
+    return protocols
+
+
+def make_ohlcv(size: int, fixtures_dir: Optional[str] = None) -> List[List[float]]:
+    """KuCoin ``fetch_ohlcv`` payload with ``size`` candles."""
+    recorded = load_recorded(fixtures_dir, "ohlcv")
+    if recorded is not None:
+        return scale(recorded, size)
+
+    rng = random.Random(SEED)
+    candles = []
+    price = 25.0
+    timestamp = 1_700_000_000_000
+    for _ in range(size):
+        open_price = price
+        price = max(0.01, price * (1 + rng.gauss(0, 0.01)))
+        high = max(open_price, price) * (1 + rng.uniform(0, 0.005))
+        low = min(open_price, price) * (1 - rng.uniform(0, 0.005))
+        candles.append([timestamp, open_price, high, low, price, rng.uniform(1e3, 1e6)])
+        timestamp += 3_600_000
+    return candles
+
+
+def make_orderbook(size: int, fixtures_dir: Optional[str] = None) -> SimpleNamespace:
+    """Injective ``get_spot_orderbook`` response with ``size`` levels per side."""
+    recorded = load_recorded(fixtures_dir, "orderbook")
+    if recorded is not None:
+        buys = scale(recorded["buys"], size)
+        sells = scale(recorded["sells"], size)
+    else:
+        rng = random.Random(SEED)
+        mid = 25.0
+        buys = [
+            {"price": str(mid - 0.01 * (i + 1)), "quantity": str(rng.uniform(1, 500))}
+            for i in range(size)
+        ]
+        sells = [
+            {"price": str(mid + 0.01 * (i + 1)), "quantity": str(rng.uniform(1, 500))}
+            for i in range(size)
+        ]
+
+    return SimpleNamespace(
+        orderbook=SimpleNamespace(
+            buys=[SimpleNamespace(**order) for order in buys],
+            sells=[SimpleNamespace(**order) for order in sells],
+        )
+    )
+
+
+def make_spot_market(market_id: str) -> SimpleNamespace:
+    """Injective ``get_spot_market`` response for a single INJ/USDT market."""
+    return SimpleNamespace(
+        market=SimpleNamespace(
+            market_id=market_id,
+            base_token=SimpleNamespace(symbol="INJ"),
+            quote_token=SimpleNamespace(symbol="USDT"),
+            mark_price="25.0",
+            price_24h_change="1.5",
+            volume_24h="1000000",
+            min_price_tick_size="0.001",
+            min_quantity_tick_size="0.001",
+        )
+    )
+
+
+def write_json_document(directory: str, size: int) -> str:
+    """Write a JSON document with ``size`` records and return its path."""
+    rng = random.Random(SEED)
+    records = [
+        {
+            "id": i,
+            "market": f"market-{i % 50}",
+            "price": rng.uniform(0, 100),
+            "tags": ["spot", "inj"],
+        }
+        for i in range(size)
+    ]
+    path = os.path.join(directory, f"records_{size}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f)
+    return path
+
+
+def write_xml_document(directory: str, size: int) -> str:
+    """Write an XML document with ``size`` records and return its path."""
+    rng = random.Random(SEED)
+    rows = "".join(
+        f"<record id=\"{i}\"><market>market-{i % 50}</market>"
+        f"<price>{rng.uniform(0, 100):.4f}</price></record>"
+        for i in range(size)
+    )
+    path = os.path.join(directory, f"records_{size}.xml")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"<records>{rows}</records>")
+    return path
+
+
+def write_text_document(directory: str, size: int) -> str:
+    """Write a python source document with ``size`` lines and return its path."""
+    path = os.path.join(directory, f"script_{size}.py")
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(size):
+            f.write(f"value_{i} = {i} * 2  # generated line {i}\n")
+    return path
+
+
+class FakeResponse:
+    """Minimal stand-in for ``requests.Response`` that decodes on ``json()``."""
+
+    def __init__(self, payload: Any, status_code: int = 200):
+        self._text = json.dumps(payload)
+        self.status_code = status_code
+
+    def json(self) -> Any:
+        return json.loads(self._text)
+
+
+class FakeInjectiveClient:
+    """Replays recorded Injective indexer responses."""
+
+    def __init__(self, orderbook: SimpleNamespace):
+        self._orderbook = orderbook
+
+    def get_spot_market(self, market_id: str) -> SimpleNamespace:
+        return make_spot_market(market_id)
+
+    def get_spot_orderbook(self, market_id: str) -> SimpleNamespace:
+        return self._orderbook
+
+
+class FakeExchange:
+    """Replays recorded ``ccxt`` OHLCV candles."""
+
+    def __init__(self, ohlcv: List[List[float]]):
+        self._ohlcv = ohlcv
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int = 100):
+        return self._ohlcv
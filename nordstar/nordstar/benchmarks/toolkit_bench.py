@@ -0,0 +1,332 @@
+"""Toolkit microbenchmark suite with regression tracking.
+
+Runs each toolkit entry point against recorded (or synthetic) fixtures at
+several data sizes, reports wall time and peak memory, and stores the
+results as JSON so they can be compared across commits.
+
+Usage (from ``nordstar/nordstar``)::
+
+    python -m benchmarks.toolkit_bench --sizes 10 100 1000
+    python -m benchmarks.toolkit_bench --compare benchmarks/results/<commit>.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from unittest import mock
+
+from . import fixtures
+
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+MARKET_ID = "0x0611780ba69656949525013d947713300f56c37b6175e02f26bffa495c3208fe"
+
+
+@dataclass
+class BenchmarkCase:
+    """A single benchmarked toolkit call.
+
+    Args:
+        name: Name of the toolkit entry point being measured
+        size: Size of the fixture the call runs against
+        setup: Callable that prepares the fixture, enters any patches on the
+            given ``ExitStack`` and returns the zero-argument call to measure
+    """
+
+    name: str
+    size: int
+    setup: Callable[[ExitStack], Callable[[], Any]]
+
+
+def run_case(case: BenchmarkCase, repeat: int = 5, warmup: int = 1) -> Dict[str, Any]:
+    """Measure a benchmark case.
+
+    Timing runs are done without tracemalloc, which would otherwise distort
+    them; peak memory is taken from one additional traced run.
+
+    Args:
+        case: The case to run
+        repeat: Number of timed runs
+        warmup: Number of untimed runs before measuring
+
+    Returns:
+        Dictionary with timing statistics (seconds) and peak memory (KiB)
+    """
+    with ExitStack() as stack:
+        call = case.setup(stack)
+
+        for _ in range(warmup):
+            call()
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "name": case.name,
+        "size": case.size,
+        "repeat": repeat,
+        "min_s": min(timings),
+        "mean_s": statistics.mean(timings),
+        "median_s": statistics.median(timings),
+        "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "peak_kib": peak / 1024,
+    }
+
+
+def _injective_cases(sizes: List[int], fixtures_dir: Optional[str]) -> List[BenchmarkCase]:
+    from toolkits import injective_toolkit
+    from toolkits.injective_toolkit import InjectiveToolkit
+
+    def order_book_case(size: int) -> BenchmarkCase:
+        def setup(stack: ExitStack) -> Callable[[], Any]:
+            toolkit = InjectiveToolkit()
+            client = fixtures.FakeInjectiveClient(fixtures.make_orderbook(size, fixtures_dir))
+            toolkit._get_client = lambda: client
+            return lambda: toolkit.analyze_order_book(MARKET_ID, depth=size)
+
+        return BenchmarkCase("analyze_order_book", size, setup)
+
+    def indicators_case(size: int) -> BenchmarkCase:
+        def setup(stack: ExitStack) -> Callable[[], Any]:
+            toolkit = InjectiveToolkit()
+            client = fixtures.FakeInjectiveClient(fixtures.make_orderbook(1, fixtures_dir))
+            toolkit._get_client = lambda: client
+            # Keep at least the 50 candles the SMA-50 needs
+            exchange = fixtures.FakeExchange(fixtures.make_ohlcv(max(size, 64), fixtures_dir))
+            stack.enter_context(
+                mock.patch.object(injective_toolkit, "ccxt", mock.Mock(kucoin=lambda: exchange))
+            )
+            return lambda: toolkit.calculate_technical_indicators(MARKET_ID, timeframe="1h")
+
+        return BenchmarkCase("calculate_technical_indicators", size, setup)
+
+    return [order_book_case(size) for size in sizes] + [
+        indicators_case(size) for size in sizes
+    ]
+
+
+def _web3_cases(sizes: List[int], fixtures_dir: Optional[str]) -> List[BenchmarkCase]:
+    from toolkits import web3_analysis_toolkit
+    from toolkits.web3_analysis_toolkit import Web3AnalysisToolkit
+
+    def defi_trends_case(size: int) -> BenchmarkCase:
+        def setup(stack: ExitStack) -> Callable[[], Any]:
+            toolkit = Web3AnalysisToolkit()
+            payload = fixtures.make_protocols(size, fixtures_dir)
+            stack.enter_context(
+                mock.patch.object(
+                    web3_analysis_toolkit.requests,
+                    "get",
+                    lambda *args, **kwargs: fixtures.FakeResponse(payload),
+                )
+            )
+            return lambda: toolkit.track_defi_trends()
+
+        return BenchmarkCase("track_defi_trends", size, setup)
+
+    return [defi_trends_case(size) for size in sizes]
+
+
+def _document_cases(sizes: List[int], fixtures_dir: Optional[str]) -> List[BenchmarkCase]:
+    from utils.document_toolkit import DocumentProcessingToolkit
+
+    writers = {
+        "json": fixtures.write_json_document,
+        "xml": fixtures.write_xml_document,
+        "py": fixtures.write_text_document,
+    }
+
+    def document_case(kind: str, size: int, cached: bool = False) -> BenchmarkCase:
+        def setup(stack: ExitStack) -> Callable[[], Any]:
+            directory = stack.enter_context(tempfile.TemporaryDirectory())
+            path = writers[kind](directory, size)
+            # Without the document cache, the warmup run would turn every
+            # timed run into a cache hit
+            toolkit = DocumentProcessingToolkit(cache_dir=directory, use_cache=cached)
+            return lambda: toolkit.extract_document_content(path)
+
+        name = f"extract_document_content[{kind}{',cached' if cached else ''}]"
+        return BenchmarkCase(name, size, setup)
+
+    return [
+        document_case(kind, size, cached)
+        for cached in (False, True)
+        for kind in writers
+        for size in sizes
+    ]
+
+
+CASE_GROUPS: Dict[str, Callable[[List[int], Optional[str]], List[BenchmarkCase]]] = {
+    "injective": _injective_cases,
+    "web3": _web3_cases,
+    "document": _document_cases,
+}
+
+
+def _git_commit() -> str:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return "unknown"
+
+
+def run_benchmarks(
+    sizes: Optional[List[int]] = None,
+    groups: Optional[List[str]] = None,
+    repeat: int = 5,
+    fixtures_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run the benchmark suite.
+
+    Groups whose toolkit dependencies cannot be imported are skipped and
+    reported under ``skipped``.
+
+    Args:
+        sizes: Fixture sizes to run each case at
+        groups: Case groups to run (default: all of ``CASE_GROUPS``)
+        repeat: Number of timed runs per case
+        fixtures_dir: Directory with recorded API responses
+
+    Returns:
+        Dictionary with run metadata and per-case results
+    """
+    sizes = sizes or DEFAULT_SIZES
+    results = []
+    skipped = {}
+
+    for group in groups or list(CASE_GROUPS):
+        try:
+            cases = CASE_GROUPS[group](sizes, fixtures_dir)
+        except ImportError as e:
+            print(f"Skipping {group} benchmarks: {e}")
+            skipped[group] = str(e)
+            continue
+
+        for case in cases:
+            result = run_case(case, repeat=repeat)
+            print(
+                f"{result['name']:<42} size={result['size']:<7} "
+                f"median={result['median_s'] * 1000:9.3f} ms "
+                f"peak={result['peak_kib']:10.1f} KiB"
+            )
+            results.append(result)
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.2,
+) -> List[Dict[str, Any]]:
+    """Compare two benchmark runs.
+
+    Args:
+        baseline: Results of the reference run
+        current: Results of the run being checked
+        threshold: Allowed relative slowdown of the median time (or growth
+            of peak memory) before a case counts as a regression
+
+    Returns:
+        List of regressed cases with their baseline and current numbers
+    """
+    reference = {(r["name"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        base = reference.get((result["name"], result["size"]))
+        if base is None:
+            continue
+        for metric in ["median_s", "peak_kib"]:
+            if base[metric] <= 0:
+                continue
+            ratio = result[metric] / base[metric]
+            if ratio > 1 + threshold:
+                regressions.append(
+                    {
+                        "name": result["name"],
+                        "size": result["size"],
+                        "metric": metric,
+                        "baseline": base[metric],
+                        "current": result[metric],
+                        "ratio": ratio,
+                    }
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="NordStar toolkit microbenchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--groups", nargs="+", choices=list(CASE_GROUPS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fixtures-dir", help="Directory with recorded API responses")
+    parser.add_argument("--output-dir", default=DEFAULT_RESULTS_DIR)
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        sizes=args.sizes,
+        groups=args.groups,
+        repeat=args.repeat,
+        fixtures_dir=args.fixtures_dir,
+    )
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir, f"{report['commit']}.json")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+    print(f"Saved results to {output_path}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, report, threshold=args.threshold)
+        for r in regressions:
+            print(
+                f"REGRESSION {r['name']} size={r['size']} {r['metric']}: "
+                f"{r['baseline']:.6g} -> {r['current']:.6g} ({r['ratio']:.2f}x)"
+            )
+        if regressions:
+            return 1
+        print(f"No regressions against {baseline.get('commit', args.compare)}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+r"""Tests of the tool result cache, run from ``nordstar/nordstar``::
+
+    python -m pytest tests
+"""
+
+from collections import Counter
+
+from camel.toolkits import FunctionTool
+
+from toolkits.compact import compact_tool
+from utils.tool_cache import ToolResultCache, _instance_key, cached_tools
+
+
+# Calls made by each network and API key
+CALLS: Counter = Counter()
+
+
+class FakeToolkit:
+    def __init__(self, network: str, api_key: str = "secret-key"):
+        self.network = network
+        self.api_key = api_key
+
+    def get_price(self, symbol: str) -> dict:
+        r"""Get the price of a token.
+
+        Args:
+            symbol (str): The token symbol.
+        """
+        CALLS[self.network, self.api_key] += 1
+        return {"network": self.network, "symbol": symbol}
+
+    def get_tools(self, compact_output: bool = False):
+        tools = [FunctionTool(self.get_price)]
+        if compact_output:
+            tools = [compact_tool(tool) for tool in tools]
+        return tools
+
+
+def _call(toolkit: FakeToolkit, cache: ToolResultCache, compact_output: bool):
+    (tool,) = cached_tools(toolkit.get_tools(compact_output), cache=cache)
+    return tool.func(symbol="INJ")
+
+
+def test_compact_and_cached_tools_are_keyed_by_toolkit():
+    CALLS.clear()
+    cache = ToolResultCache()
+    mainnet, testnet = FakeToolkit("mainnet"), FakeToolkit("testnet")
+
+    assert _call(mainnet, cache, compact_output=True)["network"] == "mainnet"
+    assert _call(testnet, cache, compact_output=True)["network"] == "testnet"
+    assert _call(mainnet, cache, compact_output=True)["network"] == "mainnet"
+    assert CALLS == {("mainnet", "secret-key"): 1, ("testnet", "secret-key"): 1}
+    assert cache.hits == 1
+
+
+def test_accounts_do_not_share_results():
+    CALLS.clear()
+    cache = ToolResultCache()
+    first, second = FakeToolkit("mainnet", "key-a"), FakeToolkit("mainnet", "key-b")
+
+    _call(first, cache, compact_output=False)
+    _call(second, cache, compact_output=False)
+    assert CALLS == {("mainnet", "key-a"): 1, ("mainnet", "key-b"): 1}
+
+
+def test_instance_key_hides_secrets():
+    toolkit = FakeToolkit("mainnet")
+    (tool,) = toolkit.get_tools(compact_output=True)
+
+    key = _instance_key(tool.func)
+    assert key.startswith(f"{FakeToolkit.__module__}.FakeToolkit|")
+    assert "secret-key" not in key and "mainnet" not in key
@@ -2,5 +2,6 @@
 
 from .injective_toolkit import InjectiveToolkit
 from .web3_analysis_toolkit import Web3AnalysisToolkit
+from .compact import compact_response, compact_tool
 
-__all__ = ["InjectiveToolkit", "Web3AnalysisToolkit"]
\ No newline at end of file
+__all__ = ["InjectiveToolkit", "Web3AnalysisToolkit", "compact_response", "compact_tool"]
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""Compact encoding of toolkit responses.
+
+Toolkit methods return nested dictionaries that are serialized straight into
+the LLM context. Lists of records repeat every key for every row, and floats
+carry far more digits than an agent can use. The helpers in this module
+rewrite such responses into a columnar form with rounded numbers and bounded
+row counts, which costs far fewer prompt tokens per round.
+"""
+
+import functools
+import math
+from typing import Any, Dict, List, Optional
+
+from camel.toolkits import FunctionTool
+
+
+def _round_number(value: float, significant_digits: int) -> Optional[float]:
+    """Round a float to a number of significant digits."""
+    if math.isnan(value) or math.isinf(value):
+        return None
+    if value == 0:
+        return 0.0
+    rounded = float(f"{value:.{significant_digits}g}")
+    return int(rounded) if rounded.is_integer() and abs(rounded) < 1e15 else rounded
+
+
+def _is_table(value: Any) -> bool:
+    """Whether a list is a list of records worth encoding as a table."""
+    return len(value) > 1 and all(isinstance(item, dict) for item in value)
+
+
+def compact_response(
+    value: Any,
+    significant_digits: int = 6,
+    max_rows: Optional[int] = 20,
+    fields: Optional[List[str]] = None,
+) -> Any:
+    """Encode a toolkit response compactly.
+
+    Lists of records become ``{"columns": [...], "rows": [[...], ...]}``,
+    floats are rounded to ``significant_digits`` and lists are cut to
+    ``max_rows`` entries (with ``total_rows`` recording the original length).
+
+    Args:
+        value: The response to encode
+        significant_digits: Significant digits kept for floats
+        max_rows: Maximum number of rows kept per list (None keeps all)
+        fields: Columns to keep in tables (None keeps all)
+
+    Returns:
+        The compacted response
+    """
+    if isinstance(value, bool) or value is None or isinstance(value, (int, str)):
+        return value
+
+    if isinstance(value, float):
+        return _round_number(value, significant_digits)
+
+    if hasattr(value, "item") and callable(value.item):
+        # numpy / pandas scalars
+        try:
+            return compact_response(value.item(), significant_digits, max_rows, fields)
+        except (TypeError, ValueError):
+            return str(value)
+
+    if isinstance(value, dict):
+        return {
+            key: compact_response(item, significant_digits, max_rows, fields)
+            for key, item in value.items()
+        }
+
+    if isinstance(value, (list, tuple)):
+        total_rows = len(value)
+        rows = list(value) if max_rows is None else list(value)[:max_rows]
+
+        if _is_table(value):
+            columns: List[str] = []
+            for row in rows:
+                for key in row:
+                    if key not in columns and (fields is None or key in fields):
+                        columns.append(key)
+            table: Dict[str, Any] = {
+                "columns": columns,
+                "rows": [
+                    [
+                        compact_response(row.get(column), significant_digits, max_rows, fields)
+                        for column in columns
+                    ]
+                    for row in rows
+                ],
+            }
+            if len(rows) < total_rows:
+                table["total_rows"] = total_rows
+            return table
+
+        items = [compact_response(item, significant_digits, max_rows, fields) for item in rows]
+        if len(rows) < total_rows:
+            items.append(f"... {total_rows - len(rows)} more")
+        return items
+
+    return str(value)
+
+
+def compact_tool(
+    tool: FunctionTool,
+    significant_digits: int = 6,
+    max_rows: Optional[int] = 20,
+    fields: Optional[List[str]] = None,
+) -> FunctionTool:
+    """Wrap a FunctionTool so that its results are compacted.
+
+    The wrapped tool keeps the original name, docstring and schema, so the
+    agent sees the same tool; only the encoding of its results changes.
+
+    Args:
+        tool: The tool to wrap
+        significant_digits: Significant digits kept for floats
+        max_rows: Maximum number of rows kept per list
+        fields: Columns to keep in tables
+
+    Returns:
+        The wrapped tool
+    """
+    func = tool.func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return compact_response(
+            func(*args, **kwargs),
+            significant_digits=significant_digits,
+            max_rows=max_rows,
+            fields=fields,
+        )
+
+    return FunctionTool(wrapper, openai_tool_schema=tool.get_openai_tool_schema())
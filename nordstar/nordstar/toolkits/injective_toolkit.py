@@ -19,6 +19,8 @@ from pyinjective.constant import Network
 from camel.toolkits import FunctionTool, ToolSpecification, BaseTool
 from camel.types import get_tool_schema
 
+from .compact import compact_tool
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +32,10 @@ class InjectiveToolkit(BaseTool):
         network: str = "mainnet",
         api_key: Optional[str] = None,
         timeout: int = 30,
+        compact_output: bool = False,
+        significant_digits: int = 6,
+        max_rows: Optional[int] = 20,
+        compact_fields: Optional[Dict[str, List[str]]] = None,
     ):
         """Initialize the InjectiveToolkit.
 
@@ -37,12 +43,22 @@ class InjectiveToolkit(BaseTool):
             network: Which Injective network to connect to ('mainnet', 'testnet')
             api_key: Optional API key for rate limit increases
             timeout: Timeout for API requests in seconds
+            compact_output: Whether tool results are returned in the compact
+                columnar encoding (see ``toolkits.compact``)
+            significant_digits: Significant digits kept for floats in compact mode
+            max_rows: Maximum rows per list in compact mode
+            compact_fields: Optional mapping of tool name to the table columns
+                kept in compact mode
         """
         super().__init__()
         self.network = Network.mainnet() if network == "mainnet" else Network.testnet()
         self.api_key = api_key or os.environ.get("INJECTIVE_API_KEY")
         self.timeout = timeout
         self._client = None
+        self.compact_output = compact_output
+        self.significant_digits = significant_digits
+        self.max_rows = max_rows
+        self.compact_fields = compact_fields or {}
 
     async def _get_client(self) -> AsyncClient:
         """Get or create an AsyncClient instance."""
@@ -286,9 +302,20 @@ class InjectiveToolkit(BaseTool):
 
     def get_tools(self) -> List[FunctionTool]:
         """Get all available tools in this toolkit."""
-        return [
+        tools = [
             FunctionTool(self.get_market_data),
             FunctionTool(self.analyze_order_book),
             FunctionTool(self.calculate_technical_indicators),
             FunctionTool(self.list_markets),
-        ]
\ No newline at end of file
+        ]
+        if self.compact_output:
+            tools = [
+                compact_tool(
+                    tool,
+                    significant_digits=self.significant_digits,
+                    max_rows=self.max_rows,
+                    fields=self.compact_fields.get(tool.get_function_name()),
+                )
+                for tool in tools
+            ]
+        return tools
\ No newline at end of file
@@ -19,6 +19,8 @@ from web3 import Web3
 from camel.toolkits import FunctionTool, ToolSpecification, BaseTool
 from camel.types import get_tool_schema
 
+from .compact import compact_tool
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +33,10 @@ class Web3AnalysisToolkit(BaseTool):
         defillama_api_url: str = "https://api.llama.fi",
         coinmarketcap_api_key: Optional[str] = None,
         eth_rpc_url: Optional[str] = None,
+        compact_output: bool = False,
+        significant_digits: int = 6,
+        max_rows: Optional[int] = 20,
+        compact_fields: Optional[Dict[str, List[str]]] = None,
     ):
         """Initialize the Web3AnalysisToolkit.
 
@@ -39,12 +45,22 @@ class Web3AnalysisToolkit(BaseTool):
             defillama_api_url: URL for DeFiLlama API
             coinmarketcap_api_key: API key for CoinMarketCap
             eth_rpc_url: Ethereum RPC URL for direct blockchain access
+            compact_output: Whether tool results are returned in the compact
+                columnar encoding (see ``toolkits.compact``)
+            significant_digits: Significant digits kept for floats in compact mode
+            max_rows: Maximum rows per list in compact mode
+            compact_fields: Optional mapping of tool name to the table columns
+                kept in compact mode
         """
         super().__init__()
         self.etherscan_api_key = etherscan_api_key or os.environ.get("ETHERSCAN_API_KEY")
         self.defillama_api_url = defillama_api_url
         self.coinmarketcap_api_key = coinmarketcap_api_key or os.environ.get("CMC_API_KEY")
         self.eth_rpc_url = eth_rpc_url or os.environ.get("ETH_RPC_URL", "https://mainnet.infura.io/v3/")
+        self.compact_output = compact_output
+        self.significant_digits = significant_digits
+        self.max_rows = max_rows
+        self.compact_fields = compact_fields or {}
 
         # Map of chain names to their IDs in various services
         self.chain_map = {
@@ -541,10 +557,21 @@ class Web3AnalysisToolkit(BaseTool):
 
     def get_tools(self) -> List[FunctionTool]:
         """Get all available tools in this toolkit."""
-        return [
+        tools = [
             FunctionTool(self.analyze_chain_metrics),
             FunctionTool(self.track_defi_trends),
             FunctionTool(self.monitor_token_metrics),
             FunctionTool(self.analyze_dex_volume),
             FunctionTool(self.track_nft_trends),
-        ]
\ No newline at end of file
+        ]
+        if self.compact_output:
+            tools = [
+                compact_tool(
+                    tool,
+                    significant_digits=self.significant_digits,
+                    max_rows=self.max_rows,
+                    fields=self.compact_fields.get(tool.get_function_name()),
+                )
+                for tool in tools
+            ]
+        return tools
\ No newline at end of file
@@ -2,11 +2,14 @@ from .common import extract_pattern
 from .enhanced_role_playing import (
     NordstarRolePlaying,
     NordstarGAIARolePlaying,
+    SocietyBudget,
     run_society,
     arun_society,
 )
 from .gaia import GAIABenchmark
 from .document_toolkit import DocumentProcessingToolkit
+from .chat_agent import NordstarChatAgent
+from .tool_cache import ToolResultCache, cached_tool, cached_tools
 
 __all__ = [
     "extract_pattern",
@@ -14,6 +17,11 @@ __all__ = [
     "NordstarGAIARolePlaying",
     "run_society",
     "arun_society",
+    "SocietyBudget",
     "GAIABenchmark",
     "DocumentProcessingToolkit",
+    "NordstarChatAgent",
+    "ToolResultCache",
+    "cached_tool",
+    "cached_tools",
 ]
@@ -0,0 +1,165 @@
+import os
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from typing import IO, List, Optional, Tuple
+
+# Separates the archive from the member in on-demand member paths,
+# e.g. `attachments.zip::reports/q1.pdf`
+MEMBER_SEPARATOR = "::"
+
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class ZipLimitError(ValueError):
+    r"""Raised when an archive exceeds the configured extraction limits."""
+
+
+@dataclass
+class ZipLimits:
+    r"""Limits protecting against zip bombs.
+
+    Args:
+        max_total_bytes (int): The maximum uncompressed size of all members.
+        max_member_bytes (int): The maximum uncompressed size of one member.
+        max_members (int): The maximum number of members.
+        max_ratio (float): The maximum compression ratio of one member.
+    """
+
+    max_total_bytes: int = 1024 * 1024 * 1024
+    max_member_bytes: int = 256 * 1024 * 1024
+    max_members: int = 10000
+    max_ratio: float = 200.0
+
+
+def split_member_path(path: str) -> Optional[Tuple[str, str]]:
+    r"""Split an on-demand member path into archive and member name."""
+    if MEMBER_SEPARATOR not in path:
+        return None
+    archive_path, member = path.split(MEMBER_SEPARATOR, 1)
+    if not archive_path.endswith(".zip"):
+        return None
+    return archive_path, member
+
+
+class SafeZipArchive:
+    r"""In-process zip extraction with streaming writes and size limits.
+
+    Members are validated up front against their declared sizes, and the
+    actual number of decompressed bytes is enforced while streaming, since
+    headers of malicious archives can lie.
+
+    Args:
+        zip_path (str): The path of the zip archive.
+        limits (ZipLimits, optional): The extraction limits.
+            (default: :obj:`None`)
+    """
+
+    def __init__(self, zip_path: str, limits: Optional[ZipLimits] = None):
+        self.zip_path = zip_path
+        self.limits = limits or ZipLimits()
+        self._zip = zipfile.ZipFile(zip_path)
+        try:
+            self._members = self._validate()
+        except Exception:
+            self._zip.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def _validate(self) -> List[zipfile.ZipInfo]:
+        members = [info for info in self._zip.infolist() if not info.is_dir()]
+        if len(members) > self.limits.max_members:
+            raise ZipLimitError(
+                f"{self.zip_path} has {len(members)} members, the limit is {self.limits.max_members}."
+            )
+
+        total = 0
+        for info in members:
+            normalized = os.path.normpath(info.filename)
+            if os.path.isabs(normalized) or normalized.startswith(".."):
+                raise ZipLimitError(f"Unsafe member path in {self.zip_path}: {info.filename}")
+            if info.file_size > self.limits.max_member_bytes:
+                raise ZipLimitError(
+                    f"Member {info.filename} is {info.file_size} bytes, the limit is {self.limits.max_member_bytes}."
+                )
+            if info.compress_size > 0 and info.file_size / info.compress_size > self.limits.max_ratio:
+                raise ZipLimitError(
+                    f"Member {info.filename} has a suspicious compression ratio."
+                )
+            total += info.file_size
+
+        if total > self.limits.max_total_bytes:
+            raise ZipLimitError(
+                f"{self.zip_path} expands to {total} bytes, the limit is {self.limits.max_total_bytes}."
+            )
+        return members
+
+    def names(self) -> List[str]:
+        return [info.filename for info in self._members]
+
+    def _info(self, name: str) -> zipfile.ZipInfo:
+        for info in self._members:
+            if info.filename == name:
+                return info
+        raise KeyError(f"No member {name} in {self.zip_path}")
+
+    def _copy(self, source: IO[bytes], target: IO[bytes], limit: int) -> int:
+        written = 0
+        while True:
+            block = source.read(_COPY_BUFFER_SIZE)
+            if not block:
+                return written
+            written += len(block)
+            if written > limit:
+                raise ZipLimitError(f"A member of {self.zip_path} exceeds its declared size.")
+            target.write(block)
+
+    def read_member(self, name: str) -> bytes:
+        r"""Read a member into memory, enforcing the member size limit."""
+        info = self._info(name)
+        with self._zip.open(info) as source:
+            data = source.read(self.limits.max_member_bytes + 1)
+        if len(data) > self.limits.max_member_bytes:
+            raise ZipLimitError(f"Member {name} exceeds {self.limits.max_member_bytes} bytes.")
+        return data
+
+    def extract_member(self, name: str, extract_path: str) -> str:
+        r"""Stream one member to disk, skipping it if an identical-size copy
+        already exists. Returns the path of the extracted file."""
+        info = self._info(name)
+        target_path = os.path.join(extract_path, os.path.normpath(info.filename))
+        if os.path.isfile(target_path) and os.path.getsize(target_path) == info.file_size:
+            return target_path
+
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        # A unique name, as other processes may extract the same member
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target_path), suffix=".part")
+        try:
+            with self._zip.open(info) as source, os.fdopen(fd, "wb") as target:
+                self._copy(source, target, min(info.file_size, self.limits.max_member_bytes))
+            os.replace(tmp_path, target_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return target_path
+
+    def extract_all(self, extract_path: str) -> List[str]:
+        r"""Stream every member to disk. Returns the extracted file paths."""
+        extracted = []
+        total = 0
+        for info in self._members:
+            path = self.extract_member(info.filename, extract_path)
+            total += os.path.getsize(path)
+            if total > self.limits.max_total_bytes:
+                raise ZipLimitError(f"{self.zip_path} exceeds {self.limits.max_total_bytes} bytes.")
+            extracted.append(path)
+        return extracted
+
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    r"""Return the process-wide event loop running on a daemon thread,
+    starting it on first use."""
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(
+                target=_loop.run_forever, name="nordstar-background-loop", daemon=True
+            )
+            _thread.start()
+        return _loop
+
+
+def run_coroutine_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    r"""Run a coroutine to completion from synchronous code.
+
+    The coroutine runs on the shared background loop, so this works whether
+    or not the calling thread already runs an event loop, without patching
+    it the way ``nest_asyncio`` does.
+
+    Args:
+        coro (Coroutine): The coroutine to run.
+        timeout (float, optional): The maximum time to wait, in seconds.
+            (default: :obj:`None`)
+
+    Returns:
+        Any: The result of the coroutine.
+    """
+    loop = get_background_loop()
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError(
+            "run_coroutine_sync() cannot be called from the background loop; "
+            "await the coroutine instead."
+        )
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
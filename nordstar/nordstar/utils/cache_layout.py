@@ -0,0 +1,215 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CacheLayout:
+    r"""The directory layout of a toolkit cache, with a size-bounded janitor.
+
+    Everything lives in one namespace directory under :obj:`root`::
+
+        extracted/            content-addressed extraction results
+        chunks/               chunked documents
+        index/                the passage vector index
+        downloads/<digest>/   downloaded files, one directory per URL
+        archives/<digest>/    extracted zip archives, one per archive
+        sessions/<session>/   scratch space of a single toolkit instance
+        captions/             cached image captions
+        metadata/             URL metadata, see :class:`UrlMetadataCache`
+
+    Scratch files of a session never collide with those of concurrent
+    sessions, and are removed when the scratch directory is closed. The
+    janitor keeps the namespaces in :obj:`MANAGED_NAMESPACES` below
+    :obj:`max_bytes` by removing the least recently used files, and removes
+    session directories abandoned by crashed processes. ``extracted`` and
+    ``index`` are bounded by their own owners, :class:`DocumentCache` and
+    :class:`DocumentIndex`, since their files cannot be removed one by one.
+    Chunked documents are kept for :obj:`chunk_min_age`, since their
+    handles may still be read by an agent long after they were written. The
+    time of the last run is shared by all processes using :obj:`root`.
+
+    Args:
+        root (str): The cache root directory.
+        session_id (str, optional): The name of this session's scratch
+            directory. (default: :obj:`None`, a random id)
+        max_bytes (int, optional): The size budget of the janitor-managed
+            namespaces. (default: :obj:`2 GiB`)
+        session_ttl (float, optional): Session directories untouched for
+            this many seconds are removed. (default: :obj:`86400`)
+        min_age (float, optional): Files modified within this many seconds
+            are considered in use and never removed. (default: :obj:`60`)
+        janitor_interval (float, optional): The minimum time between two
+            janitor runs, in seconds. (default: :obj:`60`)
+        chunk_min_age (float, optional): The minimum age of removable
+            chunked documents, in seconds. (default: :obj:`3600`)
+    """
+
+    MANAGED_NAMESPACES = (
+        "downloads",
+        "archives",
+        "sessions",
+        "chunks",
+        "captions",
+        "metadata",
+    )
+
+    def __init__(
+        self,
+        root: str,
+        session_id: Optional[str] = None,
+        max_bytes: int = 2 * 1024 * 1024 * 1024,
+        session_ttl: float = 86400,
+        min_age: float = 60,
+        janitor_interval: float = 60,
+        chunk_min_age: float = 3600,
+    ):
+        self.root = root
+        self.session_id = session_id or uuid.uuid4().hex[:12]
+        self.max_bytes = max_bytes
+        self.session_ttl = session_ttl
+        self.min_age = min_age
+        self.janitor_interval = janitor_interval
+        self.chunk_min_age = chunk_min_age
+        self._lock = threading.Lock()
+        self._last_clean = 0.0
+        # Touched on every janitor run
+        self._marker_path = os.path.join(self.root, ".janitor")
+        os.makedirs(self.root, exist_ok=True)
+
+    def namespace(self, name: str) -> str:
+        path = os.path.join(self.root, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @staticmethod
+    def _digest(value: str) -> str:
+        return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+    def download_path(self, url: str, file_name: str) -> str:
+        r"""Where to store a download, keeping its file name (and thus its
+        extension) while isolating URLs that share a file name."""
+        directory = os.path.join(self.namespace("downloads"), self._digest(url))
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, file_name or "download")
+
+    def archive_path(self, zip_path: str) -> str:
+        r"""Where to extract a zip archive."""
+        zip_name = os.path.splitext(os.path.basename(zip_path))[0]
+        digest = self._digest(os.path.abspath(zip_path))
+        return os.path.join(self.namespace("archives"), f"{zip_name}-{digest}")
+
+    @property
+    def session_dir(self) -> str:
+        return self.namespace(os.path.join("sessions", self.session_id))
+
+    @contextmanager
+    def scratch_dir(self) -> Iterator[str]:
+        r"""A private directory for intermediate files, removed on exit."""
+        path = tempfile.mkdtemp(dir=self.session_dir)
+        try:
+            yield path
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _managed_files(self) -> Tuple[List[Tuple[float, int, str]], int]:
+        files = []
+        total = 0
+        for name in self.MANAGED_NAMESPACES:
+            for dirpath, _, filenames in os.walk(os.path.join(self.root, name)):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((max(stat.st_atime, stat.st_mtime), stat.st_size, path))
+                    total += stat.st_size
+        return files, total
+
+    def _remove_stale_sessions(self, now: float) -> None:
+        sessions_dir = os.path.join(self.root, "sessions")
+        if not os.path.isdir(sessions_dir):
+            return
+        for name in os.listdir(sessions_dir):
+            path = os.path.join(sessions_dir, name)
+            if name == self.session_id or not os.path.isdir(path):
+                continue
+            try:
+                if now - os.stat(path).st_mtime > self.session_ttl:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                continue
+
+    def _remove_empty_dirs(self) -> None:
+        own_session = os.path.join(self.root, "sessions", self.session_id)
+        for name in self.MANAGED_NAMESPACES:
+            top = os.path.join(self.root, name)
+            for dirpath, dirnames, filenames in os.walk(top, topdown=False):
+                if dirpath in (top, own_session):
+                    continue
+                if not dirnames and not filenames:
+                    try:
+                        os.rmdir(dirpath)
+                    except OSError:
+                        pass
+
+    def clean(self, force: bool = False) -> int:
+        r"""Run the janitor.
+
+        Args:
+            force (bool, optional): Run even if the previous run was less
+                than :obj:`janitor_interval` seconds ago.
+                (default: :obj:`False`)
+
+        Returns:
+            int: The number of bytes freed.
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                last_clean = max(self._last_clean, os.stat(self._marker_path).st_mtime)
+            except OSError:
+                last_clean = self._last_clean
+            if not force and now - last_clean < self.janitor_interval:
+                return 0
+            self._last_clean = now
+            try:
+                with open(self._marker_path, "a"):
+                    pass
+                os.utime(self._marker_path, (now, now))
+            except OSError:
+                pass
+
+            self._remove_stale_sessions(now)
+            files, total = self._managed_files()
+            chunks_dir = os.path.join(self.root, "chunks") + os.sep
+            freed = 0
+            for last_used, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                min_age = (
+                    self.chunk_min_age if path.startswith(chunks_dir) else self.min_age
+                )
+                if now - last_used < min_age:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                freed += size
+            self._remove_empty_dirs()
+
+        if freed:
+            logger.info(f"Cache janitor freed {freed} bytes under {self.root}.")
+        return freed
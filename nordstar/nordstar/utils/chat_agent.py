@@ -0,0 +1,305 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+from camel.agents import ChatAgent
+from camel.logger import get_logger
+
+from .metrics import AgentMetrics
+
+logger = get_logger(__name__)
+
+_MISSING = object()
+
+
+class NordstarChatAgent(ChatAgent):
+    r"""A ChatAgent that can execute the tool calls of one model response
+    concurrently, and bound the time of each call.
+
+    The tool calls of one response cannot see each other's results, but
+    they may still depend on each other through the state of a toolkit,
+    e.g. a browser navigation followed by a click, or a file written and
+    then read. Calls are therefore run in order unless
+    :obj:`parallel_tool_calls` is enabled, and only responses whose calls
+    are all in :obj:`parallel_safe_tools` are run concurrently -- on a
+    thread pool for sync tools, with `asyncio.gather` for async tools. The
+    results are then handed to the regular sequential recording loop of
+    `ChatAgent`, so a round takes as long as its slowest call instead of
+    the sum of all calls.
+
+    The duration of every model request and tool call is recorded in
+    :obj:`metrics`.
+
+    Args:
+        parallel_tool_calls (bool, optional): Whether to run the tool calls
+            of a response concurrently. (default: :obj:`False`)
+        parallel_safe_tools (Collection[str], optional): The names of the
+            tools without side effects that may run concurrently. If not
+            given, all tools may when :obj:`parallel_tool_calls` is enabled.
+            (default: :obj:`None`)
+        max_tool_workers (int, optional): The maximum number of tool calls
+            run at the same time. (default: :obj:`8`)
+        tool_call_timeout (float, optional): Timeout in seconds for each tool
+            call, from the time the call starts. A timed out call returns an
+            error result to the model. Since it may still be running, the
+            later calls of a response run in order are not started and
+            return an error too. (default: :obj:`None`)
+    """
+
+    def __init__(
+        self,
+        *args,
+        parallel_tool_calls: bool = False,
+        parallel_safe_tools: Optional[Collection[str]] = None,
+        max_tool_workers: int = 8,
+        tool_call_timeout: Optional[float] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.parallel_tool_calls = parallel_tool_calls
+        self.parallel_safe_tools = (
+            set(parallel_safe_tools) if parallel_safe_tools is not None else None
+        )
+        self.max_tool_workers = max_tool_workers
+        self.tool_call_timeout = tool_call_timeout
+        self._prefetched_tool_results: Dict[str, Any] = {}
+        self.metrics = AgentMetrics()
+
+    def _max_concurrency(self, tool_call_requests: List[Any]) -> int:
+        r"""How many of the calls may run at the same time: all of them only
+        if every call is to a tool known to be free of side effects."""
+        if not self.parallel_tool_calls:
+            return 1
+        if self.parallel_safe_tools is not None and any(
+            request.tool_name not in self.parallel_safe_tools
+            for request in tool_call_requests
+        ):
+            return 1
+        return self.max_tool_workers
+
+    def _should_prefetch(self, tool_call_requests: List[Any]) -> bool:
+        if not tool_call_requests:
+            return False
+        # Calls run one at a time only go through the pool to enforce their
+        # timeout
+        if self.tool_call_timeout is not None:
+            return True
+        return len(tool_call_requests) > 1 and self._max_concurrency(tool_call_requests) > 1
+
+    def _pending_tool_calls(self, response: Any) -> List[Any]:
+        tool_call_requests = getattr(response, "tool_call_requests", None) or []
+        return [
+            request
+            for request in tool_call_requests
+            if request.tool_name in self._internal_tools
+        ]
+
+    def _run_tool(self, tool_call_request: Any) -> Any:
+        tool = self._internal_tools[tool_call_request.tool_name]
+        try:
+            return tool(**tool_call_request.args)
+        except Exception as e:
+            return {
+                "error": f"Error executing tool '{tool_call_request.tool_name}': {e!s}"
+            }
+
+    def _timed_run_tool(self, tool_call_request: Any) -> Tuple[Any, float]:
+        r"""Run a tool on a worker thread, timing the call itself rather
+        than the time until its result is collected."""
+        started = time.monotonic()
+        result = self._run_tool(tool_call_request)
+        return result, time.monotonic() - started
+
+    def _record_tool_metrics(
+        self, tool_call_request: Any, result: Any, duration: float
+    ) -> None:
+        self.metrics.record_tool_call(
+            tool_call_request.tool_call_id,
+            tool_call_request.tool_name,
+            duration,
+            failed=isinstance(result, dict) and "error" in result,
+        )
+
+    def _timeout_result(self, tool_call_request: Any) -> Dict[str, str]:
+        logger.warning(
+            f"Tool call {tool_call_request.tool_name} timed out after {self.tool_call_timeout}s."
+        )
+        return {
+            "error": f"Tool '{tool_call_request.tool_name}' timed out after {self.tool_call_timeout} seconds"
+        }
+
+    def _skipped_result(self, tool_call_request: Any) -> Dict[str, str]:
+        return {
+            "error": f"Tool '{tool_call_request.tool_name}' was not run because an "
+            f"earlier call of the same response timed out and may still be "
+            f"running. Call it again if it is still needed."
+        }
+
+    def _prefetch_tool_results(self, tool_call_requests: List[Any]) -> None:
+        r"""Run the calls in order, up to :meth:`_max_concurrency` at a time,
+        timing out each one :obj:`tool_call_timeout` seconds after it
+        started. When the calls run one at a time, the calls after one that
+        timed out are skipped."""
+        limit = self._max_concurrency(tool_call_requests)
+        # One thread per call, so that calls which timed out and are left
+        # running do not hold back the others
+        pool = ThreadPoolExecutor(
+            max_workers=len(tool_call_requests), thread_name_prefix="nordstar-tool"
+        )
+        pending = deque(tool_call_requests)
+        running: Dict[Any, Any] = {}
+        try:
+            while pending or running:
+                while pending and len(running) < limit:
+                    request = pending.popleft()
+                    future = pool.submit(self._timed_run_tool, request)
+                    running[future] = (request, time.monotonic())
+
+                timeout = None
+                if self.tool_call_timeout is not None:
+                    first_deadline = min(
+                        started + self.tool_call_timeout
+                        for _, started in running.values()
+                    )
+                    timeout = max(0.0, first_deadline - time.monotonic())
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    request, _ = running.pop(future)
+                    result, duration = future.result()
+                    self._collect_tool_result(request, result, duration)
+                if self.tool_call_timeout is None:
+                    continue
+                now = time.monotonic()
+                for future, (request, started) in list(running.items()):
+                    if now - started >= self.tool_call_timeout:
+                        del running[future]
+                        future.cancel()
+                        self._collect_tool_result(
+                            request, self._timeout_result(request), now - started
+                        )
+                        if limit == 1:
+                            self._skip_tool_calls(pending)
+                            pending.clear()
+        finally:
+            # Do not block the conversation on calls that timed out
+            pool.shutdown(wait=False)
+
+    def _collect_tool_result(
+        self, tool_call_request: Any, result: Any, duration: float
+    ) -> None:
+        self._record_tool_metrics(tool_call_request, result, duration)
+        self._prefetched_tool_results[tool_call_request.tool_call_id] = result
+
+    def _skip_tool_calls(self, tool_call_requests: Collection[Any]) -> None:
+        r"""Answer calls that must not run while a timed out call of the
+        same response may still be changing the state of its toolkit."""
+        for request in tool_call_requests:
+            self._collect_tool_result(request, self._skipped_result(request), 0.0)
+
+    async def _arun_tool(self, tool_call_request: Any) -> Any:
+        tool = self._internal_tools[tool_call_request.tool_name]
+        try:
+            if asyncio.iscoroutinefunction(tool.func):
+                call = tool.func(**tool_call_request.args)
+            else:
+                call = asyncio.to_thread(tool, **tool_call_request.args)
+            return await asyncio.wait_for(call, timeout=self.tool_call_timeout)
+        except asyncio.TimeoutError:
+            # Reported by the caller, which decides whether to run the rest
+            raise
+        except Exception as e:
+            return {
+                "error": f"Error executing tool '{tool_call_request.tool_name}': {e!s}"
+            }
+
+    async def _aprefetch_tool_results(self, tool_call_requests: List[Any]) -> None:
+        limit = self._max_concurrency(tool_call_requests)
+        semaphore = asyncio.Semaphore(limit)
+
+        async def run(request) -> bool:
+            async with semaphore:
+                started = time.monotonic()
+                timed_out = False
+                try:
+                    result = await self._arun_tool(request)
+                except asyncio.TimeoutError:
+                    result, timed_out = self._timeout_result(request), True
+                self._collect_tool_result(request, result, time.monotonic() - started)
+                return timed_out
+
+        if limit == 1:
+            for position, request in enumerate(tool_call_requests):
+                if await run(request):
+                    self._skip_tool_calls(tool_call_requests[position + 1 :])
+                    break
+        else:
+            await asyncio.gather(*(run(request) for request in tool_call_requests))
+
+    def _record_llm_metrics(self, response: Any, duration: float) -> None:
+        self.metrics.record_llm_call(duration, getattr(response, "usage_dict", None))
+
+    def _get_model_response(self, *args, **kwargs):
+        started = time.monotonic()
+        try:
+            response = super()._get_model_response(*args, **kwargs)
+        except Exception:
+            self.metrics.record_llm_call(time.monotonic() - started, failed=True)
+            raise
+        self._record_llm_metrics(response, time.monotonic() - started)
+        # Results left over from an earlier response are never collected
+        self._prefetched_tool_results.clear()
+        tool_call_requests = self._pending_tool_calls(response)
+        if self._should_prefetch(tool_call_requests):
+            self._prefetch_tool_results(tool_call_requests)
+        return response
+
+    async def _aget_model_response(self, *args, **kwargs):
+        started = time.monotonic()
+        try:
+            response = await super()._aget_model_response(*args, **kwargs)
+        except Exception:
+            self.metrics.record_llm_call(time.monotonic() - started, failed=True)
+            raise
+        self._record_llm_metrics(response, time.monotonic() - started)
+        self._prefetched_tool_results.clear()
+        tool_call_requests = self._pending_tool_calls(response)
+        # Always prefetch, so that sync tools run on a worker thread instead
+        # of blocking the event loop shared with other agents
+        if tool_call_requests:
+            await self._aprefetch_tool_results(tool_call_requests)
+        return response
+
+    def _execute_tool(self, tool_call_request):
+        result = self._prefetched_tool_results.pop(tool_call_request.tool_call_id, _MISSING)
+        if result is _MISSING:
+            started = time.monotonic()
+            record = super()._execute_tool(tool_call_request)
+            self._record_tool_metrics(
+                tool_call_request, record.result, time.monotonic() - started
+            )
+            return record
+        return self._record_tool_calling(
+            tool_call_request.tool_name,
+            tool_call_request.args,
+            result,
+            tool_call_request.tool_call_id,
+        )
+
+    async def _aexecute_tool(self, tool_call_request):
+        result = self._prefetched_tool_results.pop(tool_call_request.tool_call_id, _MISSING)
+        if result is _MISSING:
+            started = time.monotonic()
+            record = await super()._aexecute_tool(tool_call_request)
+            self._record_tool_metrics(
+                tool_call_request, record.result, time.monotonic() - started
+            )
+            return record
+        return self._record_tool_calling(
+            tool_call_request.tool_name,
+            tool_call_request.args,
+            result,
+            tool_call_request.tool_call_id,
+        )
@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_VERSION = 1
+
+# Fields kept in the index, enough to select tasks without parsing them
+INDEX_FIELDS = ["task_id", "Level", "file_name"]
+
+
+class TaskIndex(Sequence):
+    r"""A lazily loaded JSON Lines dataset.
+
+    Only the byte offset and a few fields of each record are kept in memory;
+    a record is read and parsed when it is accessed. The index is cached
+    next to the dataset as ``<name>.index.json`` and rebuilt when the
+    dataset's size or modification time changes.
+
+    Args:
+        path (Union[str, Path]): The path of the JSON Lines file.
+        entries (List[Dict[str, Any]]): The index entries, with the
+            :obj:`INDEX_FIELDS` of each record and its ``offset`` and
+            ``length`` in bytes.
+        resolve_files (bool, optional): Whether to turn the ``file_name`` of
+            records into paths relative to the dataset's directory.
+            (default: :obj:`True`)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        entries: List[Dict[str, Any]],
+        resolve_files: bool = True,
+    ):
+        self.path = Path(path)
+        self.entries = entries
+        self.resolve_files = resolve_files
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        skip: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        resolve_files: bool = True,
+    ) -> "TaskIndex":
+        r"""Index a JSON Lines file, reusing the cached index if it is
+        current.
+
+        Args:
+            path (Union[str, Path]): The path of the JSON Lines file.
+            skip (Callable[[Dict[str, Any]], bool], optional): Excludes
+                records from the index. Changing it requires deleting the
+                cached index. (default: :obj:`None`)
+            resolve_files (bool, optional): See :class:`TaskIndex`.
+                (default: :obj:`True`)
+        """
+        path = Path(path)
+        stat = path.stat()
+        source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        index_path = path.with_suffix(".index.json")
+
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("version") == INDEX_VERSION and cached.get("source") == source:
+                return cls(path, cached["entries"], resolve_files)
+        except (OSError, ValueError):
+            pass
+
+        entries = cls._build(path, skip)
+        cls._save(index_path, {"version": INDEX_VERSION, "source": source, "entries": entries})
+        return cls(path, entries, resolve_files)
+
+    @staticmethod
+    def _build(
+        path: Path, skip: Optional[Callable[[Dict[str, Any]], bool]]
+    ) -> List[Dict[str, Any]]:
+        logger.info(f"Indexing {path}.")
+        entries = []
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                length = len(line)
+                if line.strip():
+                    record = json.loads(line)
+                    if skip is None or not skip(record):
+                        entry = {field: record.get(field) for field in INDEX_FIELDS}
+                        entry.update(offset=offset, length=length)
+                        entries.append(entry)
+                offset += length
+        return entries
+
+    @staticmethod
+    def _save(index_path: Path, payload: Dict[str, Any]) -> None:
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=index_path.parent, suffix=".tmp")
+        except OSError as e:
+            # E.g. a read-only dataset, the index then lives in memory only
+            logger.debug(f"Not caching the index of {index_path.parent}: {e}")
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, index_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _read(self, f, entry: Dict[str, Any]) -> Dict[str, Any]:
+        f.seek(entry["offset"])
+        record = json.loads(f.read(entry["length"]))
+        if self.resolve_files and record.get("file_name"):
+            record["file_name"] = self.path.parent / record["file_name"]
+        return record
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return TaskIndex(self.path, self.entries[position], self.resolve_files)
+        with open(self.path, "rb") as f:
+            return self._read(f, self.entries[position])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, "rb") as f:
+            for entry in self.entries:
+                yield self._read(f, entry)
+
+    def take(self, positions: List[int]) -> List[Dict[str, Any]]:
+        r"""Materialize the records at the given positions, reading the file
+        once."""
+        with open(self.path, "rb") as f:
+            return [self._read(f, self.entries[position]) for position in positions]
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+import requests
+from camel.logger import get_logger
+
+from .url_metadata import UrlMetadataCache
+
+logger = get_logger(__name__)
+
+# Bump when extraction output changes so stale entries are not served
+EXTRACTOR_VERSION = "2"
+
+
+class DocumentCache:
+    r"""A persistent, content-addressed cache of extracted document content.
+
+    Local files are keyed by the SHA-256 of their bytes, remote documents by
+    their URL together with the ``ETag``/``Last-Modified`` validators
+    reported by the server. Entries are JSON files on disk; the least
+    recently used ones are evicted once the cache grows beyond
+    :obj:`max_bytes`. The total size is scanned once and then tracked as
+    entries are written, so the directory is only listed again to evict.
+
+    Args:
+        cache_dir (str): The directory to store the cache in.
+        max_bytes (int, optional): The maximum total size of the cache.
+            (default: :obj:`512 MiB`)
+        url_cache (UrlMetadataCache, optional): Fingerprints URLs from cached
+            metadata instead of a HEAD request per lookup.
+            (default: :obj:`None`)
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        url_cache: Optional[UrlMetadataCache] = None,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.url_cache = url_cache
+        self._lock = threading.Lock()
+        # Total size of the entries, None until the directory is scanned
+        self._total_bytes: Optional[int] = None
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def fingerprint_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+        r"""Hash the content of a local file."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def fingerprint_url(url: str) -> Optional[str]:
+        r"""Fingerprint a URL by its validators. Returns :obj:`None` if the
+        server reports neither an ``ETag`` nor a ``Last-Modified`` header,
+        since the content could then change without notice."""
+        try:
+            response = requests.head(url, allow_redirects=True, timeout=10)
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"Could not fingerprint {url}: {e}")
+            return None
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return None
+        return f"{url}|{etag}|{last_modified}"
+
+    def make_key(self, document_path: str, variant: str = "") -> Optional[str]:
+        r"""Build the cache key of a document.
+
+        Args:
+            document_path (str): A local path or a URL.
+            variant (str, optional): Extraction options that change the
+                output, e.g. a page range. (default: :obj:`""`)
+
+        Returns:
+            Optional[str]: The key, or :obj:`None` if the document cannot be
+                fingerprinted.
+        """
+        parsed_url = urlparse(document_path)
+        if os.path.isfile(document_path):
+            fingerprint = self.fingerprint_file(document_path)
+        elif parsed_url.scheme and parsed_url.netloc and self.url_cache is not None:
+            fingerprint = self.url_cache.fingerprint(document_path)
+        elif parsed_url.scheme and parsed_url.netloc:
+            fingerprint = self.fingerprint_url(document_path)
+        else:
+            fingerprint = None
+        if fingerprint is None:
+            return None
+        raw_key = f"{EXTRACTOR_VERSION}|{fingerprint}|{variant}"
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Any:
+        r"""Return the cached content, or :obj:`None` on a miss."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Touch the entry so that eviction is least-recently-used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["content"]
+
+    def set(self, key: str, content: Any, source: str = "") -> None:
+        r"""Store content atomically, then evict old entries if needed."""
+        if content is None:
+            return
+        try:
+            payload = json.dumps(
+                {"source": source, "content": content}, ensure_ascii=False
+            )
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Content of {source} is not cacheable: {e}")
+            return
+
+        path = self._entry_path(key)
+        data = payload.encode("utf-8")
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write document cache entry: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(data) - old_size
+            over_budget = (
+                self._total_bytes is None or self._total_bytes > self.max_bytes
+            )
+        if over_budget:
+            self.evict()
+
+    def evict(self) -> None:
+        r"""Remove least recently used entries until the cache fits in
+        90% of :obj:`max_bytes`."""
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            # Evict down to 90% so that the next writes do not evict again
+            target = (
+                self.max_bytes if total <= self.max_bytes else self.max_bytes * 9 // 10
+            )
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+            self._total_bytes = total
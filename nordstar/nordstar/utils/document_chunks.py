@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+_encoding = None
+
+
+def estimate_tokens(text: str) -> int:
+    r"""Count tokens with tiktoken if it is installed, otherwise estimate
+    them at four characters per token."""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def _split_oversized(text: str, max_tokens: int) -> List[str]:
+    r"""Split a single paragraph that is larger than a chunk, by lines and
+    finally by characters."""
+    pieces: List[str] = []
+    for line in text.split("\n"):
+        if estimate_tokens(line) <= max_tokens:
+            pieces.append(line)
+            continue
+        step = max_tokens * 4
+        pieces.extend(line[i : i + step] for i in range(0, len(line), step))
+    return pieces
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    r"""Split text into chunks of at most :obj:`max_tokens` tokens,
+    preferring paragraph and line boundaries.
+
+    Args:
+        text (str): The text to split.
+        max_tokens (int): The maximum number of tokens per chunk.
+
+    Returns:
+        List[str]: The chunks, in document order.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for paragraph in text.split("\n\n"):
+        paragraph_tokens = estimate_tokens(paragraph)
+        pieces = (
+            [paragraph]
+            if paragraph_tokens <= max_tokens
+            else _split_oversized(paragraph, max_tokens)
+        )
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+class DocumentChunkStore:
+    r"""Stores chunked documents on disk under a short handle, so that an
+    agent can fetch individual chunks in later rounds.
+
+    Args:
+        cache_dir (str): The directory to store the chunked documents in.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._documents: Dict[str, Dict] = {}
+
+    def _path(self, handle: str) -> str:
+        return os.path.join(self.cache_dir, f"{handle}.json")
+
+    def add(self, source: str, chunks: List[str]) -> str:
+        r"""Store the chunks of a document and return its handle."""
+        digest = hashlib.sha256()
+        for chunk in chunks:
+            digest.update(chunk.encode("utf-8"))
+        handle = digest.hexdigest()[:16]
+
+        document = {"source": source, "chunks": chunks}
+        self._documents[handle] = document
+        if os.path.exists(self._path(handle)):
+            self._touch(handle)
+        else:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(document, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(handle))
+        return handle
+
+    def get(self, handle: str) -> Optional[Dict]:
+        if handle not in self._documents:
+            try:
+                with open(self._path(handle), "r", encoding="utf-8") as f:
+                    self._documents[handle] = json.load(f)
+            except (OSError, ValueError):
+                return None
+        self._touch(handle)
+        return self._documents[handle]
+
+    def _touch(self, handle: str) -> None:
+        r"""Mark a chunked document as recently used, so that the cache
+        janitor keeps it while its handle is being read."""
+        try:
+            os.utime(self._path(handle))
+        except OSError:
+            pass
+
+
+def format_chunk_index(
+    handle: str,
+    source: str,
+    chunks: List[str],
+    max_tokens: int,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    preview_chars: int = 80,
+) -> str:
+    r"""Describe a chunked document: its size and a page of the index of
+    its chunks, with a short preview each. The first page also shows the
+    first chunk in full if it fits.
+
+    Args:
+        handle (str): The handle of the chunked document.
+        source (str): The path or URL of the document.
+        chunks (List[str]): The chunks.
+        max_tokens (int): The token budget of the description. The index is
+            cut to a page that fits, and continues at a later offset.
+        offset (int, optional): The id of the first chunk to list. Negative
+            offsets list from the first chunk. (default: :obj:`0`)
+        limit (int, optional): The maximum number of chunks to list.
+            (default: :obj:`None`)
+        preview_chars (int, optional): The length of the previews.
+            (default: :obj:`80`)
+
+    Returns:
+        str: The description.
+    """
+    offset = max(0, offset)
+    total_tokens = sum(estimate_tokens(chunk) for chunk in chunks)
+    header = [
+        f"The document {source} is too large to return at once "
+        f"(~{total_tokens} tokens). It was split into {len(chunks)} chunks "
+        f"with handle `{handle}`. Call `get_document_chunks` with this handle and "
+        f"the ids of the chunks you need to read them.",
+        "",
+        "Chunk index:",
+    ]
+    # Keep room for the footer pointing to the next page
+    budget = max_tokens - estimate_tokens("\n".join(header)) - 60
+
+    entries: List[str] = []
+    end = offset
+    while end < len(chunks) and (limit is None or len(entries) < limit):
+        preview = " ".join(chunks[end].split())[:preview_chars]
+        entry = f"[{end}] (~{estimate_tokens(chunks[end])} tokens) {preview}"
+        entry_tokens = estimate_tokens(entry) + 1
+        if entries and entry_tokens > budget:
+            break
+        entries.append(entry)
+        budget -= entry_tokens
+        end += 1
+
+    lines = header + entries
+    if end < len(chunks):
+        lines += [
+            "",
+            f"Listed chunks {offset}-{end - 1} of {len(chunks)}. Call "
+            f"`get_document_chunk_index` with handle `{handle}` and offset {end} "
+            f"to list more.",
+        ]
+    if offset == 0 and chunks and estimate_tokens(chunks[0]) + 5 <= budget:
+        lines += ["", "Chunk 0:", chunks[0]]
+    return "\n".join(lines)
@@ -0,0 +1,429 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from camel.logger import get_logger
+
+from .document_chunks import split_into_chunks
+
+logger = get_logger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbedder:
+    r"""A dependency-free embedder using the hashing trick over word
+    unigrams and bigrams. It is far weaker than a neural embedder but costs
+    microseconds per passage and needs no model download.
+
+    Args:
+        dim (int, optional): The dimension of the embeddings.
+            (default: :obj:`512`)
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _bucket(self, feature: str) -> int:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN_PATTERN.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                bucket = self._bucket(feature)
+                sign = 1.0 if bucket & 1 else -1.0
+                vectors[row, (bucket >> 1) % self.dim] += sign
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerEmbedder:
+    r"""CPU embeddings from a small sentence-transformers model.
+
+    Args:
+        model_name (str, optional): The sentence-transformers model to use.
+            (default: :obj:`"all-MiniLM-L6-v2"`)
+    """
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"sentence-transformers-{model_name}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(
+            self.model.encode(texts, normalize_embeddings=True), dtype=np.float32
+        )
+
+
+def get_default_embedder():
+    r"""Use sentence-transformers if installed, the hashing embedder
+    otherwise."""
+    try:
+        return SentenceTransformerEmbedder()
+    except Exception as e:
+        logger.info(f"Falling back to hashing embeddings: {e}")
+        return HashingEmbedder()
+
+
+class DocumentIndex:
+    r"""A persistent vector index over passages of extracted documents.
+
+    Uses an HNSW index (``hnswlib``) when installed and exact cosine search
+    over a numpy matrix otherwise. Passages, vectors and indexed documents
+    are appended to files under :obj:`index_dir`, and a small ``meta.json``
+    records how much of each is committed, so adding a document costs I/O
+    proportional to the document only. The HNSW graph is saved with
+    ``save_index`` once enough passages were added since the last save
+    (and on :meth:`flush`); on load, passages added since are inserted
+    into it. Once the index exceeds :obj:`max_bytes`, the oldest documents
+    are dropped until it is half that size, always keeping the newest one.
+    The embedder and the index are loaded on first use.
+
+    Args:
+        index_dir (str): The directory to store the index in.
+        embedder (optional): An object with ``name``, ``dim`` and
+            ``embed(texts) -> np.ndarray``. (default: :obj:`None`, see
+            :func:`get_default_embedder`)
+        passage_tokens (int, optional): The size of indexed passages in
+            tokens. (default: :obj:`256`)
+        max_bytes (int, optional): The maximum size of the passages and
+            vectors on disk. (default: :obj:`512 MiB`)
+    """
+
+    def __init__(
+        self,
+        index_dir: str,
+        embedder: Optional[Any] = None,
+        passage_tokens: int = 256,
+        max_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.index_dir = index_dir
+        self.embedder = embedder
+        self.passage_tokens = passage_tokens
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._loaded = False
+
+        self.passages: List[Dict[str, str]] = []
+        # The hash of each indexed document and the end of its passages
+        self.document_hashes: Dict[str, int] = {}
+        # The vectors of the passages, at the start of a buffer whose
+        # capacity doubles when full
+        self._buffer = np.zeros((0, 0), dtype=np.float32)
+        self._hnsw = None
+        # Committed sizes of the append-only files, see `_append`
+        self._meta: Dict[str, Any] = {}
+
+    def _ensure_loaded(self) -> None:
+        r"""Create the embedder and load the index on first use, so that
+        building a toolkit does not load (or download) an embedding model."""
+        with self._lock:
+            if self._loaded:
+                return
+            if self.embedder is None:
+                self.embedder = get_default_embedder()
+            self._buffer = np.zeros((0, self.embedder.dim), dtype=np.float32)
+            os.makedirs(self.index_dir, exist_ok=True)
+            self._load()
+            self._loaded = True
+
+    @property
+    def _vectors(self) -> np.ndarray:
+        return self._buffer[: len(self.passages)]
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.index_dir, name)
+
+    @property
+    def _meta_path(self) -> str:
+        return self._path("meta.json")
+
+    def _new_hnsw(self, capacity: int):
+        try:
+            import hnswlib
+        except ImportError:
+            return None
+        index = hnswlib.Index(space="cosine", dim=self.embedder.dim)
+        index.init_index(max_elements=max(capacity, 1024), ef_construction=200, M=16)
+        index.set_ef(64)
+        return index
+
+    def _reset(self) -> None:
+        for name in ("passages.jsonl", "vectors.f32", "documents.jsonl", "hnsw.bin"):
+            if os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+        self._meta = {
+            "embedder": self.embedder.name,
+            "count": 0,
+            "passages_bytes": 0,
+            "documents_bytes": 0,
+            "hnsw_count": 0,
+        }
+        self._write_meta()
+        self._hnsw = self._new_hnsw(0)
+
+    def _load(self) -> None:
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            self._reset()
+            return
+
+        if meta.get("embedder") != self.embedder.name:
+            logger.info(
+                f"Rebuilding document index: embedder changed to {self.embedder.name}."
+            )
+            self._reset()
+            return
+        if "passages" in meta:
+            self._migrate(meta)
+            return
+
+        self._meta = meta
+        count = meta["count"]
+        # Drop data appended after the last commit, e.g. by a crash
+        self._truncate("passages.jsonl", meta["passages_bytes"])
+        self._truncate("documents.jsonl", meta["documents_bytes"])
+        self._truncate("vectors.f32", count * self.embedder.dim * 4)
+
+        with open(self._path("passages.jsonl"), "r", encoding="utf-8") as f:
+            self.passages = [json.loads(line) for line in f]
+        with open(self._path("documents.jsonl"), "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                self.document_hashes[record["hash"]] = record.get("end", 0)
+        self._buffer = np.fromfile(self._path("vectors.f32"), dtype=np.float32).reshape(
+            count, self.embedder.dim
+        )
+        self._load_hnsw()
+
+    def _load_hnsw(self) -> None:
+        count = len(self.passages)
+        saved = self._meta.get("hnsw_count", 0)
+        self._hnsw = self._new_hnsw(count)
+        if self._hnsw is None:
+            return
+        if saved and os.path.exists(self._path("hnsw.bin")):
+            try:
+                self._hnsw.load_index(self._path("hnsw.bin"), max_elements=max(count, 1024))
+                self._hnsw.set_ef(64)
+            except Exception as e:
+                logger.warning(f"Rebuilding the HNSW graph, it could not be loaded: {e}")
+                self._hnsw = self._new_hnsw(count)
+                saved = 0
+        else:
+            saved = 0
+        if count > saved:
+            self._hnsw.add_items(self._vectors[saved:], np.arange(saved, count))
+
+    def _migrate(self, meta: Dict[str, Any]) -> None:
+        r"""Convert an index saved as a single ``meta.json`` and
+        ``vectors.npy``."""
+        passages = meta["passages"]
+        vectors = np.load(self._path("vectors.npy"))
+        # The passages of each document are unknown, so they are dropped first
+        document_hashes = dict.fromkeys(meta["document_hashes"], 0)
+        self._reset()
+        self._append(passages, vectors.astype(np.float32), document_hashes)
+        os.remove(self._path("vectors.npy"))
+        self._load_hnsw()
+
+    def _truncate(self, name: str, size: int) -> None:
+        path = self._path(name)
+        if not os.path.exists(path):
+            open(path, "wb").close()
+        elif os.path.getsize(path) > size:
+            os.truncate(path, size)
+
+    def _write_meta(self) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def _append_lines(self, name: str, records: List[Dict[str, Any]]) -> int:
+        payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        data = payload.encode("utf-8")
+        with open(self._path(name), "ab") as f:
+            f.write(data)
+        return len(data)
+
+    def _append(
+        self,
+        passages: List[Dict[str, str]],
+        vectors: np.ndarray,
+        document_hashes: Dict[str, int],
+    ) -> None:
+        r"""Append passages, their vectors and the hashes of their documents
+        with the end of their passages to memory and disk, then commit them
+        in ``meta.json``."""
+        count = len(self.passages) + len(passages)
+        if count > len(self._buffer):
+            buffer = np.zeros(
+                (max(count, 2 * len(self._buffer), 1024), self.embedder.dim),
+                dtype=np.float32,
+            )
+            buffer[: len(self.passages)] = self._vectors
+            self._buffer = buffer
+        self._buffer[len(self.passages) : count] = vectors
+        self.passages.extend(passages)
+        self.document_hashes.update(document_hashes)
+
+        self._meta["passages_bytes"] += self._append_lines("passages.jsonl", passages)
+        self._meta["documents_bytes"] += self._append_lines(
+            "documents.jsonl",
+            [{"hash": h, "end": end} for h, end in document_hashes.items()],
+        )
+        with open(self._path("vectors.f32"), "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        self._meta["count"] = len(self.passages)
+        self._write_meta()
+
+    def _save_hnsw(self) -> None:
+        if self._hnsw is None:
+            return
+        tmp_path = self._path("hnsw.bin.tmp")
+        self._hnsw.save_index(tmp_path)
+        os.replace(tmp_path, self._path("hnsw.bin"))
+        self._meta["hnsw_count"] = len(self.passages)
+        self._write_meta()
+
+    def _size(self) -> int:
+        return self._meta["passages_bytes"] + self._vectors.nbytes
+
+    def _compact(self) -> None:
+        r"""Drop the oldest documents until the index is at most half of
+        :obj:`max_bytes`, rewriting it and its HNSW graph. The newest
+        document is kept even if it is larger."""
+        sizes = [
+            len(json.dumps(p, ensure_ascii=False).encode("utf-8")) + 1
+            + self.embedder.dim * 4
+            for p in self.passages
+        ]
+        ends = sorted(set(self.document_hashes.values()))
+        keep_from, kept = len(self.passages), 0
+        for i in reversed(range(len(ends))):
+            if ends[i] == 0:
+                break
+            # A document's passages start where the previous one's end
+            start = ends[i - 1] if i else 0
+            size = sum(sizes[start : ends[i]])
+            if kept and kept + size > self.max_bytes // 2:
+                break
+            kept += size
+            keep_from = start
+
+        passages = self.passages[keep_from:]
+        vectors = self._vectors[keep_from:]
+        document_hashes = {
+            h: end - keep_from
+            for h, end in self.document_hashes.items()
+            if end > keep_from
+        }
+        logger.info(
+            f"Compacting document index: keeping {len(passages)} of "
+            f"{len(self.passages)} passages."
+        )
+        self.passages = []
+        self.document_hashes = {}
+        self._buffer = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self._reset()
+        self._append(passages, vectors, document_hashes)
+        self._load_hnsw()
+        self._save_hnsw()
+
+    def flush(self) -> None:
+        r"""Save the HNSW graph, so that the next load does not insert the
+        passages added since the last save."""
+        self._ensure_loaded()
+        with self._lock:
+            if self._meta.get("hnsw_count", 0) < len(self.passages):
+                self._save_hnsw()
+
+    def add_document(self, source: str, text: str) -> int:
+        r"""Index the passages of a document.
+
+        Args:
+            source (str): The path or URL of the document.
+            text (str): The extracted text.
+
+        Returns:
+            int: The number of passages added (``0`` if the same content was
+                already indexed).
+        """
+        self._ensure_loaded()
+        document_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            if document_hash in self.document_hashes:
+                return 0
+
+        passages = [
+            passage
+            for passage in split_into_chunks(text, self.passage_tokens)
+            if passage.strip()
+        ]
+        if not passages:
+            return 0
+        vectors = self.embedder.embed(passages)
+
+        with self._lock:
+            if document_hash in self.document_hashes:
+                return 0
+            start = len(self.passages)
+            self._append(
+                [{"source": source, "text": p} for p in passages],
+                vectors,
+                {document_hash: start + len(passages)},
+            )
+            if self._size() > self.max_bytes:
+                self._compact()
+            elif self._hnsw is not None:
+                if len(self.passages) > self._hnsw.get_max_elements():
+                    self._hnsw.resize_index(len(self.passages) * 2)
+                self._hnsw.add_items(vectors, np.arange(start, len(self.passages)))
+                # Saving the whole graph once it grew by half keeps the cost
+                # of saves linear in the number of passages
+                saved = self._meta.get("hnsw_count", 0)
+                if len(self.passages) - saved >= max(1024, saved // 2):
+                    self._save_hnsw()
+        return len(passages)
+
+    def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        r"""Return the :obj:`k` passages most similar to the query."""
+        self._ensure_loaded()
+        with self._lock:
+            if not self.passages:
+                return []
+            k = min(k, len(self.passages))
+            query_vector = self.embedder.embed([query])
+
+            if self._hnsw is not None:
+                labels, distances = self._hnsw.knn_query(query_vector, k=k)
+                hits = zip(labels[0].tolist(), (1.0 - distances[0]).tolist())
+            else:
+                scores = self._vectors @ query_vector[0]
+                top = np.argsort(-scores)[:k]
+                hits = zip(top.tolist(), scores[top].tolist())
+
+            return [
+                {
+                    "source": self.passages[i]["source"],
+                    "score": round(float(score), 4),
+                    "text": self.passages[i]["text"],
+                }
+                for i, score in hits
+            ]
@@ -1,22 +1,49 @@
 from camel.toolkits.base import BaseToolkit
 from camel.toolkits.function_tool import FunctionTool
-from camel.toolkits import ImageAnalysisToolkit, ExcelToolkit
+from camel.toolkits import ExcelToolkit
 from camel.utils import retry_on_error
 from camel.logger import get_logger
 from camel.models import BaseModelBackend
 from docx2markdown._docx_to_markdown import docx_to_markdown
 from chunkr_ai import Chunkr
+import asyncio
 import requests
 import mimetypes
 import json
-from typing import List, Optional, Tuple, Literal
+from typing import Any, Dict, List, Optional, Tuple, Literal
 from urllib.parse import urlparse
 import os
-import subprocess
 import xmltodict
-import nest_asyncio
-
-nest_asyncio.apply()
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from tqdm import tqdm
+
+from .document_cache import DocumentCache
+from .pdf_extraction import extract_pdf_text
+from .document_chunks import (
+    DocumentChunkStore,
+    estimate_tokens,
+    format_chunk_index,
+    split_into_chunks,
+)
+from .document_index import DocumentIndex
+from .local_extraction import (
+    IN_MEMORY_EXTENSIONS,
+    LOCAL_EXTENSIONS,
+    LocalExtraction,
+    extract_locally,
+    extract_text_from_bytes,
+)
+from .url_metadata import UrlMetadataCache
+from .background_loop import run_coroutine_sync
+from .cache_layout import CacheLayout
+from .image_captioning import ImageCaptioner
+from .structured_data import (
+    STRUCTURED_EXTENSIONS,
+    query_structured_file,
+    summarize_structured_file,
+)
+from .archive import SafeZipArchive, ZipLimitError, ZipLimits, split_member_path
 
 logger = get_logger(__name__)
 
@@ -28,38 +55,602 @@ class DocumentProcessingToolkit(BaseToolkit):
     """
 
     def __init__(
-        self, cache_dir: Optional[str] = None, model: Optional[BaseModelBackend] = None
+        self,
+        cache_dir: Optional[str] = None,
+        model: Optional[BaseModelBackend] = None,
+        use_cache: bool = True,
+        cache_max_bytes: int = 512 * 1024 * 1024,
+        url_metadata_ttl: float = 3600,
+        pdf_processes: Optional[int] = None,
+        local_first: bool = True,
+        local_quality_threshold: float = 0.6,
+        chunk_tokens: Optional[int] = None,
+        enable_search: bool = False,
+        embedder: Optional[Any] = None,
+        batch_threads: int = 8,
+        batch_processes: Optional[int] = None,
+        lazy_zip: bool = False,
+        zip_limits: Optional[ZipLimits] = None,
+        session_id: Optional[str] = None,
+        cache_dir_max_bytes: int = 2 * 1024 * 1024 * 1024,
+        caption_batch_size: int = 6,
+        structured_size_threshold: int = 8 * 1024 * 1024,
+        index_max_bytes: int = 512 * 1024 * 1024,
     ):
-        self.image_tool = ImageAnalysisToolkit(model=model)
         # self.audio_tool = AudioAnalysisToolkit()
         self.excel_tool = ExcelToolkit()
 
         self.cache_dir = "tmp/"
         if cache_dir:
             self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Downloads, extracted archives, chunked documents, captions and
+        # per-session intermediate files live in namespaces of `cache_dir`,
+        # kept under `cache_dir_max_bytes`
+        self.cache_layout = CacheLayout(
+            self.cache_dir, session_id=session_id, max_bytes=cache_dir_max_bytes
+        )
+        self.cache_layout.clean()
+
+        # Images are downsized, deduplicated by content hash and captioned
+        # several per model request, with captions cached by content hash
+        self.image_captioner = ImageCaptioner(
+            model=model,
+            cache_dir=self.cache_layout.namespace("captions"),
+            batch_size=caption_batch_size,
+        )
+
+        # URL content types and validators, so repeated references to the
+        # same URL skip HEAD requests and unchanged downloads
+        self.url_cache = UrlMetadataCache(
+            os.path.join(self.cache_layout.namespace("metadata"), "url_metadata.jsonl"),
+            ttl=url_metadata_ttl,
+        )
+
+        self.pdf_processes = pdf_processes
+        self.batch_threads = batch_threads
+        self.batch_processes = batch_processes or os.cpu_count() or 1
+        self.local_first = local_first
+        self.local_quality_threshold = local_quality_threshold
+
+        # JSON/XML files above this size are streamed into an outline with
+        # sampled records instead of being loaded, see `query_data_file`
+        self.structured_size_threshold = structured_size_threshold
+
+        # With `lazy_zip`, archives are only listed and their members are
+        # extracted on demand through `<archive>.zip::<member>` paths
+        self.lazy_zip = lazy_zip
+        self.zip_limits = zip_limits or ZipLimits()
+
+        # Documents larger than `chunk_tokens` are returned as an index plus
+        # a handle, and read chunk by chunk with `get_document_chunks`
+        self.chunk_tokens = chunk_tokens
+        self.chunk_store = DocumentChunkStore(self.cache_layout.namespace("chunks"))
+
+        # Passages of every extracted document are embedded into a local
+        # vector index, searchable with `search_documents`
+        self.document_index: Optional[DocumentIndex] = None
+        if enable_search:
+            self.document_index = DocumentIndex(
+                self.cache_layout.namespace("index"),
+                embedder=embedder,
+                max_bytes=index_max_bytes,
+            )
+
+        # Extracted text keyed by document content, so repeated requests for
+        # the same file or page skip Chunkr/Firecrawl/captioning entirely
+        self.document_cache: Optional[DocumentCache] = None
+        if use_cache:
+            self.document_cache = DocumentCache(
+                self.cache_layout.namespace("extracted"),
+                max_bytes=cache_max_bytes,
+                url_cache=self.url_cache,
+            )
 
     @retry_on_error()
-    def extract_document_content(self, document_path: str) -> Tuple[bool, str]:
+    def extract_document_content(
+        self, document_path: str, page_range: Optional[str] = None
+    ) -> Tuple[bool, str]:
         r"""Extract the content of a given document (or url) and return the processed text.
         It may filter out some information, resulting in inaccurate content.
 
         Args:
-            document_path (str): The path of the document to be processed, either a local path or a URL. It can process image, audio files, zip files and webpages, etc.
+            document_path (str): The path of the document to be processed, either a local path or a URL. It can process image, audio files, zip files and webpages, etc. A file inside a zip archive can be addressed as `archive.zip::member/path`.
+            page_range (str, optional): For PDF files only, the 1-based pages to extract, e.g. "1-5,8,20-". Useful to read long reports part by part. (default: :obj:`None`)
 
         Returns:
             Tuple[bool, str]: A tuple containing a boolean indicating whether the document was processed successfully, and the content of the document (if success).
         """
-        import asyncio
-
         logger.debug(
             f"Calling extract_document_content function with document_path=`{document_path}`"
         )
+        return self._extract_with_cache(document_path, page_range)
+
+    async def aextract_document_content(
+        self, document_path: str, page_range: Optional[str] = None
+    ) -> Tuple[bool, str]:
+        r"""Asynchronously extract the content of a given document (or url) and return the processed text.
+        It may filter out some information, resulting in inaccurate content.
+
+        Args:
+            document_path (str): The path of the document to be processed, either a local path or a URL. It can process image, audio files, zip files and webpages, etc. A file inside a zip archive can be addressed as `archive.zip::member/path`.
+            page_range (str, optional): For PDF files only, the 1-based pages to extract, e.g. "1-5,8,20-". Useful to read long reports part by part. (default: :obj:`None`)
+
+        Returns:
+            Tuple[bool, str]: A tuple containing a boolean indicating whether the document was processed successfully, and the content of the document (if success).
+        """
+        logger.debug(
+            f"Calling aextract_document_content function with document_path=`{document_path}`"
+        )
+        cache_key, cached = await asyncio.to_thread(
+            self._lookup_cache, document_path, page_range
+        )
+        if cached is not None:
+            return await asyncio.to_thread(
+                self._finish_extraction, document_path, None, True, cached
+            )
+
+        # Blocking parsers run on worker threads, Chunkr on the caller's loop
+        result, local_result, is_url = await asyncio.to_thread(
+            self._extract_without_chunkr, document_path, page_range
+        )
+        if result is None:
+            try:
+                result = True, await self._extract_content_with_chunkr(document_path)
+            except Exception as e:
+                result = await asyncio.to_thread(
+                    self._chunkr_fallback, document_path, is_url, local_result, e
+                )
+        return await asyncio.to_thread(
+            self._finish_extraction, document_path, cache_key, *result
+        )
+
+    def extract_documents(self, document_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        r"""Extract the content of several documents (or urls) at once, concurrently. Zip archives are expanded and every file inside is extracted. Prefer this over calling `extract_document_content` repeatedly.
+
+        Args:
+            document_paths (List[str]): The paths of the documents to be processed, local paths or URLs.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For each processed document, a dictionary with `success` (whether it was processed successfully) and `content` (the content of the document, or the error). Documents that do not fit in the size limit of the whole result are replaced by a handle to read them with `get_document_chunks`.
+        """
+        paths: List[str] = []
+        # Archives that could not be expanded, reported in place of their files
+        zip_errors: Dict[str, Dict[str, Any]] = {}
+        order: List[str] = []
+        for document_path in document_paths:
+            if document_path.endswith(".zip") and os.path.isfile(document_path):
+                try:
+                    members = self._unzip_file(document_path)
+                except (ZipLimitError, zipfile.BadZipFile) as e:
+                    logger.warning(f"Failed to unzip {document_path}: {e}")
+                    zip_errors[document_path] = {
+                        "success": False,
+                        "content": f"Error occurred while unzipping {document_path}: {e}",
+                    }
+                    order.append(document_path)
+                    continue
+                paths.extend(members)
+                order.extend(members)
+            else:
+                paths.append(document_path)
+                order.append(document_path)
+
+        results: Dict[str, Dict[str, Any]] = dict(zip_errors)
+        progress = tqdm(total=len(paths), desc="Extracting documents")
+
+        def record(path: str, success: bool, content: Any) -> None:
+            results[path] = {"success": success, "content": content}
+            progress.update(1)
+
+        # CPU-bound parsing of local files runs on processes; everything that
+        # needs the network (or a failed local parse) runs on threads
+        local_jobs: Dict[str, Optional[str]] = {}
+        remote_paths: List[str] = []
+        image_paths: List[str] = []
+        for path in dict.fromkeys(paths):
+            extension = os.path.splitext(path)[1].lower()
+            if extension in self._IMAGE_EXTENSIONS and split_member_path(path) is None:
+                image_paths.append(path)
+            elif self.local_first and extension in LOCAL_EXTENSIONS and os.path.isfile(path):
+                cache_key, cached = self._lookup_cache(path)
+                if cached is not None:
+                    record(
+                        path,
+                        *self._finish_extraction(path, None, True, cached, False),
+                    )
+                else:
+                    local_jobs[path] = cache_key
+            else:
+                remote_paths.append(path)
+
+        if local_jobs:
+            with ProcessPoolExecutor(
+                max_workers=min(self.batch_processes, len(local_jobs))
+            ) as pool:
+                # One process per document, so PDFs are not split any further
+                futures = {
+                    pool.submit(extract_locally, path, 1): path for path in local_jobs
+                }
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        local_result = future.result()
+                    except Exception as e:
+                        logger.warning(f"Local extraction of {path} failed: {e}")
+                        local_result = None
+                    if (
+                        local_result is not None
+                        and local_result.quality >= self.local_quality_threshold
+                    ):
+                        record(
+                            path,
+                            *self._finish_extraction(
+                                path,
+                                local_jobs[path],
+                                True,
+                                local_result.text,
+                                False,
+                            ),
+                        )
+                    else:
+                        remote_paths.append(path)
+
+        if image_paths:
+            for path, result in self.caption_images(image_paths).items():
+                record(
+                    path,
+                    *self._finish_extraction(
+                        path, None, result["success"], result["content"], False
+                    ),
+                )
+
+        def extract(path: str) -> Tuple[bool, Any]:
+            try:
+                return self._extract_with_cache(
+                    path, skip_local=path in local_jobs, bound=False
+                )
+            except Exception as e:
+                logger.error(f"Error occurred while processing {path}: {e}")
+                return False, f"Error occurred while processing document: {e}"
+
+        if remote_paths:
+            with ThreadPoolExecutor(
+                max_workers=min(self.batch_threads, len(remote_paths))
+            ) as pool:
+                futures = {pool.submit(extract, path): path for path in remote_paths}
+                for future in as_completed(futures):
+                    record(futures[future], *future.result())
+
+        progress.close()
+        logger.info(
+            f"Extracted {sum(r['success'] for r in results.values())}/{len(results)} documents."
+        )
+        return self._bound_batch({path: results[path] for path in dict.fromkeys(order)})
+
+    def _bound_batch(
+        self, results: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        r"""Keep the contents of a batch within `chunk_tokens` in total.
+
+        Documents larger than `chunk_tokens` are chunked once and replaced by
+        their chunk index, as `_bound_output` does for single documents. They
+        are returned in order until the budget is spent, and the rest are
+        replaced by a pointer to their chunks.
+        """
+        if self.chunk_tokens is None:
+            return results
+
+        remaining = self.chunk_tokens
+        for path, result in results.items():
+            content = result["content"]
+            text = content if isinstance(content, str) else json.dumps(
+                content, ensure_ascii=False, indent=1
+            )
+            tokens = estimate_tokens(text)
+            if not result["success"]:
+                remaining -= tokens
+                continue
+
+            chunks, shown, shown_tokens = None, content, tokens
+            if tokens > self.chunk_tokens:
+                chunks = split_into_chunks(text, self.chunk_tokens)
+                handle = self.chunk_store.add(path, chunks)
+                shown = format_chunk_index(handle, path, chunks, self.chunk_tokens)
+                shown_tokens = estimate_tokens(shown)
+            if shown_tokens <= remaining:
+                result["content"] = shown
+                remaining -= shown_tokens
+                continue
+
+            if chunks is None:
+                chunks = split_into_chunks(text, self.chunk_tokens)
+                handle = self.chunk_store.add(path, chunks)
+            result["content"] = (
+                f"Not shown to keep the result within {self.chunk_tokens} tokens "
+                f"(~{tokens} tokens). Call `get_document_chunks` with handle "
+                f"`{handle}` and chunk_ids {list(range(len(chunks)))} to read it."
+            )
+            remaining -= estimate_tokens(result["content"])
+        return results
+
+    def caption_images(self, image_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        r"""Make a detailed caption of each of several images (local paths or URLs). Similar images are captioned once, and several images are described per model call, so prefer this over captioning images one by one.
+
+        Args:
+            image_paths (List[str]): The paths or URLs of the images.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: For each image, a dictionary with `success` (whether it was captioned successfully) and `content` (the caption, or the error).
+        """
+        local_paths: Dict[str, Optional[str]] = {}
+        for image_path in image_paths:
+            parsed_url = urlparse(image_path)
+            if parsed_url.scheme and parsed_url.netloc:
+                local_paths[image_path] = self._download_file(image_path)
+            else:
+                local_paths[image_path] = image_path
+
+        captions = self.image_captioner.caption_images(
+            [path for path in local_paths.values() if path is not None]
+        )
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for image_path, local_path in local_paths.items():
+            if local_path is None:
+                results[image_path] = {
+                    "success": False,
+                    "content": f"Failed to download the image: {image_path}.",
+                }
+                continue
+            success, content = captions[local_path]
+            results[image_path] = {"success": success, "content": content}
+        return results
+
+    def query_data_file(
+        self,
+        document_path: str,
+        path: str,
+        where: Optional[str] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        r"""Read specific values from a large JSON, JSONL or XML file without loading it, e.g. after `extract_document_content` returned an outline of the file. The file is streamed record by record (array items, lines, or children of the XML root).
+
+        Args:
+            document_path (str): The local path of the data file.
+            path (str): The path of the values relative to each record, e.g. `user.name`, `items[*].price`, `tags[0]`, or `$` for the whole record. XML attributes are `@name` and element text is `#text`.
+            where (str, optional): Only consider records matching this filter, e.g. `status == active`, `id != 3`, or `name ~ smith` for a case-insensitive substring match. (default: :obj:`None`)
+            limit (int): The maximum number of values to return. (default: :obj:`20`)
+
+        Returns:
+            Dict[str, Any]: The `values` found, the number of `matched_records`, and whether the values were `truncated` to the limit.
+        """
+        if os.path.splitext(document_path)[1].lower() not in STRUCTURED_EXTENSIONS:
+            return {"error": f"Unsupported file type: {document_path}"}
+        if not os.path.isfile(document_path):
+            return {"error": f"Document not found at path: {document_path}."}
+        try:
+            return query_structured_file(document_path, path, where=where, limit=limit)
+        except Exception as e:
+            logger.warning(f"Error occurred while querying {document_path}: {e}")
+            return {"error": f"Error occurred while querying {document_path}: {e}"}
+
+    def _lookup_cache(
+        self, document_path: str, page_range: Optional[str] = None
+    ) -> Tuple[Optional[str], Any]:
+        r"""Return the cache key of a document and its cached content, if any."""
+        # Zip extraction only lists files, there is nothing worth caching
+        if self.document_cache is None or document_path.endswith("zip"):
+            return None, None
+        # Everything that changes which extractor runs is part of the key
+        extension = os.path.splitext(document_path)[1].lower()
+        variant = (
+            f"{extension}|{self.local_first}|{self.structured_size_threshold}|"
+            f"{page_range or ''}"
+        )
+        member_path = split_member_path(document_path)
+        if member_path is not None:
+            # Zip members are keyed by the archive content and the member name
+            document_path, member = member_path
+            variant = f"{member}:{variant}"
+        cache_key = self.document_cache.make_key(document_path, variant=variant)
+        if cache_key is None:
+            return None, None
+        cached = self.document_cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"Document cache hit for {document_path}")
+        return cache_key, cached
+
+    def _finish_extraction(
+        self,
+        document_path: str,
+        cache_key: Optional[str],
+        success: bool,
+        content: Any,
+        bound: bool = True,
+    ) -> Tuple[bool, Any]:
+        r"""Cache, index and size-bound the result of an extraction. Batches
+        pass `bound=False` and bound all their results in `_bound_batch`."""
+        if success and cache_key is not None:
+            self.document_cache.set(cache_key, content, source=document_path)
+        if success and not document_path.endswith("zip"):
+            self._index_content(document_path, content)
+            if bound:
+                content = self._bound_output(document_path, content)
+        return success, content
+
+    def _extract_with_cache(
+        self,
+        document_path: str,
+        page_range: Optional[str] = None,
+        skip_local: bool = False,
+        bound: bool = True,
+    ) -> Tuple[bool, Any]:
+        cache_key, cached = self._lookup_cache(document_path, page_range)
+        if cached is not None:
+            return self._finish_extraction(document_path, None, True, cached, bound)
+
+        success, content = self._extract_document_content(
+            document_path, page_range, skip_local=skip_local
+        )
+        return self._finish_extraction(
+            document_path, cache_key, success, content, bound
+        )
+
+    def search_documents(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        r"""Search the passages of all previously extracted documents, returning the most relevant ones. Much cheaper than re-reading whole documents to answer a question.
+
+        Args:
+            query (str): What to look for, e.g. a question or key phrase.
+            k (int): The number of passages to return. (default: :obj:`5`)
+
+        Returns:
+            List[Dict[str, Any]]: The matching passages with their source document and similarity score.
+        """
+        if self.document_index is None:
+            return []
+        return self.document_index.search(query, k=k)
+
+    def _index_content(self, document_path: str, content) -> None:
+        if self.document_index is None:
+            return
+        text = content if isinstance(content, str) else json.dumps(
+            content, ensure_ascii=False, indent=1
+        )
+        try:
+            self.document_index.add_document(document_path, text)
+        except Exception as e:
+            logger.warning(f"Failed to index {document_path}: {e}")
+
+    def get_document_chunks(self, handle: str, chunk_ids: List[int]) -> Tuple[bool, str]:
+        r"""Read chunks of a large document previously returned by `extract_document_content` as a chunk index.
+
+        Args:
+            handle (str): The handle of the chunked document.
+            chunk_ids (List[int]): The ids of the chunks to read, as listed in the chunk index.
+
+        Returns:
+            Tuple[bool, str]: A tuple containing a boolean indicating whether the chunks were found, and their content.
+        """
+        document = self.chunk_store.get(handle)
+        if document is None:
+            return False, f"No chunked document found with handle: {handle}."
+
+        chunks = document["chunks"]
+        parts = []
+        budget = self.chunk_tokens
+        skipped = []
+        for chunk_id in chunk_ids:
+            if not 0 <= chunk_id < len(chunks):
+                parts.append(f"Chunk {chunk_id}: out of range (0-{len(chunks) - 1}).")
+                continue
+            # Keep the response within `chunk_tokens`, but always return one chunk
+            chunk_tokens = estimate_tokens(chunks[chunk_id])
+            if budget is not None and parts and chunk_tokens > budget:
+                skipped.append(chunk_id)
+                continue
+            parts.append(f"Chunk {chunk_id}:\n{chunks[chunk_id]}")
+            if budget is not None:
+                budget -= chunk_tokens
+        if skipped:
+            parts.append(
+                f"Chunks {', '.join(map(str, skipped))} were not returned to keep "
+                f"the response within {self.chunk_tokens} tokens. Request them "
+                f"in another call."
+            )
+        return True, "\n\n".join(parts)
+
+    def get_document_chunk_index(
+        self, handle: str, offset: int = 0, limit: Optional[int] = None
+    ) -> Tuple[bool, str]:
+        r"""List the chunks of a large document previously returned by `extract_document_content` as a chunk index, starting from a given chunk.
+
+        Args:
+            handle (str): The handle of the chunked document.
+            offset (int): The id of the first chunk to list. (default: :obj:`0`)
+            limit (Optional[int]): The maximum number of chunks to list. (default: :obj:`None`)
+
+        Returns:
+            Tuple[bool, str]: A tuple containing a boolean indicating whether the document was found, and the chunk index.
+        """
+        document = self.chunk_store.get(handle)
+        if document is None:
+            return False, f"No chunked document found with handle: {handle}."
+        return True, format_chunk_index(
+            handle,
+            document["source"],
+            document["chunks"],
+            self.chunk_tokens,
+            offset=offset,
+            limit=limit,
+        )
+
+    def _bound_output(self, document_path: str, content):
+        r"""Replace content larger than `chunk_tokens` by a chunk index."""
+        if self.chunk_tokens is None:
+            return content
+
+        text = content if isinstance(content, str) else json.dumps(
+            content, ensure_ascii=False, indent=1
+        )
+        if estimate_tokens(text) <= self.chunk_tokens:
+            return content
+
+        chunks = split_into_chunks(text, self.chunk_tokens)
+        handle = self.chunk_store.add(document_path, chunks)
+        return format_chunk_index(handle, document_path, chunks, self.chunk_tokens)
+
+    def _extract_document_content(
+        self,
+        document_path: str,
+        page_range: Optional[str] = None,
+        skip_local: bool = False,
+    ) -> Tuple[bool, str]:
+        r"""Extract the content of a document without consulting the cache."""
+        result, local_result, is_url = self._extract_without_chunkr(
+            document_path, page_range, skip_local
+        )
+        if result is not None:
+            return result
+
+        try:
+            # Chunkr is async; run it on the shared background loop rather
+            # than a new event loop per document
+            return True, run_coroutine_sync(
+                self._extract_content_with_chunkr(document_path)
+            )
+        except Exception as e:
+            return self._chunkr_fallback(document_path, is_url, local_result, e)
 
-        if any(document_path.endswith(ext) for ext in [".jpg", ".jpeg", ".png"]):
-            res = self.image_tool.ask_question_about_image(
-                document_path, "Please make a detailed caption about the image."
+    def _extract_without_chunkr(
+        self,
+        document_path: str,
+        page_range: Optional[str] = None,
+        skip_local: bool = False,
+    ) -> Tuple[Optional[Tuple[bool, Any]], Optional[LocalExtraction], bool]:
+        r"""Run every extractor except Chunkr.
+
+        Returns:
+            Tuple: The result, or :obj:`None` if the document should be
+                escalated to Chunkr; the local extraction to fall back on, if
+                any; and whether the document is a URL.
+        """
+        is_url = False
+
+        # Members of lazily listed archives are extracted first and then
+        # dispatched on their own type, see `_extract_zip_member`
+        member_path = split_member_path(document_path)
+        if member_path is not None:
+            return (
+                self._extract_zip_member(*member_path, page_range, skip_local),
+                None,
+                is_url,
             )
-            return True, res
+
+        if any(document_path.endswith(ext) for ext in self._IMAGE_EXTENSIONS):
+            result = self.caption_images([document_path])[document_path]
+            return (result["success"], result["content"]), None, is_url
 
         # if any(document_path.endswith(ext) for ext in ['.mp3', '.wav']):
         #     res = self.audio_tool.ask_question_about_audio(document_path, "Please transcribe the audio content to text.")
@@ -67,106 +658,193 @@ class DocumentProcessingToolkit(BaseToolkit):
 
         if any(document_path.endswith(ext) for ext in ["xls", "xlsx"]):
             res = self.excel_tool.extract_excel_content(document_path)
-            return True, res
+            return (True, res), None, is_url
 
         if any(document_path.endswith(ext) for ext in ["zip"]):
-            extracted_files = self._unzip_file(document_path)
-            return True, f"The extracted files are: {extracted_files}"
-
-        if any(document_path.endswith(ext) for ext in ["json", "jsonl", "jsonld"]):
-            with open(document_path, "r", encoding="utf-8") as f:
-                content = json.load(f)
-            f.close()
-            return True, content
+            try:
+                extracted_files = self._unzip_file(document_path)
+            except (ZipLimitError, zipfile.BadZipFile) as e:
+                return (
+                    (False, f"Error occurred while unzipping {document_path}: {e}"),
+                    None,
+                    is_url,
+                )
+            return (True, f"The extracted files are: {extracted_files}"), None, is_url
 
-        if any(document_path.endswith(ext) for ext in ["py"]):
-            with open(document_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            f.close()
-            return True, content
+        if (
+            os.path.splitext(document_path)[1].lower() in STRUCTURED_EXTENSIONS
+            and os.path.isfile(document_path)
+            and os.path.getsize(document_path) > self.structured_size_threshold
+        ):
+            return (True, summarize_structured_file(document_path)), None, is_url
 
-        if any(document_path.endswith(ext) for ext in ["xml"]):
-            data = None
+        if any(document_path.endswith(ext) for ext in self._TEXT_EXTENSIONS):
             with open(document_path, "r", encoding="utf-8") as f:
                 content = f.read()
-            f.close()
-
-            try:
-                data = xmltodict.parse(content)
-                logger.debug(f"The extracted xml data is: {data}")
-                return True, data
-
-            except Exception:
-                logger.debug(f"The raw xml data is: {content}")
-                return True, content
+            return self._parse_text_document(document_path, content), None, is_url
 
         if self._is_webpage(document_path):
             extracted_text = self._extract_webpage_content(document_path)
-            return True, extracted_text
-
-        else:
-            # judge if url
-            parsed_url = urlparse(document_path)
-            is_url = all([parsed_url.scheme, parsed_url.netloc])
-            if not is_url:
-                if not os.path.exists(document_path):
-                    return False, f"Document not found at path: {document_path}."
+            return (True, extracted_text), None, is_url
+
+        # judge if url
+        parsed_url = urlparse(document_path)
+        is_url = all([parsed_url.scheme, parsed_url.netloc])
+        if not is_url:
+            if not os.path.exists(document_path):
+                return (
+                    (False, f"Document not found at path: {document_path}."),
+                    None,
+                    is_url,
+                )
 
-            # if is docx file, use docx2markdown to convert it
-            if document_path.endswith(".docx"):
-                if is_url:
-                    tmp_path = self._download_file(document_path)
-                else:
-                    tmp_path = document_path
+        # if is docx file, use docx2markdown to convert it
+        if document_path.endswith(".docx"):
+            if is_url:
+                tmp_path = self._download_file(document_path)
+            else:
+                tmp_path = document_path
 
-                file_name = os.path.basename(tmp_path)
-                md_file_path = f"{file_name}.md"
+            file_name = os.path.basename(tmp_path)
+            with self.cache_layout.scratch_dir() as scratch_dir:
+                md_file_path = os.path.join(scratch_dir, f"{file_name}.md")
                 docx_to_markdown(tmp_path, md_file_path)
 
                 # load content of md file
                 with open(md_file_path, "r") as f:
                     extracted_text = f.read()
-                f.close()
-                return True, extracted_text
-            try:
-                result = asyncio.run(self._extract_content_with_chunkr(document_path))
-                return True, result
+            return (True, extracted_text), None, is_url
+
+        # Chunkr always processes the whole file, so page ranges are
+        # served by the local extractor
+        if document_path.endswith(".pdf") and page_range:
+            return (
+                self._extract_pdf_content(document_path, is_url, page_range),
+                None,
+                is_url,
+            )
 
-            except Exception as e:
-                logger.warning(
-                    f"Error occurred while using Chunkr to process document: {e}"
+        # Parse locally first and only escalate scanned or layout-heavy
+        # files to the (slow, paid) Chunkr API
+        local_result = None
+        if self.local_first and not skip_local:
+            local_result = self._extract_locally(document_path, is_url)
+            if (
+                local_result is not None
+                and local_result.quality >= self.local_quality_threshold
+            ):
+                return (True, local_result.text), local_result, is_url
+            if local_result is not None:
+                logger.info(
+                    f"Escalating {document_path} to Chunkr, local extraction "
+                    f"quality {local_result.quality:.2f} ({local_result.reason})."
                 )
-                if document_path.endswith(".pdf"):
-                    # try using pypdf to extract text from pdf
-                    try:
-                        from PyPDF2 import PdfReader
 
-                        if is_url:
-                            tmp_path = self._download_file(document_path)
-                            document_path = tmp_path
+        return None, local_result, is_url
+
+    def _chunkr_fallback(
+        self,
+        document_path: str,
+        is_url: bool,
+        local_result: Optional[LocalExtraction],
+        error: Exception,
+    ) -> Tuple[bool, Any]:
+        r"""Recover from a failed Chunkr extraction."""
+        logger.warning(f"Error occurred while using Chunkr to process document: {error}")
+        if local_result is not None and local_result.text.strip():
+            # A low quality local extraction beats no content at all
+            return True, local_result.text
+
+        if document_path.endswith(".pdf"):
+            # try using pypdf to extract text from pdf
+            return self._extract_pdf_content(document_path, is_url)
 
-                        # Open file in binary mode for PdfReader
-                        f = open(document_path, "rb")
-                        reader = PdfReader(f)
-                        extracted_text = ""
-                        for page in reader.pages:
-                            extracted_text += page.extract_text()
-                        f.close()
+        # If we get here, either it's not a PDF or PDF processing failed
+        logger.error(f"Error occurred while processing document: {error}")
+        return False, f"Error occurred while processing document: {error}"
 
-                        return True, extracted_text
+    _IMAGE_EXTENSIONS = [".jpg", ".jpeg", ".png"]
 
-                    except Exception as pdf_error:
-                        logger.error(
-                            f"Error occurred while processing pdf: {pdf_error}"
-                        )
-                        return (
-                            False,
-                            f"Error occurred while processing pdf: {pdf_error}",
-                        )
+    # File types parsed from their text alone, without a file on disk
+    _TEXT_EXTENSIONS = ["json", "jsonl", "jsonld", "py", "xml"]
 
-                # If we get here, either it's not a PDF or PDF processing failed
-                logger.error(f"Error occurred while processing document: {e}")
-                return False, f"Error occurred while processing document: {e}"
+    def _parse_text_document(self, document_path: str, content: str) -> Tuple[bool, Any]:
+        if document_path.endswith("jsonl"):
+            return True, [json.loads(line) for line in content.splitlines() if line.strip()]
+
+        if any(document_path.endswith(ext) for ext in ["json", "jsonld"]):
+            return True, json.loads(content)
+
+        if any(document_path.endswith(ext) for ext in ["xml"]):
+            try:
+                data = xmltodict.parse(content)
+                logger.debug(f"The extracted xml data is: {data}")
+                return True, data
+
+            except Exception:
+                logger.debug(f"The raw xml data is: {content}")
+                return True, content
+
+        return True, content
+
+    def _extract_zip_member(
+        self,
+        zip_path: str,
+        member: str,
+        page_range: Optional[str] = None,
+        skip_local: bool = False,
+    ) -> Tuple[bool, Any]:
+        r"""Extract a single member of a zip archive on demand. Text-like
+        members are parsed straight from memory; anything else is streamed
+        to the cache directory and processed like a regular file."""
+        try:
+            with SafeZipArchive(zip_path, self.zip_limits) as archive:
+                if any(member.endswith(ext) for ext in self._TEXT_EXTENSIONS):
+                    content = archive.read_member(member).decode("utf-8", errors="replace")
+                    return self._parse_text_document(member, content)
+
+                if os.path.splitext(member)[1].lower() in IN_MEMORY_EXTENSIONS:
+                    local_result = extract_text_from_bytes(member, archive.read_member(member))
+                    return True, local_result.text
+
+                extracted_path = archive.extract_member(member, self._zip_extract_path(zip_path))
+        except (KeyError, ZipLimitError, zipfile.BadZipFile, OSError) as e:
+            return False, f"Error occurred while reading {member} from {zip_path}: {e}"
+
+        return self._extract_document_content(extracted_path, page_range, skip_local)
+
+    def _extract_locally(
+        self, document_path: str, is_url: bool
+    ) -> Optional[LocalExtraction]:
+        r"""Run the local extraction engine on a supported file type."""
+        extension = os.path.splitext(urlparse(document_path).path)[1].lower()
+        if extension not in LOCAL_EXTENSIONS:
+            return None
+        if is_url:
+            document_path = self._download_file(document_path)
+            if document_path is None:
+                return None
+        return extract_locally(document_path, pdf_processes=self.pdf_processes)
+
+    def _extract_pdf_content(
+        self, document_path: str, is_url: bool, page_range: Optional[str] = None
+    ) -> Tuple[bool, str]:
+        r"""Extract the text layer of a PDF locally with PyPDF2."""
+        try:
+            if is_url:
+                document_path = self._download_file(document_path)
+
+            extracted_text = extract_pdf_text(
+                document_path, page_range=page_range, processes=self.pdf_processes
+            )
+            return True, extracted_text
+
+        except Exception as pdf_error:
+            logger.error(f"Error occurred while processing pdf: {pdf_error}")
+            return (
+                False,
+                f"Error occurred while processing pdf: {pdf_error}",
+            )
 
     def _is_webpage(self, url: str) -> bool:
         r"""Judge whether the given URL is a webpage."""
@@ -181,10 +859,8 @@ class DocumentProcessingToolkit(BaseToolkit):
             if file_type is not None and "text/html" in file_type:
                 return True
 
-            response = requests.head(url, allow_redirects=True, timeout=10)
-            content_type = response.headers.get("Content-Type", "").lower()
-
-            if "text/html" in content_type:
+            metadata = self.url_cache.get(url)
+            if "text/html" in metadata.content_type:
                 return True
             else:
                 return False
@@ -213,26 +889,27 @@ class DocumentProcessingToolkit(BaseToolkit):
             logger.error(
                 f"Error while processing document {document_path}: {result.message} using Chunkr."
             )
-            return f"Error while processing document: {result.message}"
+            # Raise so that callers fall back to local parsing instead of
+            # treating (and caching) the error message as document content
+            raise RuntimeError(f"Error while processing document: {result.message}")
 
         # extract document name
         document_name = os.path.basename(document_path)
         output_file_path: str
 
-        if output_format == "json":
-            output_file_path = f"{document_name}.json"
-            result.json(output_file_path)
-
-        elif output_format == "markdown":
-            output_file_path = f"{document_name}.md"
-            result.markdown(output_file_path)
-
-        else:
+        if output_format not in ["json", "markdown"]:
             return "Invalid output format."
 
-        with open(output_file_path, "r") as f:
-            extracted_text = f.read()
-        f.close()
+        with self.cache_layout.scratch_dir() as scratch_dir:
+            if output_format == "json":
+                output_file_path = os.path.join(scratch_dir, f"{document_name}.json")
+                result.json(output_file_path)
+            else:
+                output_file_path = os.path.join(scratch_dir, f"{document_name}.md")
+                result.markdown(output_file_path)
+
+            with open(output_file_path, "r") as f:
+                extracted_text = f.read()
         return extracted_text
 
     @retry_on_error()
@@ -256,18 +933,14 @@ class DocumentProcessingToolkit(BaseToolkit):
         return str(data["data"][0]["markdown"])
 
     def _download_file(self, url: str):
-        r"""Download a file from a URL and save it to the cache directory."""
+        r"""Download a file from a URL and save it to the cache directory.
+        Files already downloaded are revalidated instead of fetched again,
+        and interrupted downloads are resumed."""
         try:
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
             file_name = url.split("/")[-1]
-
-            file_path = os.path.join(self.cache_dir, file_name)
-
-            with open(file_path, "wb") as file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    file.write(chunk)
-
+            file_path = self.cache_layout.download_path(url, file_name)
+            file_path = self.url_cache.download(url, file_path)
+            self.cache_layout.clean()
             return file_path
 
         except requests.exceptions.RequestException as e:
@@ -278,24 +951,25 @@ class DocumentProcessingToolkit(BaseToolkit):
 
         return time.strftime("%m%d%H%M")
 
+    def _zip_extract_path(self, zip_path: str) -> str:
+        return self.cache_layout.archive_path(zip_path)
+
     def _unzip_file(self, zip_path: str) -> List[str]:
+        r"""Extract a zip archive in-process, streaming members to disk.
+
+        Archives exceeding `zip_limits` (size, member count, compression
+        ratio) or containing paths outside the extraction directory raise
+        :obj:`ZipLimitError`. With `lazy_zip`, nothing is written and
+        `<archive>.zip::<member>` paths are returned instead.
+        """
         if not zip_path.endswith(".zip"):
             raise ValueError("Only .zip files are supported")
 
-        zip_name = os.path.splitext(os.path.basename(zip_path))[0]
-        extract_path = os.path.join(self.cache_dir, zip_name)
-        os.makedirs(extract_path, exist_ok=True)
-
-        try:
-            subprocess.run(["unzip", "-o", zip_path, "-d", extract_path], check=True)
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Failed to unzip file: {e}")
-
-        extracted_files = []
-        for root, _, files in os.walk(extract_path):
-            for file in files:
-                extracted_files.append(os.path.join(root, file))
-
+        with SafeZipArchive(zip_path, self.zip_limits) as archive:
+            if self.lazy_zip:
+                return [f"{zip_path}::{name}" for name in archive.names()]
+            extracted_files = archive.extract_all(self._zip_extract_path(zip_path))
+        self.cache_layout.clean()
         return extracted_files
 
     def get_tools(self) -> List[FunctionTool]:
@@ -304,6 +978,15 @@ class DocumentProcessingToolkit(BaseToolkit):
         Returns:
             List[FunctionTool]: A list of FunctionTool objects representing the functions in the toolkit.
         """
-        return [
+        tools = [
             FunctionTool(self.extract_document_content),
-        ]  # Added closing triple quotes here
+            FunctionTool(self.extract_documents),
+            FunctionTool(self.caption_images),
+            FunctionTool(self.query_data_file),
+        ]
+        if self.chunk_tokens is not None:
+            tools.append(FunctionTool(self.get_document_chunks))
+            tools.append(FunctionTool(self.get_document_chunk_index))
+        if self.document_index is not None:
+            tools.append(FunctionTool(self.search_documents))
+        return tools  # Added closing triple quotes here
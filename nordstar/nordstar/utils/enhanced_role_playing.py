@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 
 from camel.agents import ChatAgent
@@ -7,8 +7,17 @@ from camel.messages.base import BaseMessage
 from camel.societies import RolePlaying
 from camel.logger import get_logger
 
+from .chat_agent import NordstarChatAgent
+from .rate_limit import RateLimiter
+from .response_cache import CachedModel, LLMResponseCache
+from .tool_cache import ToolResultCache, cached_tools
+
 
 from copy import deepcopy
+from dataclasses import dataclass
+import json
+import re
+import time
 
 logger = get_logger(__name__)
 
@@ -25,6 +34,20 @@ class NordstarRolePlaying(RolePlaying):
 
         self.output_language = kwargs.get("output_language", None)
 
+        # Options of the assistant's NordstarChatAgent, not known to RolePlaying
+        self.parallel_tool_calls: bool = kwargs.pop("parallel_tool_calls", False)
+        self.parallel_safe_tools: Optional[List[str]] = kwargs.pop(
+            "parallel_safe_tools", None
+        )
+        self.max_tool_workers: int = kwargs.pop("max_tool_workers", 8)
+        self.tool_call_timeout: Optional[float] = kwargs.pop("tool_call_timeout", None)
+        # Replays the model responses of identical requests, e.g. on reruns
+        self.response_cache: Optional[LLMResponseCache] = kwargs.pop(
+            "response_cache", None
+        )
+        # Serves repeated calls of the assistant's tools with the same arguments
+        self.tool_cache: Optional[ToolResultCache] = kwargs.pop("tool_cache", None)
+
         super().__init__(**kwargs)
 
         init_user_sys_msg, init_assistant_sys_msg = self._construct_gaia_sys_msgs()
@@ -90,20 +113,35 @@ class NordstarRolePlaying(RolePlaying):
         #         model_type=ModelType.O3_MINI,
         #     )
 
-        self.assistant_agent = ChatAgent(
+        if self.tool_cache is not None and (assistant_agent_kwargs or {}).get("tools"):
+            assistant_agent_kwargs = {
+                **assistant_agent_kwargs,
+                "tools": cached_tools(assistant_agent_kwargs["tools"], cache=self.tool_cache),
+            }
+
+        self.assistant_agent = NordstarChatAgent(
             init_assistant_sys_msg,
             output_language=output_language,
+            parallel_tool_calls=self.parallel_tool_calls,
+            parallel_safe_tools=self.parallel_safe_tools,
+            max_tool_workers=self.max_tool_workers,
+            tool_call_timeout=self.tool_call_timeout,
             **(assistant_agent_kwargs or {}),
         )
         self.assistant_sys_msg = self.assistant_agent.system_message
 
-        self.user_agent = ChatAgent(
+        # Also a NordstarChatAgent, for the metrics of its model requests
+        self.user_agent = NordstarChatAgent(
             init_user_sys_msg,
             output_language=output_language,
             **(user_agent_kwargs or {}),
         )
         self.user_sys_msg = self.user_agent.system_message
 
+        if self.response_cache is not None:
+            for agent in (self.assistant_agent, self.user_agent):
+                agent.model_backend = CachedModel(agent.model_backend, self.response_cache)
+
     # def _judge_if_reasoning_task(self, question: str) -> bool:
     #     r"""Judge if the question is a reasoning task."""
 
@@ -197,89 +235,30 @@ Please note that our overall task may be very complicated. Here are some tips th
 
         return user_sys_msg, assistant_sys_msg
 
-    def step(
-        self, assistant_msg: BaseMessage
-    ) -> Tuple[ChatAgentResponse, ChatAgentResponse]:
-        user_response = self.user_agent.step(assistant_msg)
-        if user_response.terminated or user_response.msgs is None:
-            return (
-                ChatAgentResponse(msgs=[], terminated=False, info={}),
-                ChatAgentResponse(
-                    msgs=[],
-                    terminated=user_response.terminated,
-                    info=user_response.info,
-                ),
-            )
-        user_msg = self._reduce_message_options(user_response.msgs)
-
-        modified_user_msg = deepcopy(user_msg)
-
-        if "TASK_DONE" not in user_msg.content:
-            modified_user_msg.content += f"""\n
-            Here are auxiliary information about the overall task, which may help you understand the intent of the current task:
-            <auxiliary_information>
-            {self.task_prompt}
-            </auxiliary_information>
-            If there are available tools and you want to call them, never say 'I will ...', but first call the tool and reply based on tool call's result, and tell me which tool you have called.
-            """
-
-        else:
-            # The task is done, and the assistant agent need to give the final answer about the original task
-            modified_user_msg.content += f"""\n
+    def _task_done_prompt(self) -> str:
+        r"""The instruction appended to the user message once the task is
+        done, asking the assistant for the final answer."""
+        return f"""\n
             Now please make a final answer of the original task based on our conversation : <task>{self.task_prompt}</task>
             """
 
-        # process assistant's response
-        assistant_response = self.assistant_agent.step(modified_user_msg)
-        if assistant_response.terminated or assistant_response.msgs is None:
-            return (
-                ChatAgentResponse(
-                    msgs=[],
-                    terminated=assistant_response.terminated,
-                    info=assistant_response.info,
-                ),
-                ChatAgentResponse(
-                    msgs=[user_msg], terminated=False, info=user_response.info
-                ),
-            )
-        assistant_msg = self._reduce_message_options(assistant_response.msgs)
-
-        modified_assistant_msg = deepcopy(assistant_msg)
-        if "TASK_DONE" not in user_msg.content:
-            modified_assistant_msg.content += f"""\n
-                Provide me with the next instruction and input (if needed) based on my response and our current task: <task>{self.task_prompt}</task>
-                Before producing the final answer, please check whether I have rechecked the final answer using different toolkit as much as possible. If not, please remind me to do that.
-                If I have written codes, remind me to run the codes.
-                If you think our task is done, reply with `TASK_DONE` to end our conversation.
-            """
-
-        # return the modified messages
+    def _user_terminated(
+        self, user_response: ChatAgentResponse
+    ) -> Tuple[ChatAgentResponse, ChatAgentResponse]:
         return (
+            ChatAgentResponse(msgs=[], terminated=False, info={}),
             ChatAgentResponse(
-                msgs=[modified_assistant_msg],
-                terminated=assistant_response.terminated,
-                info=assistant_response.info,
-            ),
-            ChatAgentResponse(
-                msgs=[modified_user_msg],
+                msgs=[],
                 terminated=user_response.terminated,
                 info=user_response.info,
             ),
         )
 
-    async def astep(
-        self, assistant_msg: BaseMessage
-    ) -> Tuple[ChatAgentResponse, ChatAgentResponse]:
-        user_response = await self.user_agent.astep(assistant_msg)
-        if user_response.terminated or user_response.msgs is None:
-            return (
-                ChatAgentResponse(msgs=[], terminated=False, info={}),
-                ChatAgentResponse(
-                    msgs=[],
-                    terminated=user_response.terminated,
-                    info=user_response.info,
-                ),
-            )
+    def _prepare_user_msg(
+        self, user_response: ChatAgentResponse
+    ) -> Tuple[BaseMessage, BaseMessage]:
+        r"""Pick the user message and add the task context for the
+        assistant. Returns the original and the modified message."""
         user_msg = self._reduce_message_options(user_response.msgs)
 
         modified_user_msg = deepcopy(user_msg)
@@ -295,11 +274,17 @@ Please note that our overall task may be very complicated. Here are some tips th
 
         else:
             # The task is done, and the assistant agent need to give the final answer about the original task
-            modified_user_msg.content += f"""\n
-            Now please make a final answer of the original task based on our conversation : <task>{self.task_prompt}</task>
-            """
+            modified_user_msg.content += self._task_done_prompt()
+        return user_msg, modified_user_msg
 
-        assistant_response = await self.assistant_agent.astep(user_msg)
+    def _finish_step(
+        self,
+        user_response: ChatAgentResponse,
+        user_msg: BaseMessage,
+        modified_user_msg: BaseMessage,
+        assistant_response: ChatAgentResponse,
+    ) -> Tuple[ChatAgentResponse, ChatAgentResponse]:
+        r"""Build the responses of a round from the assistant's response."""
         if assistant_response.terminated or assistant_response.msgs is None:
             return (
                 ChatAgentResponse(
@@ -322,53 +307,55 @@ Please note that our overall task may be very complicated. Here are some tips th
                 If you think our task is done, reply with `TASK_DONE` to end our conversation.
             """
 
+        # return the modified messages
         return (
             ChatAgentResponse(
-                msgs=[assistant_msg],
+                msgs=[modified_assistant_msg],
                 terminated=assistant_response.terminated,
                 info=assistant_response.info,
             ),
             ChatAgentResponse(
-                msgs=[user_msg],
+                msgs=[modified_user_msg],
                 terminated=user_response.terminated,
                 info=user_response.info,
             ),
         )
 
-
-class NordstarGAIARolePlaying(NordstarRolePlaying):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-
     def step(
         self, assistant_msg: BaseMessage
     ) -> Tuple[ChatAgentResponse, ChatAgentResponse]:
         user_response = self.user_agent.step(assistant_msg)
         if user_response.terminated or user_response.msgs is None:
-            return (
-                ChatAgentResponse(msgs=[], terminated=False, info={}),
-                ChatAgentResponse(
-                    msgs=[],
-                    terminated=user_response.terminated,
-                    info=user_response.info,
-                ),
-            )
-        user_msg = self._reduce_message_options(user_response.msgs)
+            return self._user_terminated(user_response)
+        user_msg, modified_user_msg = self._prepare_user_msg(user_response)
 
-        modified_user_msg = deepcopy(user_msg)
+        # process assistant's response
+        assistant_response = self.assistant_agent.step(modified_user_msg)
+        return self._finish_step(
+            user_response, user_msg, modified_user_msg, assistant_response
+        )
 
-        if "TASK_DONE" not in user_msg.content:
-            modified_user_msg.content += f"""\n
-            Here are auxiliary information about the overall task, which may help you understand the intent of the current task:
-            <auxiliary_information>
-            {self.task_prompt}
-            </auxiliary_information>
-            If there are available tools and you want to call them, never say 'I will ...', but first call the tool and reply based on tool call's result, and tell me which tool you have called.
-            """
+    async def astep(
+        self, assistant_msg: BaseMessage
+    ) -> Tuple[ChatAgentResponse, ChatAgentResponse]:
+        user_response = await self.user_agent.astep(assistant_msg)
+        if user_response.terminated or user_response.msgs is None:
+            return self._user_terminated(user_response)
+        user_msg, modified_user_msg = self._prepare_user_msg(user_response)
 
-        else:
-            # The task is done, and the assistant agent need to give the final answer about the original task
-            modified_user_msg.content += f"""\n
+        # process assistant's response
+        assistant_response = await self.assistant_agent.astep(modified_user_msg)
+        return self._finish_step(
+            user_response, user_msg, modified_user_msg, assistant_response
+        )
+
+
+class NordstarGAIARolePlaying(NordstarRolePlaying):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def _task_done_prompt(self) -> str:
+        return f"""\n
             Now please make a final answer of the original task based on our conversation : <task>{self.task_prompt}</task>
             Please pay special attention to the format in which the answer is presented.
             You should first analyze the answer format required by the question and then output the final answer that meets the format requirements.
@@ -384,49 +371,165 @@ class NordstarGAIARolePlaying(NordstarRolePlaying):
             </hint>
             """
 
-        # process assistant's response
-        assistant_response = self.assistant_agent.step(modified_user_msg)
-        if assistant_response.terminated or assistant_response.msgs is None:
-            return (
-                ChatAgentResponse(
-                    msgs=[],
-                    terminated=assistant_response.terminated,
-                    info=assistant_response.info,
-                ),
-                ChatAgentResponse(
-                    msgs=[user_msg], terminated=False, info=user_response.info
-                ),
-            )
-        assistant_msg = self._reduce_message_options(assistant_response.msgs)
 
-        modified_assistant_msg = deepcopy(assistant_msg)
-        if "TASK_DONE" not in user_msg.content:
-            modified_assistant_msg.content += f"""\n
-                Provide me with the next instruction and input (if needed) based on my response and our current task: <task>{self.task_prompt}</task>
-                Before producing the final answer, please check whether I have rechecked the final answer using different toolkit as much as possible. If not, please remind me to do that.
-                If I have written codes, remind me to run the codes.
-                If you think our task is done, reply with `TASK_DONE` to end our conversation.
-            """
+def _round_record(
+    society: RolePlaying,
+    assistant_response: ChatAgentResponse,
+    user_response: ChatAgentResponse,
+    wall_time: float,
+) -> dict:
+    r"""Build the chat history entry of a round, with the metrics its agents
+    recorded: the time and usage of each model request, and the duration of
+    each tool call."""
+    llm_calls: List[dict] = []
+    tool_metrics: Dict[str, dict] = {}
+    for agent in (society.user_agent, society.assistant_agent):
+        if isinstance(agent, NordstarChatAgent):
+            records = agent.metrics.drain()
+            llm_calls += records["llm_calls"]
+            tool_metrics.update(records["tool_calls"])
+
+    # convert tool call to dict
+    tool_call_records: List[dict] = []
+    for tool_call in assistant_response.info["tool_calls"]:
+        record = tool_call.as_dict()
+        timing = tool_metrics.get(getattr(tool_call, "tool_call_id", None))
+        if timing is not None:
+            record.update(duration=timing["duration"], failed=timing["failed"])
+        tool_call_records.append(record)
+
+    return {
+        "user": user_response.msg.content,
+        "assistant": assistant_response.msg.content,
+        "tool_calls": tool_call_records,
+        "metrics": {"wall_time": wall_time, "llm_calls": llm_calls},
+    }
 
-        # return the modified messages
-        return (
-            ChatAgentResponse(
-                msgs=[modified_assistant_msg],
-                terminated=assistant_response.terminated,
-                info=assistant_response.info,
-            ),
-            ChatAgentResponse(
-                msgs=[modified_user_msg],
-                terminated=user_response.terminated,
-                info=user_response.info,
-            ),
-        )
+
+@dataclass
+class SocietyBudget:
+    r"""Limits that stop a society before its round limit.
+
+    Args:
+        max_tokens (int, optional): No new round is started once the
+            society used this many prompt and completion tokens.
+            (default: :obj:`None`)
+        max_tool_calls (int, optional): No new round is started once the
+            assistant made this many tool calls. (default: :obj:`None`)
+        stagnation_rounds (int, optional): Stop after this many consecutive
+            rounds make no progress: every tool call of the round was already
+            made with the same arguments and result earlier in the run, or,
+            in a round without tool calls, the assistant repeats an earlier
+            message up to case, punctuation and whitespace.
+            (default: :obj:`None`)
+    """
+
+    max_tokens: Optional[int] = None
+    max_tool_calls: Optional[int] = None
+    stagnation_rounds: Optional[int] = None
+
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+class _BudgetTracker:
+    r"""Tracks the usage of a society run against its limits, and tells why
+    it should stop."""
+
+    def __init__(self, timeout: Optional[float], budget: Optional[SocietyBudget]):
+        self.timeout = timeout
+        self.budget = budget or SocietyBudget()
+        self.start_time = time.monotonic()
+        self.tokens = 0
+        self.tool_calls = 0
+        # Fingerprints of the tool calls and messages seen in the run
+        self._seen_calls: Set[str] = set()
+        self._seen_messages: Set[str] = set()
+        self._repeats = 0
+
+    def before_round(self, _round: int) -> Optional[str]:
+        if (
+            self.timeout is not None
+            and _round > 0
+            and time.monotonic() - self.start_time > self.timeout
+        ):
+            return "timeout"
+        return None
+
+    def after_round(self, tokens: int, round_data: dict) -> Optional[str]:
+        self.tokens += tokens
+        self.tool_calls += len(round_data["tool_calls"])
+
+        self._repeats = 0 if self._made_progress(round_data) else self._repeats + 1
+
+        budget = self.budget
+        if budget.max_tokens is not None and self.tokens >= budget.max_tokens:
+            return "max_tokens"
+        if budget.max_tool_calls is not None and self.tool_calls >= budget.max_tool_calls:
+            return "max_tool_calls"
+        if budget.stagnation_rounds is not None and self._repeats >= budget.stagnation_rounds:
+            return "stagnation"
+        return None
+
+    def _made_progress(self, round_data: dict) -> bool:
+        r"""Whether a round made a tool call, or without tool calls sent an
+        assistant message, not seen before in the run."""
+        calls = {
+            json.dumps(
+                [call.get("tool_name"), call.get("args"), call.get("result")],
+                sort_keys=True,
+                default=str,
+            )
+            for call in round_data["tool_calls"]
+        }
+        if calls:
+            new_calls = calls - self._seen_calls
+            self._seen_calls |= calls
+            return bool(new_calls)
+
+        message = _NON_WORD.sub(" ", (round_data["assistant"] or "").lower()).strip()
+        if message in self._seen_messages:
+            return False
+        self._seen_messages.add(message)
+        return True
 
 
 def run_society(
     society: RolePlaying,
     round_limit: int = 15,
+    rate_limiter: Optional[RateLimiter] = None,
+    timeout: Optional[float] = None,
+    token_limiter: Optional[RateLimiter] = None,
+    budget: Optional[SocietyBudget] = None,
 ) -> Tuple[str, List[dict], dict]:
+    r"""Run a society until the task is done or :obj:`round_limit` rounds.
+
+    Args:
+        society (RolePlaying): The society to run.
+        round_limit (int, optional): The maximum number of rounds.
+            (default: :obj:`15`)
+        rate_limiter (RateLimiter, optional): Acquired once before each
+            round, to bound the rate of LLM requests shared between
+            concurrent societies. (default: :obj:`None`)
+        timeout (float, optional): No new round is started after this many
+            seconds. (default: :obj:`None`)
+        token_limiter (RateLimiter, optional): A budget of LLM tokens shared
+            between concurrent societies. The tokens of each round are
+            charged after it, and a round only starts once the budget is no
+            longer overdrawn. (default: :obj:`None`)
+        budget (SocietyBudget, optional): Token, tool call and stagnation
+            limits of this society. (default: :obj:`None`)
+
+    Returns:
+        Tuple[str, List[dict], dict]: The answer, the chat history and the
+            token usage, with the ``stop_reason`` of the run: ``task_done``,
+            ``terminated``, ``round_limit``, ``timeout`` or the exhausted
+            limit of :obj:`budget`. Each round of the history carries its ``metrics``:
+            its wall time and the time and usage of each model request, and
+            each tool call its ``duration``.
+    """
+    tracker = _BudgetTracker(timeout, budget)
+    stop_reason = "round_limit"
     overall_completion_token_count = 0
     overall_prompt_token_count = 0
 
@@ -436,26 +539,33 @@ def run_society(
         """
     input_msg = society.init_chat(init_prompt)
     for _round in range(round_limit):
+        reason = tracker.before_round(_round)
+        if reason is not None:
+            logger.warning(f"Society stopped after {_round} rounds: {reason}.")
+            stop_reason = reason
+            break
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        if token_limiter is not None:
+            token_limiter.acquire(0)
+        round_started = time.monotonic()
         assistant_response, user_response = society.step(input_msg)
-        overall_completion_token_count += (
+        round_completion_tokens = (
             assistant_response.info["usage"]["completion_tokens"]
             + user_response.info["usage"]["completion_tokens"]
         )
-        overall_prompt_token_count += (
+        round_prompt_tokens = (
             assistant_response.info["usage"]["prompt_tokens"]
             + user_response.info["usage"]["prompt_tokens"]
         )
+        overall_completion_token_count += round_completion_tokens
+        overall_prompt_token_count += round_prompt_tokens
+        if token_limiter is not None:
+            token_limiter.consume(round_completion_tokens + round_prompt_tokens)
 
-        # convert tool call to dict
-        tool_call_records: List[dict] = []
-        for tool_call in assistant_response.info["tool_calls"]:
-            tool_call_records.append(tool_call.as_dict())
-
-        _data = {
-            "user": user_response.msg.content,
-            "assistant": assistant_response.msg.content,
-            "tool_calls": tool_call_records,
-        }
+        _data = _round_record(
+            society, assistant_response, user_response, time.monotonic() - round_started
+        )
 
         chat_history.append(_data)
         logger.info(f"Round #{_round} user_response:\n {user_response.msgs[0].content}")
@@ -463,11 +573,16 @@ def run_society(
             f"Round #{_round} assistant_response:\n {assistant_response.msgs[0].content}"
         )
 
-        if (
-            assistant_response.terminated
-            or user_response.terminated
-            or "TASK_DONE" in user_response.msg.content
-        ):
+        if assistant_response.terminated or user_response.terminated:
+            stop_reason = "terminated"
+            break
+        if "TASK_DONE" in user_response.msg.content:
+            stop_reason = "task_done"
+            break
+        reason = tracker.after_round(round_completion_tokens + round_prompt_tokens, _data)
+        if reason is not None:
+            logger.warning(f"Society stopped after {_round + 1} rounds: {reason}.")
+            stop_reason = reason
             break
 
         input_msg = assistant_response.msg
@@ -476,6 +591,7 @@ def run_society(
     token_info = {
         "completion_token_count": overall_completion_token_count,
         "prompt_token_count": overall_prompt_token_count,
+        "stop_reason": stop_reason,
     }
 
     return answer, chat_history, token_info
@@ -484,7 +600,15 @@ def run_society(
 async def arun_society(
     society: RolePlaying,
     round_limit: int = 15,
+    rate_limiter: Optional[RateLimiter] = None,
+    timeout: Optional[float] = None,
+    token_limiter: Optional[RateLimiter] = None,
+    budget: Optional[SocietyBudget] = None,
 ) -> Tuple[str, List[dict], dict]:
+    r"""Asynchronous version of :func:`run_society`, driving the society
+    with :meth:`astep` so that many societies can share one event loop."""
+    tracker = _BudgetTracker(timeout, budget)
+    stop_reason = "round_limit"
     overall_completion_token_count = 0
     overall_prompt_token_count = 0
 
@@ -494,25 +618,33 @@ async def arun_society(
         """
     input_msg = society.init_chat(init_prompt)
     for _round in range(round_limit):
+        reason = tracker.before_round(_round)
+        if reason is not None:
+            logger.warning(f"Society stopped after {_round} rounds: {reason}.")
+            stop_reason = reason
+            break
+        if rate_limiter is not None:
+            await rate_limiter.aacquire()
+        if token_limiter is not None:
+            await token_limiter.aacquire(0)
+        round_started = time.monotonic()
         assistant_response, user_response = await society.astep(input_msg)
-        overall_prompt_token_count += assistant_response.info["usage"][
-            "completion_tokens"
-        ]
-        overall_prompt_token_count += (
+        round_completion_tokens = (
+            assistant_response.info["usage"]["completion_tokens"]
+            + user_response.info["usage"]["completion_tokens"]
+        )
+        round_prompt_tokens = (
             assistant_response.info["usage"]["prompt_tokens"]
             + user_response.info["usage"]["prompt_tokens"]
         )
+        overall_completion_token_count += round_completion_tokens
+        overall_prompt_token_count += round_prompt_tokens
+        if token_limiter is not None:
+            token_limiter.consume(round_completion_tokens + round_prompt_tokens)
 
-        # convert tool call to dict
-        tool_call_records: List[dict] = []
-        for tool_call in assistant_response.info["tool_calls"]:
-            tool_call_records.append(tool_call.as_dict())
-
-        _data = {
-            "user": user_response.msg.content,
-            "assistant": assistant_response.msg.content,
-            "tool_calls": tool_call_records,
-        }
+        _data = _round_record(
+            society, assistant_response, user_response, time.monotonic() - round_started
+        )
 
         chat_history.append(_data)
         logger.info(f"Round #{_round} user_response:\n {user_response.msgs[0].content}")
@@ -521,12 +653,19 @@ async def arun_society(
         )
 
         # Check other termination conditions
+        if assistant_response.terminated or user_response.terminated:
+            stop_reason = "terminated"
+            break
         if (
-            assistant_response.terminated
-            or user_response.terminated
-            or "TASK_DONE" in user_response.msg.content
+            "TASK_DONE" in user_response.msg.content
             or "任务已完成" in user_response.msg.content
         ):
+            stop_reason = "task_done"
+            break
+        reason = tracker.after_round(round_completion_tokens + round_prompt_tokens, _data)
+        if reason is not None:
+            logger.warning(f"Society stopped after {_round + 1} rounds: {reason}.")
+            stop_reason = reason
             break
 
         input_msg = assistant_response.msg
@@ -535,6 +674,7 @@ async def arun_society(
     token_info = {
         "completion_token_count": overall_completion_token_count,
         "prompt_token_count": overall_prompt_token_count,
+        "stop_reason": stop_reason,
     }
 
     return answer, chat_history, token_info
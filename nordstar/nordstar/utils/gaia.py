@@ -2,12 +2,14 @@ import sys
 
 sys.path.append("../")
 
+import asyncio
 import json
 import random
-import re
-import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, Union, Tuple
+from typing import Any, Callable, Dict, List, Literal, Optional, Union, Tuple
 
 from tqdm import tqdm
 from camel.benchmarks import BaseBenchmark
@@ -15,10 +17,26 @@ from camel.tasks import Task
 from camel.logger import get_logger
 
 from .common import extract_pattern
-from .enhanced_role_playing import run_society, NordstarGAIARolePlaying
+from .dataset_index import TaskIndex
+from .enhanced_role_playing import (
+    arun_society,
+    run_society,
+    NordstarGAIARolePlaying,
+    SocietyBudget,
+)
+from .metrics import summarize_results_metrics, summarize_task_metrics
+from .rate_limit import RateLimiter
+from .response_cache import LLMResponseCache
+from .tool_cache import ToolResultCache
+from .result_journal import ResultJournal
+from .scoring import normalize_number_str, normalize_str, score_answer, split_string
 
 logger = get_logger(__name__)
 
+# Statuses of task results: `completed` tasks ran to an answer, `failed`
+# tasks could not be prepared or produced no answer, and `error` tasks raised
+TASK_STATUSES = ["completed", "failed", "error"]
+
 
 class GAIABenchmark(BaseBenchmark):
     r"""GAIA Benchmark adapted from `"GAIA: a benchmark for General AI
@@ -28,8 +46,16 @@ class GAIABenchmark(BaseBenchmark):
     Args:
         data_dir (str): The directory to save the data.
         save_to (str): The file to save the results.
-        processes (int, optional): The number of processes to use.
+        processes (int, optional): The number of tasks run concurrently.
             (default: :obj:`1`)
+        response_cache_dir (str, optional): A directory to cache model
+            responses in, so that reruns replay the unchanged prefix of each
+            conversation instead of repeating its requests.
+            (default: :obj:`None`, no caching)
+        tool_cache (ToolResultCache, optional): A cache shared by the
+            assistants of all tasks, serving repeated tool calls with the
+            same arguments. Only pass it with tools whose results do not
+            depend on earlier calls. (default: :obj:`None`, no caching)
     """
 
     def __init__(
@@ -37,16 +63,39 @@ class GAIABenchmark(BaseBenchmark):
         data_dir: str,
         save_to: str,
         processes: int = 1,
+        response_cache_dir: Optional[str] = None,
+        tool_cache: Optional[ToolResultCache] = None,
     ):
         r"""Initialize the GAIA benchmark.
 
         Args:
             data_dir (str): The directory to save the data.
             save_to (str): The file to save the results.
-            processes (int, optional): The number of processes to use for
-                parallel processing. (default: :obj:`1`)
+            processes (int, optional): The number of tasks run concurrently,
+                each society on its own worker thread. (default: :obj:`1`)
+            response_cache_dir (str, optional): A directory to cache model
+                responses in. (default: :obj:`None`)
+            tool_cache (ToolResultCache, optional): A cache of tool results
+                shared by all tasks. (default: :obj:`None`)
         """
         super().__init__("gaia", data_dir, save_to, processes)
+        self._results_lock = threading.Lock()
+        self._journal: Optional[ResultJournal] = None
+        # The position of each task's result in `self._results`
+        self._result_index: Dict[str, int] = {}
+        self.response_cache = (
+            LLMResponseCache(response_cache_dir) if response_cache_dir else None
+        )
+        self.tool_cache = tool_cache
+
+    @property
+    def journal_path(self) -> str:
+        r"""The append-only journal results are checkpointed to while
+        running, next to :obj:`save_to`."""
+        save_to = Path(self.save_to)
+        if save_to.suffix == ".jsonl":
+            return str(save_to.with_suffix(".journal.jsonl"))
+        return str(save_to.with_suffix(".jsonl"))
 
     def download(self):
         r"""Download the GAIA dataset."""
@@ -59,11 +108,40 @@ class GAIABenchmark(BaseBenchmark):
             local_dir_use_symlinks=True,
         )
 
-    def _check_task_completed(self, task_id: str) -> bool:
-        for data in self._results:
-            if data["task_id"] == task_id:
-                return True
-        return False
+    @staticmethod
+    def result_status(result: Dict[str, Any]) -> str:
+        r"""The status of a result, inferred for results saved before
+        statuses were recorded."""
+        if "status" in result:
+            return result["status"]
+        if result.get("history") is None or result.get("model_answer") is None:
+            return "failed"
+        return "completed"
+
+    def _rebuild_result_index(self) -> None:
+        self._result_index = {
+            result["task_id"]: position for position, result in enumerate(self._results)
+        }
+
+    def _check_task_completed(
+        self, task_id: str, rerun: Optional[List[str]] = None
+    ) -> bool:
+        r"""Whether a task has a result that should not be rerun.
+
+        Args:
+            task_id (str): The id of the task.
+            rerun (List[str], optional): Statuses of results to run again;
+                ``"incorrect"`` selects completed tasks with a zero score.
+                (default: :obj:`None`)
+        """
+        position = self._result_index.get(task_id)
+        if position is None:
+            return False
+        result = self._results[position]
+        rerun = rerun or []
+        if "incorrect" in rerun and self.result_status(result) == "completed":
+            return bool(result.get("score"))
+        return self.result_status(result) not in rerun
 
     def dump_tasks(self, save_path: str, datas):
         constructed_data = []
@@ -87,6 +165,10 @@ class GAIABenchmark(BaseBenchmark):
     def load(self, force_download=False):
         r"""Load the GAIA dataset.
 
+        Each split is loaded as a :class:`TaskIndex`: tasks are only parsed
+        when accessed, and the index is cached next to the metadata, so
+        selecting a few tasks does not read the whole dataset.
+
         Args:
             force_download (bool, optional): Whether to
                 force download the data.
@@ -104,18 +186,12 @@ class GAIABenchmark(BaseBenchmark):
             logger.info("Data not found. Downloading data.")
             self.download()
 
-        # Load metadata for both validation and test datasets
+        # Index metadata for both validation and test datasets
         for path, label in zip([valid_dir, test_dir], ["valid", "test"]):
-            self._data[label] = []
-            with open(path / "metadata.jsonl", "r") as f:
-                lines = f.readlines()
-                for line in lines:
-                    data = json.loads(line)
-                    if data["task_id"] == "0-0-0-0-0":
-                        continue
-                    if data["file_name"]:
-                        data["file_name"] = path / data["file_name"]
-                    self._data[label].append(data)
+            self._data[label] = TaskIndex.load(
+                path / "metadata.jsonl",
+                skip=lambda data: data["task_id"] == "0-0-0-0-0",
+            )
         return self
 
     @property
@@ -127,15 +203,166 @@ class GAIABenchmark(BaseBenchmark):
         self,
         user_role_name: str,
         assistant_role_name: str,
-        user_agent_kwargs: dict,
-        assistant_agent_kwargs: dict,
+        user_agent_kwargs: Union[dict, Callable[[], dict]],
+        assistant_agent_kwargs: Union[dict, Callable[[], dict]],
         on: Literal["train", "valid", "test"],
         level: Union[int, List[int], Literal["all"]],
         randomize: bool = False,
         subset: Optional[int] = None,
         idx: Optional[List[int]] = None,
         save_result: bool = False,
+        task_timeout: Optional[float] = None,
+        rounds_per_minute: Optional[float] = None,
+        rerun: Optional[List[str]] = None,
+        budget: Optional[SocietyBudget] = None,
     ) -> Dict[str, Any]:
+        r"""Run the benchmark, :obj:`processes` tasks at a time.
+
+        Args:
+            user_role_name (str): The role name of the user agent.
+            assistant_role_name (str): The role name of the assistant agent.
+            user_agent_kwargs (Union[dict, Callable[[], dict]]): The kwargs of
+                the user agent, or a factory called once per task. Use a
+                factory when running concurrently with toolkits that are not
+                thread-safe, such as a browser.
+            assistant_agent_kwargs (Union[dict, Callable[[], dict]]): The
+                kwargs of the assistant agent, or a factory called once per
+                task.
+            on (Literal["train", "valid", "test"]): The split to run on.
+            level (Union[int, List[int], Literal["all"]]): The levels to run.
+            randomize (bool, optional): Whether to shuffle the tasks.
+                (default: :obj:`False`)
+            subset (int, optional): Only run the first tasks.
+                (default: :obj:`None`)
+            idx (List[int], optional): Only run the tasks at these indices.
+                (default: :obj:`None`)
+            save_result (bool, optional): Whether to save results and resume
+                from them. Each result is appended to :obj:`journal_path` as
+                soon as its task finishes, and all results are written to
+                :obj:`save_to` at the end of the run, which empties the
+                journal. (default: :obj:`False`)
+            task_timeout (float, optional): No new round of a society is
+                started after this many seconds. (default: :obj:`None`)
+            rounds_per_minute (float, optional): The maximum number of society
+                rounds, each making at least two LLM requests, started per
+                minute across all workers. (default: :obj:`None`)
+            rerun (List[str], optional): When resuming, the statuses of saved
+                results to run again, out of :obj:`TASK_STATUSES` and
+                ``"incorrect"`` (completed with a zero score). Other saved
+                tasks are skipped. (default: :obj:`None`, ``["error"]``)
+            budget (SocietyBudget, optional): Token, tool call and stagnation
+                limits of each task's society; the wall time is bounded by
+                :obj:`task_timeout`. (default: :obj:`None`)
+
+        Returns:
+            Dict[str, Any]: The summary of the results.
+        """
+        datas = self._select_tasks(on, level, randomize, subset, idx, save_result, rerun)
+        rate_limiter = (
+            RateLimiter(rounds_per_minute) if rounds_per_minute is not None else None
+        )
+
+        def run_task(task: Dict[str, Any]) -> Dict[str, Any]:
+            return self._run_task(
+                task,
+                user_role_name=user_role_name,
+                assistant_role_name=assistant_role_name,
+                user_agent_kwargs=user_agent_kwargs,
+                assistant_agent_kwargs=assistant_agent_kwargs,
+                rate_limiter=rate_limiter,
+                task_timeout=task_timeout,
+                budget=budget,
+            )
+
+        # Process tasks
+        workers = max(1, min(self.processes, len(datas)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_task, task) for task in datas]
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Running"):
+                self._record_result(future.result())
+
+        return self._finish_run()
+
+    async def arun(
+        self,
+        user_role_name: str,
+        assistant_role_name: str,
+        user_agent_kwargs: Union[dict, Callable[[], dict]],
+        assistant_agent_kwargs: Union[dict, Callable[[], dict]],
+        on: Literal["train", "valid", "test"],
+        level: Union[int, List[int], Literal["all"]],
+        randomize: bool = False,
+        subset: Optional[int] = None,
+        idx: Optional[List[int]] = None,
+        save_result: bool = False,
+        task_timeout: Optional[float] = None,
+        rounds_per_minute: Optional[float] = None,
+        rerun: Optional[List[str]] = None,
+        budget: Optional[SocietyBudget] = None,
+        max_concurrency: Optional[int] = None,
+        tokens_per_minute: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        r"""Asynchronous version of :meth:`run`, running the tasks as
+        coroutines on the current event loop instead of in threads. Since
+        model requests are awaited rather than blocking a worker, many more
+        tasks can be in flight at once.
+
+        Takes the arguments of :meth:`run`, and:
+
+        Args:
+            max_concurrency (int, optional): The maximum number of tasks run
+                at once. (default: :obj:`None`, :obj:`processes`)
+            tokens_per_minute (float, optional): The maximum number of LLM
+                tokens, prompt and completion, used per minute across all
+                tasks. A round is not started while the budget is overdrawn.
+                (default: :obj:`None`)
+
+        Returns:
+            Dict[str, Any]: The summary of the results.
+        """
+        datas = self._select_tasks(on, level, randomize, subset, idx, save_result, rerun)
+        rate_limiter = (
+            RateLimiter(rounds_per_minute) if rounds_per_minute is not None else None
+        )
+        token_limiter = (
+            RateLimiter(tokens_per_minute) if tokens_per_minute is not None else None
+        )
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.processes))
+
+        async def run_task(task: Dict[str, Any]) -> None:
+            async with semaphore:
+                result = await self._arun_task(
+                    task,
+                    user_role_name=user_role_name,
+                    assistant_role_name=assistant_role_name,
+                    user_agent_kwargs=user_agent_kwargs,
+                    assistant_agent_kwargs=assistant_agent_kwargs,
+                    rate_limiter=rate_limiter,
+                    token_limiter=token_limiter,
+                    task_timeout=task_timeout,
+                    budget=budget,
+                )
+            # Journal appends are fsynced, so keep them off the event loop
+            await asyncio.to_thread(self._record_result, result)
+            progress.update()
+
+        with tqdm(total=len(datas), desc="Running") as progress:
+            await asyncio.gather(*(run_task(task) for task in datas))
+
+        return await asyncio.to_thread(self._finish_run)
+
+    def _select_tasks(
+        self,
+        on: str,
+        level: Union[int, List[int], str],
+        randomize: bool,
+        subset: Optional[int],
+        idx: Optional[List[int]],
+        save_result: bool,
+        rerun: Optional[List[str]],
+    ) -> List[Dict[str, Any]]:
+        r"""Validate the arguments of a run, load saved results when
+        resuming, and return the tasks still to be run."""
         # Validate inputs
         if on not in ["valid", "test"]:
             raise ValueError(
@@ -153,103 +380,265 @@ class GAIABenchmark(BaseBenchmark):
             raise ValueError(
                 f"Invalid value for `level`: {level}, expected 1, 2, 3 " "or 'all'."
             )
+        rerun = ["error"] if rerun is None else rerun
+        invalid = [status for status in rerun if status not in TASK_STATUSES + ["incorrect"]]
+        if invalid:
+            raise ValueError(
+                f"Invalid value for `rerun`: {invalid}, expected a subset of "
+                f"{TASK_STATUSES + ['incorrect']}."
+            )
         logger.info(f"Running benchmark on {on} set at levels {levels}.")
-        datas = [data for data in self._data[on] if data["Level"] in levels]
+        # Select tasks by position, from the index entries if the split is
+        # lazily loaded, and only materialize the selected ones
+        tasks = self._data[on]
+        headers = tasks.entries if isinstance(tasks, TaskIndex) else tasks
+        positions = [
+            position
+            for position, header in enumerate(headers)
+            if header["Level"] in levels
+        ]
         # Shuffle and subset data if necessary
         if randomize:
-            random.shuffle(datas)
+            random.shuffle(positions)
         if subset:
-            datas = datas[:subset]
+            positions = positions[:subset]
 
         if idx is not None:
             # pick only the tasks with the specified idx
             if len(idx) != 0:
-                datas = [datas[i] for i in idx]
+                positions = [positions[i] for i in idx]
 
-        logger.info(f"Number of tasks: {len(datas)}")
+        logger.info(f"Number of tasks: {len(positions)}")
 
         self._results = []
 
+        self._journal = None
         if save_result:
-            try:
-                with open(self.save_to, "r", encoding="utf-8") as f:
-                    self._results = json.load(f)
-                f.close()
-            except Exception as e:
-                logger.warning(e)
-                # raise FileNotFoundError(f"{self.save_to} does not exist.")
-        datas = [
-            data for data in datas if not self._check_task_completed(data["task_id"])
+            self._journal = ResultJournal(self.journal_path)
+            self._results = self._load_saved_results()
+        self._rebuild_result_index()
+        positions = [
+            position
+            for position in positions
+            if not self._check_task_completed(headers[position]["task_id"], rerun)
         ]
-        logger.info(f"Number of tasks to be processed: {len(datas)}")
-        # Process tasks
-        for task in tqdm(datas, desc="Running"):
-            if_prepared_task, info = self._prepare_task(task)
-            if not if_prepared_task:
-                _result_info = {
-                    "task_id": task["task_id"],
-                    "question": task["Question"],
-                    "level": task["Level"],
-                    "model_answer": None,
-                    "ground_truth": None,
-                    "score": 0,
-                    "history": None,
-                }
-                self._results.append(_result_info)
-                continue
-            try:
-                logger.info(f"Task Question: {task['Question']}")
-                logger.info(f"Required tools: {task['Annotator Metadata']['Tools']}")
-
-                task_kwargs = {
-                    "task_prompt": task["Question"],
-                    "with_task_specify": False,
-                }
-
-                society = NordstarGAIARolePlaying(
-                    **task_kwargs,
-                    user_role_name=user_role_name,
-                    user_agent_kwargs=user_agent_kwargs,
-                    assistant_role_name=assistant_role_name,
-                    assistant_agent_kwargs=assistant_agent_kwargs,
-                )
+        logger.info(f"Number of tasks to be processed: {len(positions)}")
+        if isinstance(tasks, TaskIndex):
+            return tasks.take(positions)
+        return [tasks[position] for position in positions]
 
-                raw_answer, chat_history, token_info = run_society(society)
-                try:
-                    answer = extract_pattern(raw_answer, "final_answer")
-                except Exception as e:
-                    logger.error(
-                        f"Error in extracting final answer from text {raw_answer}: {e}"
-                    )
-                    answer = None
-
-                logger.info(
-                    f"Model answer: {answer}, Ground truth: {task['Final answer']}"
-                )
-
-                _result_info = {
-                    "task_id": task["task_id"],
-                    "question": task["Question"]
-                    + "Please decompose the task into several sub-tasks and find the answer step-by-step.",
-                    "level": task["Level"],
-                    "model_answer": answer,
-                    "ground_truth": task["Final answer"],
-                    "score": self.question_scorer(answer, task["Final answer"]),
-                    "token_info": token_info,
-                    "history": chat_history,
-                }
-                self._results.append(_result_info)
-
-            except Exception as e:
-                logger.error(f"Error in processing task: {e}")
-
-            if save_result:
-                with open(self.save_to, "w") as f:
-                    json.dump(self._results, f, indent=4, ensure_ascii=False)
-                f.close()
+    def _finish_run(self) -> Dict[str, Any]:
+        if self._journal is not None:
+            # Compact the journal into the final results, and empty it
+            self._journal.compact(self.save_to, self._results)
 
         return self._generate_summary()
 
+    def _load_saved_results(self) -> List[Dict[str, Any]]:
+        r"""Resume from the results written to :obj:`save_to` at the end of
+        the last run, updated by those journaled since."""
+        latest: Dict[Any, Dict[str, Any]] = {}
+        try:
+            with open(self.save_to, "r", encoding="utf-8") as f:
+                for result in json.load(f):
+                    latest[result["task_id"]] = result
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(e)
+        for result in self._journal.load():
+            latest[result["task_id"]] = result
+        return list(latest.values())
+
+    def _record_result(self, result: Dict[str, Any]) -> None:
+        r"""Add the result of a task, replacing a previous result of a rerun
+        task, and append it to the journal if results are saved."""
+        with self._results_lock:
+            position = self._result_index.get(result["task_id"])
+            if position is None:
+                self._result_index[result["task_id"]] = len(self._results)
+                self._results.append(result)
+            else:
+                self._results[position] = result
+        if self._journal is not None:
+            self._journal.append(result)
+
+    def _run_task(
+        self,
+        task: Dict[str, Any],
+        user_role_name: str,
+        assistant_role_name: str,
+        user_agent_kwargs: Union[dict, Callable[[], dict]],
+        assistant_agent_kwargs: Union[dict, Callable[[], dict]],
+        rate_limiter: Optional[RateLimiter] = None,
+        task_timeout: Optional[float] = None,
+        budget: Optional[SocietyBudget] = None,
+    ) -> Dict[str, Any]:
+        r"""Run a single task and return its result, with a status out of
+        :obj:`TASK_STATUSES`."""
+        if_prepared_task, info = self._prepare_task(task)
+        if not if_prepared_task:
+            return self._failed_result(task, info)
+        started = time.monotonic()
+        try:
+            society = self._build_society(
+                task,
+                user_role_name,
+                assistant_role_name,
+                user_agent_kwargs,
+                assistant_agent_kwargs,
+            )
+            raw_answer, chat_history, token_info = run_society(
+                society, rate_limiter=rate_limiter, timeout=task_timeout, budget=budget
+            )
+            return self._build_result(
+                task, raw_answer, chat_history, token_info, time.monotonic() - started
+            )
+        except Exception as e:
+            logger.error(f"Error in processing task: {e}")
+            return self._error_result(task, e)
+
+    async def _arun_task(
+        self,
+        task: Dict[str, Any],
+        user_role_name: str,
+        assistant_role_name: str,
+        user_agent_kwargs: Union[dict, Callable[[], dict]],
+        assistant_agent_kwargs: Union[dict, Callable[[], dict]],
+        rate_limiter: Optional[RateLimiter] = None,
+        token_limiter: Optional[RateLimiter] = None,
+        task_timeout: Optional[float] = None,
+        budget: Optional[SocietyBudget] = None,
+    ) -> Dict[str, Any]:
+        r"""Asynchronous version of :meth:`_run_task`."""
+        # Preparing checks that the attached file exists on disk, which may
+        # be slow on network storage, so keep it off the event loop
+        if_prepared_task, info = await asyncio.to_thread(self._prepare_task, task)
+        if not if_prepared_task:
+            return self._failed_result(task, info)
+        started = time.monotonic()
+        try:
+            # Building the agents sets up models and toolkits synchronously
+            society = await asyncio.to_thread(
+                self._build_society,
+                task,
+                user_role_name,
+                assistant_role_name,
+                user_agent_kwargs,
+                assistant_agent_kwargs,
+            )
+            raw_answer, chat_history, token_info = await arun_society(
+                society,
+                rate_limiter=rate_limiter,
+                timeout=task_timeout,
+                token_limiter=token_limiter,
+                budget=budget,
+            )
+            return self._build_result(
+                task, raw_answer, chat_history, token_info, time.monotonic() - started
+            )
+        except Exception as e:
+            logger.error(f"Error in processing task: {e}")
+            return self._error_result(task, e)
+
+    def _build_society(
+        self,
+        task: Dict[str, Any],
+        user_role_name: str,
+        assistant_role_name: str,
+        user_agent_kwargs: Union[dict, Callable[[], dict]],
+        assistant_agent_kwargs: Union[dict, Callable[[], dict]],
+    ) -> NordstarGAIARolePlaying:
+        logger.info(f"Task Question: {task['Question']}")
+        logger.info(f"Required tools: {task['Annotator Metadata']['Tools']}")
+
+        task_kwargs = {
+            "task_prompt": task["Question"],
+            "with_task_specify": False,
+        }
+
+        return NordstarGAIARolePlaying(
+            **task_kwargs,
+            user_role_name=user_role_name,
+            user_agent_kwargs=(
+                user_agent_kwargs() if callable(user_agent_kwargs) else user_agent_kwargs
+            ),
+            assistant_role_name=assistant_role_name,
+            assistant_agent_kwargs=(
+                assistant_agent_kwargs()
+                if callable(assistant_agent_kwargs)
+                else assistant_agent_kwargs
+            ),
+            response_cache=self.response_cache,
+            tool_cache=self.tool_cache,
+        )
+
+    def _build_result(
+        self,
+        task: Dict[str, Any],
+        raw_answer: str,
+        chat_history: List[Dict[str, Any]],
+        token_info: Dict[str, Any],
+        wall_time: float,
+    ) -> Dict[str, Any]:
+        try:
+            answer = extract_pattern(raw_answer, "final_answer")
+        except Exception as e:
+            logger.error(
+                f"Error in extracting final answer from text {raw_answer}: {e}"
+            )
+            answer = None
+
+        logger.info(
+            f"Model answer: {answer}, Ground truth: {task['Final answer']}"
+        )
+
+        return {
+            "task_id": task["task_id"],
+            "question": task["Question"]
+            + "Please decompose the task into several sub-tasks and find the answer step-by-step.",
+            "level": task["Level"],
+            "status": "completed" if answer is not None else "failed",
+            "model_answer": answer,
+            "ground_truth": task["Final answer"],
+            "score": (
+                self.question_scorer(answer, task["Final answer"])
+                if answer is not None
+                else 0
+            ),
+            "token_info": token_info,
+            "metrics": {**summarize_task_metrics(chat_history), "wall_time": wall_time},
+            "history": chat_history,
+        }
+
+    @staticmethod
+    def _failed_result(task: Dict[str, Any], info: str) -> Dict[str, Any]:
+        return {
+            "task_id": task["task_id"],
+            "question": task["Question"],
+            "level": task["Level"],
+            "status": "failed",
+            "error": info,
+            "model_answer": None,
+            "ground_truth": None,
+            "score": 0,
+            "history": None,
+        }
+
+    @staticmethod
+    def _error_result(task: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        return {
+            "task_id": task["task_id"],
+            "question": task["Question"],
+            "level": task["Level"],
+            "status": "error",
+            "error": f"{type(error).__name__}: {error}",
+            "model_answer": None,
+            "ground_truth": task["Final answer"],
+            "score": 0,
+            "history": None,
+        }
+
     def _prepare_task(self, task: Dict[str, Any]) -> Tuple[bool, str]:
         r"""Prepare the task by validating and enriching its data."""
         if task["file_name"]:
@@ -293,17 +682,31 @@ class GAIABenchmark(BaseBenchmark):
         return Task(id=str(task["task_id"]), content=task["Question"])
 
     def _generate_summary(self) -> Dict[str, Any]:
-        r"""Generate and return a summary of the benchmark results."""
+        r"""Generate and return a summary of the benchmark results, with
+        percentile summaries of the task metrics by level and of tool call
+        durations by tool."""
         correct = sum(result["score"] for result in self._results)
+        statuses = {status: 0 for status in TASK_STATUSES}
+        stop_reasons: Dict[str, int] = {}
+        for result in self._results:
+            # Results saved by other versions may have other statuses
+            status = self.result_status(result)
+            statuses[status] = statuses.get(status, 0) + 1
+            stop_reason = (result.get("token_info") or {}).get("stop_reason")
+            if stop_reason is not None:
+                stop_reasons[stop_reason] = stop_reasons.get(stop_reason, 0) + 1
         return {
             "total": len(self._results),
             "correct": correct,
+            "statuses": statuses,
+            "stop_reasons": stop_reasons,
             "results": self._results,
             "accuracy": correct / len(self._results) if len(self._results) > 0 else 0,
+            "metrics": summarize_results_metrics(self._results),
         }
 
     def question_scorer(self, model_answer: str, ground_truth: str) -> bool:
-        r"""Scorer for the GAIA benchmark.
+        r"""Scorer for the GAIA benchmark, see :func:`score_answer`.
         https://huggingface.co/spaces/gaia-benchmark/leaderboard/blob/main/
         scorer.py
 
@@ -314,55 +717,10 @@ class GAIABenchmark(BaseBenchmark):
         Returns:
             bool: The score of the model
         """
-
-        def is_float(element: Any) -> bool:
-            try:
-                float(element)
-                return True
-            except ValueError:
-                return False
-
-        if is_float(ground_truth):
-            logger.info(f"Evaluating {model_answer} as a number.")
-            normalized_answer = self.normalize_number_str(model_answer)
-            return normalized_answer == float(ground_truth)
-
-        elif any(char in ground_truth for char in [",", ";"]):
-            logger.info(f"Evaluating {model_answer} as a comma separated list.")
-            gt_elems = self.split_string(ground_truth)
-            ma_elems = self.split_string(model_answer)
-
-            if len(gt_elems) != len(ma_elems):
-                logger.warning(
-                    "Answer lists have different lengths, returning False.",
-                    UserWarning,
-                )
-                return False
-
-            comparisons = []
-            for ma_elem, gt_elem in zip(ma_elems, gt_elems):
-                if is_float(gt_elem):
-                    normalized_ma_elem = self.normalize_number_str(ma_elem)
-                    comparisons.append(normalized_ma_elem == float(gt_elem))
-                else:
-                    ma_elem = self.normalize_str(ma_elem, remove_punct=False)
-                    gt_elem = self.normalize_str(gt_elem, remove_punct=False)
-                    comparisons.append(ma_elem == gt_elem)
-            return all(comparisons)
-        else:
-            logger.info(f"Evaluating {model_answer} as a string.")
-            ma_elem = self.normalize_str(model_answer)
-            gt_elem = self.normalize_str(ground_truth)
-            return ma_elem == gt_elem
+        return score_answer(model_answer, ground_truth)
 
     def normalize_number_str(self, number_str: str) -> float:
-        for char in ["$", "%", ","]:
-            number_str = number_str.replace(char, "")
-        try:
-            return float(number_str)
-        except ValueError:
-            logger.error(f"String {number_str} cannot be normalized to number str.")
-            return float("inf")
+        return normalize_number_str(number_str)
 
     def split_string(self, s: str, char_list: Optional[List[str]] = None) -> list[str]:
         r"""Split a string based on a list of characters.
@@ -373,10 +731,7 @@ class GAIABenchmark(BaseBenchmark):
                 he list of characters to split on.
                 (default: :obj:`None`)
         """
-        if char_list is None:
-            char_list = [",", ";"]
-        pattern = f"[{''.join(char_list)}]"
-        return re.split(pattern, s)
+        return split_string(s, char_list)
 
     def normalize_str(self, input_str, remove_punct=True) -> str:
         r"""Normalize a string.
@@ -388,9 +743,4 @@ class GAIABenchmark(BaseBenchmark):
         Returns:
             str: The normalized string.
         """
-        no_spaces = re.sub(r"\s", "", input_str)
-        if remove_punct:
-            translator = str.maketrans("", "", string.punctuation)
-            return no_spaces.lower().translate(translator)
-        else:
-            return no_spaces.lower()
+        return normalize_str(input_str, remove_punct)
@@ -0,0 +1,284 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from camel.agents import ChatAgent
+from camel.logger import get_logger
+from camel.messages.base import BaseMessage
+from camel.models import BaseModelBackend
+
+logger = get_logger(__name__)
+
+CAPTION_PROMPT = "Please make a detailed caption about the image."
+
+_BATCH_PROMPT = (
+    "You are given {count} images, in order. Make a detailed caption of each "
+    "image. Answer with a JSON object only, mapping the 1-based number of each "
+    'image to its caption, e.g. {{"1": "...", "2": "..."}}.'
+)
+
+_NUMBERED_LINE = re.compile(r"^\s*(?:image\s*)?(\d+)\s*[:.)-]\s*(.+)$", re.IGNORECASE)
+
+
+def load_image(path: str, max_side: int = 1024):
+    r"""Open an image as RGB, downsized so that its longest side is at most
+    :obj:`max_side` pixels."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image = image.convert("RGB")
+        image.thumbnail((max_side, max_side))
+        return image
+
+
+def difference_hash(image, hash_size: int = 8) -> str:
+    r"""Compute the perceptual difference hash (dHash) of an image.
+
+    Args:
+        image (PIL.Image.Image): The image.
+        hash_size (int, optional): The hash has ``hash_size ** 2`` bits.
+            (default: :obj:`8`)
+
+    Returns:
+        str: The hash as a hexadecimal string.
+    """
+    from PIL import Image
+
+    pixels = list(
+        image.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS).getdata()
+    )
+    bits = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            bits = (bits << 1) | int(left > right)
+    return f"{bits:0{hash_size * hash_size // 4}x}"
+
+
+def hamming_distance(hash_a: str, hash_b: str) -> int:
+    return bin(int(hash_a, 16) ^ int(hash_b, 16)).count("1")
+
+
+def parse_batch_captions(text: str, count: int) -> Dict[int, str]:
+    r"""Parse the captions of a batch request, keyed by 0-based image
+    index. Accepts the requested JSON object, possibly inside a code fence,
+    and falls back to ``Image N: ...`` lines."""
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if match:
+        try:
+            raw = json.loads(match.group(0))
+            return {
+                int(key) - 1: str(value)
+                for key, value in raw.items()
+                if str(key).isdigit() and 1 <= int(key) <= count
+            }
+        except ValueError:
+            pass
+
+    captions: Dict[int, str] = {}
+    for line in text.splitlines():
+        line_match = _NUMBERED_LINE.match(line)
+        if line_match and 1 <= int(line_match.group(1)) <= count:
+            captions[int(line_match.group(1)) - 1] = line_match.group(2).strip()
+    return captions
+
+
+class ImageCaptioner:
+    r"""Captions images in batches, with few model calls.
+
+    Images are keyed by the SHA-256 of their bytes, so identical images
+    (e.g. repeated screenshots) are captioned once and captions are cached
+    on disk by that key, together with the model and :obj:`max_side` that
+    produced them. Images are downsized locally, and up to
+    :obj:`batch_size` distinct images are sent in a single model request.
+
+    Args:
+        model (BaseModelBackend, optional): The vision model. (default:
+            :obj:`None`, the default model of :obj:`ChatAgent`)
+        cache_dir (str, optional): The directory to cache captions in.
+            (default: :obj:`None`, no caching)
+        batch_size (int, optional): The number of images per model request.
+            (default: :obj:`6`)
+        max_side (int, optional): The longest side of images sent to the
+            model, in pixels. (default: :obj:`1024`)
+        dedup_distance (int, optional): Also caption images once if their
+            perceptual hashes are at most this Hamming distance apart. Such
+            a duplicate gets the caption of its representative for this call
+            only; it is never cached under its own key. Keep it close to
+            ``0``, distinct screenshots can differ by a few bits.
+            (default: :obj:`None`, only identical images)
+    """
+
+    def __init__(
+        self,
+        model: Optional[BaseModelBackend] = None,
+        cache_dir: Optional[str] = None,
+        batch_size: int = 6,
+        max_side: int = 1024,
+        dedup_distance: Optional[int] = None,
+    ):
+        self.model = model
+        self.cache_dir = cache_dir
+        self.batch_size = batch_size
+        self.max_side = max_side
+        self.dedup_distance = dedup_distance
+        model_name = (
+            f"{type(model).__name__}:{getattr(model, 'model_type', '')}"
+            if model is not None
+            else "default"
+        )
+        self._cache_variant = f"{model_name}|{max_side}"
+        self._lock = threading.Lock()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _cache_path(self, key: str) -> str:
+        digest = hashlib.sha256(f"{key}|{self._cache_variant}".encode("utf-8"))
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}.json")
+
+    def _get_cached(self, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)["caption"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _set_cached(self, key: str, caption: str) -> None:
+        if not self.cache_dir:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"caption": caption}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._cache_path(key))
+
+    def _ask(self, prompt: str, images: List) -> str:
+        agent = ChatAgent(
+            BaseMessage.make_assistant_message(
+                role_name="Image Analyst",
+                content="You are an image analysis expert.",
+            ),
+            model=self.model,
+        )
+        message = BaseMessage.make_user_message(
+            role_name="User", content=prompt, image_list=images
+        )
+        return agent.step(message).msgs[0].content
+
+    def _caption_batch(self, images: List) -> List[str]:
+        if len(images) == 1:
+            return [self._ask(CAPTION_PROMPT, images)]
+
+        response = self._ask(_BATCH_PROMPT.format(count=len(images)), images)
+        captions = parse_batch_captions(response, len(images))
+        missing = [index for index in range(len(images)) if index not in captions]
+        if missing:
+            logger.debug(f"Captioning {len(missing)} images of a batch one by one.")
+        for index in missing:
+            captions[index] = self._ask(CAPTION_PROMPT, [images[index]])
+        return [captions[index] for index in range(len(images))]
+
+    def _find_duplicate(
+        self, image_hash: str, perceptual_hashes: Dict[str, str]
+    ) -> Optional[str]:
+        r"""Return the key of an image whose perceptual hash is within
+        :obj:`dedup_distance` of :obj:`image_hash`, if any."""
+        for key, other in perceptual_hashes.items():
+            if hamming_distance(image_hash, other) <= self.dedup_distance:
+                return key
+        return None
+
+    def caption_images(self, image_paths: List[str]) -> Dict[str, Tuple[bool, str]]:
+        r"""Caption local images.
+
+        Args:
+            image_paths (List[str]): The paths of the images.
+
+        Returns:
+            Dict[str, Tuple[bool, str]]: For each path, whether it was
+                captioned successfully and its caption (or the error).
+        """
+        results: Dict[str, Tuple[bool, str]] = {}
+        # The key of the image captioned for each path, and one image per
+        # key still to be captioned
+        path_keys: Dict[str, str] = {}
+        pending: Dict[str, object] = {}
+        perceptual_hashes: Dict[str, str] = {}
+        seen: Set[str] = set()
+
+        for path in dict.fromkeys(image_paths):
+            try:
+                with open(path, "rb") as f:
+                    key = hashlib.sha256(f.read()).hexdigest()
+            except OSError as e:
+                results[path] = (False, f"Error occurred while loading image: {e}")
+                continue
+            if key in seen:
+                path_keys[path] = key
+                continue
+            seen.add(key)
+
+            cached = self._get_cached(key)
+            if cached is not None:
+                path_keys[path] = key
+                results[path] = (True, cached)
+                continue
+
+            try:
+                image = load_image(path, self.max_side)
+            except Exception as e:
+                results[path] = (False, f"Error occurred while loading image: {e}")
+                continue
+
+            if self.dedup_distance is not None:
+                image_hash = difference_hash(image)
+                duplicate = self._find_duplicate(image_hash, perceptual_hashes)
+                if duplicate is not None:
+                    path_keys[path] = duplicate
+                    continue
+                perceptual_hashes[key] = image_hash
+            path_keys[path] = key
+            pending[key] = image
+
+        captions: Dict[str, Tuple[bool, str]] = {}
+        keys = list(pending)
+        for start in range(0, len(keys), self.batch_size):
+            batch = keys[start : start + self.batch_size]
+            try:
+                batch_captions = self._caption_batch([pending[key] for key in batch])
+            except Exception as e:
+                logger.warning(f"Captioning a batch of {len(batch)} images failed: {e}")
+                for key in batch:
+                    captions[key] = (False, f"Error occurred while captioning: {e}")
+                continue
+            for key, caption in zip(batch, batch_captions):
+                captions[key] = (True, caption)
+                with self._lock:
+                    self._set_cached(key, caption)
+
+        for path, key in path_keys.items():
+            if path in results:
+                continue
+            if key in captions:
+                results[path] = captions[key]
+            else:
+                cached = self._get_cached(key)
+                results[path] = (True, cached) if cached is not None else (
+                    False,
+                    "Error occurred while captioning: no caption.",
+                )
+
+        logger.info(
+            f"Captioned {len(path_keys)} images with {len(pending)} distinct "
+            f"uncached images in {-(-len(pending) // self.batch_size)} batches."
+        )
+        return {path: results[path] for path in dict.fromkeys(image_paths)}
+
+    def caption_image(self, image_path: str) -> Tuple[bool, str]:
+        return self.caption_images([image_path])[image_path]
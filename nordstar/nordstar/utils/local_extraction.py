@@ -0,0 +1,204 @@
+import csv
+import io
+import os
+import re
+import zipfile
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import List, Optional
+from xml.etree import ElementTree
+
+from camel.logger import get_logger
+
+from .pdf_extraction import extract_pdf_document
+
+logger = get_logger(__name__)
+
+LOCAL_EXTENSIONS = [".pdf", ".pptx", ".html", ".htm", ".csv", ".tsv", ".txt", ".md"]
+# Types that can be parsed from bytes in memory, see `extract_text_from_bytes`
+IN_MEMORY_EXTENSIONS = [".html", ".htm", ".csv", ".tsv", ".txt", ".md"]
+
+# Below this many characters per page a PDF most likely has no text layer
+MIN_CHARS_PER_PDF_PAGE = 200
+
+_DRAWINGML_TEXT = "{http://schemas.openxmlformats.org/drawingml/2006/main}t"
+_SLIDE_PATTERN = re.compile(r"ppt/slides/slide(\d+)\.xml$")
+
+
+@dataclass
+class LocalExtraction:
+    r"""The result of a local extraction.
+
+    Args:
+        text (str): The extracted text.
+        quality (float): A score in ``[0, 1]`` estimating how faithfully the
+            text represents the document. Low scores indicate scanned or
+            layout-heavy files that a remote parser handles better.
+        reason (str): A short explanation of the score.
+    """
+
+    text: str
+    quality: float
+    reason: str = ""
+
+
+def score_pdf_text(text: str, num_pages: int) -> LocalExtraction:
+    r"""Score the text layer of a PDF.
+
+    Scanned PDFs have (almost) no text layer, and layout-heavy PDFs (tables,
+    multi-column pages, forms) come out as many tiny line fragments. Both are
+    better served by a layout-aware remote parser.
+    """
+    if num_pages == 0 or not text.strip():
+        return LocalExtraction(text, 0.0, "no text layer")
+
+    chars_per_page = len(text) / num_pages
+    lines = [line for line in text.splitlines() if line.strip()]
+    fragment_ratio = (
+        sum(1 for line in lines if len(line.strip()) <= 3) / len(lines) if lines else 1.0
+    )
+    printable_ratio = sum(1 for char in text if char.isprintable() or char.isspace()) / len(
+        text
+    )
+
+    quality = min(1.0, chars_per_page / MIN_CHARS_PER_PDF_PAGE)
+    quality *= 1.0 - fragment_ratio
+    quality *= printable_ratio
+    reason = (
+        f"{chars_per_page:.0f} chars/page, {fragment_ratio:.0%} fragmented lines, "
+        f"{printable_ratio:.0%} printable"
+    )
+    return LocalExtraction(text, quality, reason)
+
+
+def _extract_pdf(path: str, processes: Optional[int] = None) -> LocalExtraction:
+    text, num_pages = extract_pdf_document(path, processes=processes)
+    return score_pdf_text(text, num_pages)
+
+
+def _extract_pptx(path: str) -> LocalExtraction:
+    slides: List[str] = []
+    with zipfile.ZipFile(path) as archive:
+        names = sorted(
+            (int(match.group(1)), name)
+            for name in archive.namelist()
+            if (match := _SLIDE_PATTERN.search(name))
+        )
+        for number, name in names:
+            root = ElementTree.fromstring(archive.read(name))
+            texts = [node.text for node in root.iter(_DRAWINGML_TEXT) if node.text]
+            slides.append(f"## Slide {number}\n" + "\n".join(texts))
+    text = "\n\n".join(slides)
+    # Slides are mostly pictures when there is little text per slide
+    quality = 1.0 if slides and len(text) / len(slides) >= 40 else 0.5
+    return LocalExtraction(text, quality, f"{len(slides)} slides")
+
+
+class _HTMLTextParser(HTMLParser):
+    _SKIPPED_TAGS = {"script", "style", "noscript", "svg", "head"}
+    _BLOCK_TAGS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in self._BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIPPED_TAGS and self._skip_depth > 0:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip_depth == 0 and data.strip():
+            self.parts.append(data.strip() + " ")
+
+
+def _html_to_text(html: str) -> LocalExtraction:
+    parser = _HTMLTextParser()
+    parser.feed(html)
+    text = re.sub(r"\n\s*\n+", "\n\n", "".join(parser.parts)).strip()
+    return LocalExtraction(text, 1.0 if text else 0.0, "html text")
+
+
+def _csv_to_table(f, delimiter: str) -> LocalExtraction:
+    rows = list(csv.reader(f, delimiter=delimiter))
+    output = io.StringIO()
+    for row in rows:
+        output.write("| " + " | ".join(cell.strip() for cell in row) + " |\n")
+    return LocalExtraction(output.getvalue(), 1.0, f"{len(rows)} rows")
+
+
+def _extract_html(path: str) -> LocalExtraction:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return _html_to_text(f.read())
+
+
+def _extract_csv(path: str) -> LocalExtraction:
+    delimiter = "\t" if path.endswith(".tsv") else ","
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        return _csv_to_table(f, delimiter)
+
+
+def _extract_plain_text(path: str) -> LocalExtraction:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    return LocalExtraction(text, 1.0, "plain text")
+
+
+def extract_locally(
+    path: str, pdf_processes: Optional[int] = None
+) -> Optional[LocalExtraction]:
+    r"""Extract a local document without any remote service.
+
+    Args:
+        path (str): The path of the document.
+        pdf_processes (int, optional): The number of processes used for large
+            PDFs. (default: :obj:`None`)
+
+    Returns:
+        Optional[LocalExtraction]: The extraction with its quality score, or
+            :obj:`None` if the file type is not supported or parsing failed.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension == ".pdf":
+            return _extract_pdf(path, processes=pdf_processes)
+        if extension == ".pptx":
+            return _extract_pptx(path)
+        if extension in [".html", ".htm"]:
+            return _extract_html(path)
+        if extension in [".csv", ".tsv"]:
+            return _extract_csv(path)
+        if extension in [".txt", ".md"]:
+            return _extract_plain_text(path)
+    except Exception as e:
+        logger.warning(f"Local extraction of {path} failed: {e}")
+    return None
+
+
+def extract_text_from_bytes(name: str, data: bytes) -> Optional[LocalExtraction]:
+    r"""Extract a text-like document held in memory, e.g. a zip member.
+
+    Args:
+        name (str): The file name, used to pick the parser.
+        data (bytes): The raw content of the file.
+
+    Returns:
+        Optional[LocalExtraction]: The extraction, or :obj:`None` if the file
+            type needs a file on disk.
+    """
+    extension = os.path.splitext(name)[1].lower()
+    text = data.decode("utf-8", errors="replace")
+    if extension in [".html", ".htm"]:
+        return _html_to_text(text)
+    if extension in [".csv", ".tsv"]:
+        delimiter = "\t" if extension == ".tsv" else ","
+        return _csv_to_table(io.StringIO(text, newline=""), delimiter)
+    if extension in [".txt", ".md"]:
+        return LocalExtraction(text, 1.0, "plain text")
+    return None
@@ -0,0 +1,195 @@
+import math
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+
+def percentile_summary(
+    values: Iterable[float], percentiles: Sequence[int] = (50, 90, 99)
+) -> Dict[str, float]:
+    r"""Summarize a sample by its count, total, mean, maximum and
+    nearest-rank percentiles.
+
+    Args:
+        values (Iterable[float]): The sample.
+        percentiles (Sequence[int], optional): The percentiles to report.
+            (default: :obj:`(50, 90, 99)`)
+
+    Returns:
+        Dict[str, float]: The summary, with keys ``count``, ``total``,
+            ``mean``, ``max`` and ``p<n>``. Only ``count`` if the sample is
+            empty.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+    summary = {
+        "count": len(ordered),
+        "total": sum(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "max": ordered[-1],
+    }
+    for p in percentiles:
+        rank = max(1, math.ceil(p / 100 * len(ordered)))
+        summary[f"p{p}"] = ordered[rank - 1]
+    return summary
+
+
+class AgentMetrics:
+    r"""Records the timing of the model requests and tool calls of an
+    agent, until they are collected with :meth:`drain`.
+
+    Model requests are recorded with their duration, token usage and whether
+    they failed; a failed request is retried by the agent, so failures count
+    as retries. Tool calls are recorded by ``tool_call_id``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._llm_calls: List[Dict[str, Any]] = []
+        self._tool_calls: Dict[str, Dict[str, Any]] = {}
+
+    def record_llm_call(
+        self, duration: float, usage: Optional[Dict[str, Any]] = None, failed: bool = False
+    ) -> None:
+        usage = usage or {}
+        with self._lock:
+            self._llm_calls.append(
+                {
+                    "duration": duration,
+                    "prompt_tokens": usage.get("prompt_tokens", 0) or 0,
+                    "completion_tokens": usage.get("completion_tokens", 0) or 0,
+                    "failed": failed,
+                }
+            )
+
+    def record_tool_call(
+        self, tool_call_id: str, tool_name: str, duration: float, failed: bool = False
+    ) -> None:
+        with self._lock:
+            self._tool_calls[tool_call_id] = {
+                "tool": tool_name,
+                "duration": duration,
+                "failed": failed,
+            }
+
+    def drain(self) -> Dict[str, Any]:
+        r"""Return and reset the records, e.g. those of one round."""
+        with self._lock:
+            records = {"llm_calls": self._llm_calls, "tool_calls": self._tool_calls}
+            self._llm_calls = []
+            self._tool_calls = {}
+        return records
+
+
+def summarize_task_metrics(chat_history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    r"""Total the per-round metrics recorded by :func:`run_society` for one
+    task.
+
+    Args:
+        chat_history (List[Dict[str, Any]]): The chat history of the task.
+
+    Returns:
+        Dict[str, Any]: The rounds, model requests, retries, tool calls,
+            tokens and the time spent in rounds, model requests and tools,
+            in seconds.
+    """
+    totals: Dict[str, Any] = {
+        "rounds": 0,
+        "round_time": 0.0,
+        "llm_calls": 0,
+        "llm_time": 0.0,
+        "retries": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "tool_calls": 0,
+        "tool_time": 0.0,
+        "tool_time_by_tool": defaultdict(float),
+    }
+    for round_data in chat_history:
+        metrics = round_data.get("metrics")
+        if not metrics:
+            continue
+        totals["rounds"] += 1
+        totals["round_time"] += metrics["wall_time"]
+        for llm_call in metrics["llm_calls"]:
+            totals["llm_calls"] += 1
+            totals["llm_time"] += llm_call["duration"]
+            totals["retries"] += int(llm_call["failed"])
+            totals["prompt_tokens"] += llm_call["prompt_tokens"]
+            totals["completion_tokens"] += llm_call["completion_tokens"]
+        for tool_call in round_data.get("tool_calls", []):
+            if "duration" not in tool_call:
+                continue
+            totals["tool_calls"] += 1
+            totals["tool_time"] += tool_call["duration"]
+            totals["tool_time_by_tool"][tool_call["tool_name"]] += tool_call["duration"]
+    totals["tool_time_by_tool"] = dict(totals["tool_time_by_tool"])
+    return totals
+
+
+_TASK_FIELDS = [
+    "wall_time",
+    "round_time",
+    "llm_time",
+    "tool_time",
+    "rounds",
+    "llm_calls",
+    "retries",
+    "tool_calls",
+    "prompt_tokens",
+    "completion_tokens",
+]
+
+
+def summarize_results_metrics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    r"""Aggregate the metrics of benchmark results into percentile
+    summaries, overall and by level, and of tool calls by tool.
+
+    Results without metrics, e.g. those saved by older versions, are
+    skipped.
+
+    Args:
+        results (List[Dict[str, Any]]): The benchmark results.
+
+    Returns:
+        Dict[str, Any]: ``overall`` and ``by_level`` summaries of each task
+            field, and ``by_tool`` summaries of call durations with their
+            failure counts.
+    """
+    by_level: Dict[Any, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    tool_durations: Dict[str, List[float]] = defaultdict(list)
+    tool_failures: Dict[str, int] = defaultdict(int)
+
+    for result in results:
+        metrics = result.get("metrics")
+        if not metrics:
+            continue
+        for field in _TASK_FIELDS:
+            if field in metrics:
+                by_level[result.get("level")][field].append(metrics[field])
+        for round_data in result.get("history") or []:
+            for tool_call in round_data.get("tool_calls", []):
+                if "duration" not in tool_call:
+                    continue
+                tool_durations[tool_call["tool_name"]].append(tool_call["duration"])
+                tool_failures[tool_call["tool_name"]] += int(tool_call.get("failed", False))
+
+    overall: Dict[str, List[float]] = defaultdict(list)
+    for fields in by_level.values():
+        for field, values in fields.items():
+            overall[field].extend(values)
+
+    return {
+        "overall": {field: percentile_summary(values) for field, values in overall.items()},
+        "by_level": {
+            level: {field: percentile_summary(values) for field, values in fields.items()}
+            for level, fields in sorted(by_level.items(), key=lambda item: str(item[0]))
+        },
+        "by_tool": {
+            tool: {**percentile_summary(durations), "failed": tool_failures[tool]}
+            for tool, durations in sorted(
+                tool_durations.items(), key=lambda item: -sum(item[1])
+            )
+        },
+    }
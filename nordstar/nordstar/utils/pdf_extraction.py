@@ -0,0 +1,139 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def parse_page_range(page_range: Optional[str], num_pages: int) -> List[int]:
+    r"""Parse a 1-based page range specification into 0-based page indices.
+
+    Args:
+        page_range (str, optional): Comma separated pages and ranges, e.g.
+            ``"1-5,8,20-"``. Open ranges run to the first/last page.
+            :obj:`None` selects every page.
+        num_pages (int): The number of pages in the document.
+
+    Returns:
+        List[int]: The sorted, de-duplicated 0-based page indices.
+    """
+    if not page_range:
+        return list(range(num_pages))
+
+    indices = set()
+    for part in page_range.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start = int(start_str) if start_str.strip() else 1
+            end = int(end_str) if end_str.strip() else num_pages
+        else:
+            start = end = int(part)
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid page range: {part}")
+        indices.update(range(start - 1, min(end, num_pages)))
+    return sorted(indices)
+
+
+def iter_pdf_pages(
+    pdf_path: str, page_range: Optional[str] = None
+) -> Iterator[Tuple[int, str]]:
+    r"""Lazily extract the text of a PDF page by page.
+
+    Args:
+        pdf_path (str): The path of the PDF file.
+        page_range (str, optional): The pages to extract, see
+            :func:`parse_page_range`. (default: :obj:`None`)
+
+    Yields:
+        Tuple[int, str]: The 1-based page number and the text of the page.
+    """
+    from PyPDF2 import PdfReader
+
+    with open(pdf_path, "rb") as f:
+        reader = PdfReader(f)
+        for index in parse_page_range(page_range, len(reader.pages)):
+            yield index + 1, reader.pages[index].extract_text() or ""
+
+
+def _extract_pages(pdf_path: str, indices: List[int]) -> List[str]:
+    r"""Process pool worker: extract a span of pages with its own reader."""
+    from PyPDF2 import PdfReader
+
+    with open(pdf_path, "rb") as f:
+        reader = PdfReader(f)
+        return [reader.pages[index].extract_text() or "" for index in indices]
+
+
+def extract_pdf_text(
+    pdf_path: str,
+    page_range: Optional[str] = None,
+    processes: Optional[int] = None,
+    parallel_threshold: int = 64,
+    pages_per_task: int = 16,
+) -> str:
+    r"""Extract the text of a PDF, see :func:`extract_pdf_document`."""
+    text, _ = extract_pdf_document(
+        pdf_path, page_range, processes, parallel_threshold, pages_per_task
+    )
+    return text
+
+
+def extract_pdf_document(
+    pdf_path: str,
+    page_range: Optional[str] = None,
+    processes: Optional[int] = None,
+    parallel_threshold: int = 64,
+    pages_per_task: int = 16,
+) -> Tuple[str, int]:
+    r"""Extract the text of a PDF, in parallel for large documents, and
+    count its pages.
+
+    The document is parsed once in this process. Small documents are then
+    extracted page by page with the same reader. Documents with at least
+    :obj:`parallel_threshold` selected pages are split into spans of
+    :obj:`pages_per_task` pages, each extracted by a worker process, and
+    the results are joined in page order.
+
+    Args:
+        pdf_path (str): The path of the PDF file.
+        page_range (str, optional): The pages to extract, see
+            :func:`parse_page_range`. (default: :obj:`None`)
+        processes (int, optional): The number of worker processes. Defaults
+            to the number of CPUs. (default: :obj:`None`)
+        parallel_threshold (int, optional): The minimum number of pages for
+            which a process pool is used. (default: :obj:`64`)
+        pages_per_task (int, optional): The number of pages handed to a
+            worker at a time. (default: :obj:`16`)
+
+    Returns:
+        Tuple[str, int]: The text of the selected pages, and the number of
+            pages of the document.
+    """
+    from PyPDF2 import PdfReader
+
+    processes = processes or os.cpu_count() or 1
+    with open(pdf_path, "rb") as f:
+        reader = PdfReader(f)
+        num_pages = len(reader.pages)
+        indices = parse_page_range(page_range, num_pages)
+        if len(indices) < parallel_threshold or processes <= 1:
+            text = "".join(
+                reader.pages[index].extract_text() or "" for index in indices
+            )
+            return text, num_pages
+
+    spans = [
+        indices[i : i + pages_per_task] for i in range(0, len(indices), pages_per_task)
+    ]
+    logger.debug(
+        f"Extracting {len(indices)} pages of {pdf_path} with {processes} processes."
+    )
+    with ProcessPoolExecutor(max_workers=min(processes, len(spans))) as pool:
+        texts = pool.map(_extract_pages, [pdf_path] * len(spans), spans)
+        text = "".join(text for span_texts in texts for text in span_texts)
+    return text, num_pages
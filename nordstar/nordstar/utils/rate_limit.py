@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    r"""A thread-safe token bucket.
+
+    Up to :obj:`rate` units may be acquired per :obj:`period` seconds, with
+    bursts of up to :obj:`burst` units. Units are whatever the caller
+    counts: requests, society rounds or LLM tokens.
+
+    Args:
+        rate (float): The number of units per period.
+        period (float, optional): The period in seconds.
+            (default: :obj:`60.0`)
+        burst (float, optional): The bucket capacity. (default: :obj:`None`,
+            equal to :obj:`rate`)
+    """
+
+    def __init__(self, rate: float, period: float = 60.0, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.period = period
+        self.capacity = burst if burst is not None else rate
+        self._available = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._available = min(
+            self.capacity,
+            self._available + (now - self._updated) * self.rate / self.period,
+        )
+        self._updated = now
+
+    def _reserve(self, amount: float, cap: bool = True) -> float:
+        r"""Take :obj:`amount` units, returning how long the caller must wait
+        before using them. The bucket may go negative, so that callers are
+        served in order and large requests are not starved."""
+        if cap:
+            amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            self._available -= amount
+            if self._available >= 0:
+                return 0.0
+            return -self._available * self.period / self.rate
+
+    def acquire(self, amount: float = 1) -> float:
+        r"""Block until :obj:`amount` units are available. Returns the time
+        waited, in seconds."""
+        wait = self._reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, amount: float = 1) -> float:
+        r"""Asynchronous version of :meth:`acquire`."""
+        wait = self._reserve(amount)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def consume(self, amount: float) -> None:
+        r"""Record units used without waiting for them, e.g. the tokens of a
+        response whose size was only known afterwards. Later callers wait
+        until the debt is paid off."""
+        self._reserve(amount, cap=False)
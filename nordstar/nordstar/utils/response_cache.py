@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+from camel.logger import get_logger
+from openai.types.chat import ChatCompletion
+
+logger = get_logger(__name__)
+
+# Bump when the key or entry layout changes so stale entries are not served
+RESPONSE_CACHE_VERSION = "1"
+
+
+def _describe_response_format(response_format: Any) -> Any:
+    if response_format is None:
+        return None
+    schema = getattr(response_format, "model_json_schema", None)
+    if callable(schema):
+        return schema()
+    return str(response_format)
+
+
+class LLMResponseCache:
+    r"""An on-disk cache of model responses, for replaying benchmark runs.
+
+    A response is keyed by the SHA-256 of the model type, the model config,
+    the full message list, the tools and the response format, so a request
+    is only served from the cache if it is identical to a previous one.
+    Rerunning a task replays its conversation from the cache up to the
+    first request that differs, e.g. because a prompt or a tool result
+    changed. Sampling parameters are part of the key, but a cached response
+    is replayed even if they are not deterministic.
+
+    Entries are JSON files, sharded by the first two characters of the key.
+
+    Args:
+        cache_dir (str): The directory to store the cache in.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(
+        model_type: Any,
+        model_config: Optional[Dict[str, Any]],
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        response_format: Any = None,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "version": RESPONSE_CACHE_VERSION,
+                "model_type": str(model_type),
+                "model_config": model_config or {},
+                "messages": messages,
+                "tools": tools or [],
+                "response_format": _describe_response_format(response_format),
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[ChatCompletion]:
+        r"""Return the cached response, or :obj:`None` on a miss."""
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                response = ChatCompletion.model_validate(json.load(f)["response"])
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return response
+
+    def set(self, key: str, response: ChatCompletion) -> None:
+        r"""Store a response atomically."""
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"response": response.model_dump(mode="json")}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write response cache entry: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+class CachedModel:
+    r"""Wraps a model backend (or the model manager of a
+    :obj:`ChatAgent`) so that :meth:`run` and :meth:`arun` are served from
+    a :class:`LLMResponseCache`. Streamed responses are passed through
+    uncached. Other attributes are those of the wrapped model.
+
+    Args:
+        model (Any): The model backend or model manager.
+        cache (LLMResponseCache): The cache.
+    """
+
+    def __init__(self, model: Any, cache: LLMResponseCache):
+        self.model = model
+        self.cache = cache
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.model, name)
+
+    def _key(
+        self,
+        messages: List[Dict[str, Any]],
+        response_format: Any,
+        tools: Optional[List[Dict[str, Any]]],
+    ) -> str:
+        return self.cache.make_key(
+            getattr(self.model, "model_type", None),
+            getattr(self.model, "model_config_dict", None),
+            messages,
+            tools,
+            response_format,
+        )
+
+    def run(
+        self,
+        messages: List[Dict[str, Any]],
+        response_format: Any = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Any:
+        key = self._key(messages, response_format, tools)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        response = self.model.run(messages, response_format, tools)
+        if isinstance(response, ChatCompletion):
+            self.cache.set(key, response)
+        return response
+
+    async def arun(
+        self,
+        messages: List[Dict[str, Any]],
+        response_format: Any = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Any:
+        key = self._key(messages, response_format, tools)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        response = await self.model.arun(messages, response_format, tools)
+        if isinstance(response, ChatCompletion):
+            self.cache.set(key, response)
+        return response
@@ -0,0 +1,133 @@
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResultJournal:
+    r"""An append-only JSON Lines journal of benchmark results.
+
+    Every result is appended as one line and flushed (and by default
+    fsynced) before :meth:`append` returns, so checkpointing costs O(1) per
+    result and a crash can at worst truncate the line being written, which
+    :meth:`load` skips.
+
+    Args:
+        path (str): The path of the journal file.
+        fsync (bool, optional): Whether to fsync after every append.
+            (default: :obj:`True`)
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = None
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+                if self._ends_with_partial_line():
+                    # Terminate a line truncated by a crash, so that it does
+                    # not swallow the next record
+                    self._file.write("\n")
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def _ends_with_partial_line(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def load(self, key: Optional[str] = "task_id") -> List[Dict[str, Any]]:
+        r"""Read the journal, skipping lines that cannot be parsed.
+
+        Args:
+            key (str, optional): If given, only the last record for each
+                value of this field is kept, at the position of its first
+                occurrence. (default: :obj:`"task_id"`)
+
+        Returns:
+            List[Dict[str, Any]]: The records.
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        records: List[Dict[str, Any]] = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.warning(
+                        f"Skipping corrupt line {line_number} of {self.path}."
+                    )
+
+        if key is None:
+            return records
+        latest: Dict[Any, Dict[str, Any]] = {}
+        for record in records:
+            latest[record.get(key)] = record
+        return list(latest.values())
+
+    def compact(self, save_to: str, records: List[Dict[str, Any]]) -> None:
+        r"""Atomically write the records as a single JSON document, e.g. the
+        final results of a run, then empty the journal, whose records the
+        document now holds. Readers resume from the document updated by the
+        journal, so a crash in between only leaves duplicate records."""
+        write_json_atomic(save_to, records, fsync=self.fsync)
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if os.path.exists(self.path):
+                open(self.path, "w").close()
+
+
+def write_json_atomic(
+    path: str, records: List[Dict[str, Any]], fsync: bool = False
+) -> None:
+    r"""Write records as a JSON list, replacing :obj:`path` atomically.
+
+    Args:
+        path (str): The path of the JSON file.
+        records (List[Dict[str, Any]]): The records.
+        fsync (bool, optional): Whether to fsync the file before it replaces
+            :obj:`path`. (default: :obj:`False`)
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=4, ensure_ascii=False)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
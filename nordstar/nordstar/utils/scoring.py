@@ -0,0 +1,237 @@
+r"""Scoring of GAIA answers, following the official scorer
+https://huggingface.co/spaces/gaia-benchmark/leaderboard/blob/main/scorer.py
+
+Rescore saved results without rerunning the agents (from
+``nordstar/nordstar``)::
+
+    python -m utils.scoring results.json --output rescored.json
+"""
+
+import argparse
+import functools
+import json
+import re
+import string
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from camel.logger import get_logger
+
+from .result_journal import ResultJournal, write_json_atomic
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(r"\s")
+_LIST_SEPARATORS = re.compile(r"[,;]")
+_NUMBER_CHARS = str.maketrans("", "", "$%,")
+_PUNCTUATION = str.maketrans("", "", string.punctuation)
+
+
+def is_float(element: Any) -> bool:
+    try:
+        float(element)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def normalize_number_str(number_str: str) -> float:
+    r"""Parse a number, ignoring ``$``, ``%`` and ``,``. Returns infinity if
+    it is not a number, so that it equals no ground truth."""
+    try:
+        return float(number_str.translate(_NUMBER_CHARS))
+    except ValueError:
+        logger.debug(f"String {number_str} cannot be normalized to number str.")
+        return float("inf")
+
+
+@functools.lru_cache(maxsize=None)
+def _separator_pattern(char_list: Tuple[str, ...]) -> "re.Pattern":
+    return re.compile(f"[{re.escape(''.join(char_list))}]")
+
+
+def split_string(s: str, char_list: Optional[List[str]] = None) -> List[str]:
+    r"""Split a string based on a list of characters.
+
+    Args:
+        s (str): The string to split.
+        char_list (Optional[List[str]], optional): The list of characters to
+            split on. (default: :obj:`None`, ``,`` and ``;``)
+    """
+    if char_list is None:
+        return _LIST_SEPARATORS.split(s)
+    return _separator_pattern(tuple(char_list)).split(s)
+
+
+def normalize_str(input_str: str, remove_punct: bool = True) -> str:
+    r"""Normalize a string: remove whitespace, lower-case it and optionally
+    remove punctuation."""
+    no_spaces = _WHITESPACE.sub("", input_str).lower()
+    if remove_punct:
+        return no_spaces.translate(_PUNCTUATION)
+    return no_spaces
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_ground_truth(ground_truth: str) -> Tuple[str, Any]:
+    r"""Parse a ground truth once into its kind and normalized value, since
+    the same ground truths are scored against many answers."""
+    if is_float(ground_truth):
+        return "number", float(ground_truth)
+    if any(char in ground_truth for char in [",", ";"]):
+        elements = []
+        for element in split_string(ground_truth):
+            if is_float(element):
+                elements.append((True, float(element)))
+            else:
+                elements.append((False, normalize_str(element, remove_punct=False)))
+        return "list", elements
+    return "string", normalize_str(ground_truth)
+
+
+def score_answer(model_answer: Optional[str], ground_truth: str) -> bool:
+    r"""Score a model answer against a GAIA ground truth.
+
+    Numbers are compared as floats, comma or semicolon separated lists
+    element by element, and other strings after normalization.
+
+    Args:
+        model_answer (str, optional): The model answer. :obj:`None` scores
+            :obj:`False`.
+        ground_truth (str): The ground truth answer.
+
+    Returns:
+        bool: Whether the answer is correct.
+    """
+    if model_answer is None:
+        return False
+    kind, expected = _parse_ground_truth(str(ground_truth))
+    model_answer = str(model_answer)
+
+    if kind == "number":
+        return normalize_number_str(model_answer) == expected
+
+    if kind == "list":
+        elements = split_string(model_answer)
+        if len(elements) != len(expected):
+            logger.debug("Answer lists have different lengths, returning False.")
+            return False
+        for element, (is_number, expected_element) in zip(elements, expected):
+            if is_number:
+                if normalize_number_str(element) != expected_element:
+                    return False
+            elif normalize_str(element, remove_punct=False) != expected_element:
+                return False
+        return True
+
+    return normalize_str(model_answer) == expected
+
+
+def score_answers(
+    model_answers: Sequence[Optional[str]], ground_truths: Sequence[str]
+) -> List[bool]:
+    r"""Score answers in bulk, see :func:`score_answer`. Each distinct
+    ground truth is parsed only once."""
+    if len(model_answers) != len(ground_truths):
+        raise ValueError(
+            f"Got {len(model_answers)} answers for {len(ground_truths)} ground truths."
+        )
+    return [
+        score_answer(model_answer, ground_truth)
+        for model_answer, ground_truth in zip(model_answers, ground_truths)
+    ]
+
+
+def load_results(path: str) -> List[Dict[str, Any]]:
+    r"""Load benchmark results saved as a JSON list or as a JSON Lines
+    journal, keeping the latest result of each task."""
+    if path.endswith(".jsonl"):
+        return ResultJournal(path).load()
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def rescore_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    r"""Rescore benchmark results in place with the current scoring rules.
+
+    Args:
+        results (List[Dict[str, Any]]): The results, each with a
+            ``model_answer`` and a ``ground_truth``.
+
+    Returns:
+        Dict[str, Any]: The number of results, of correct ones and of those
+            whose score changed, the ids of the changed tasks, the accuracy,
+            and the accuracy by level.
+    """
+    scorable = [result for result in results if result.get("ground_truth") is not None]
+    scores = score_answers(
+        [result.get("model_answer") for result in scorable],
+        [result["ground_truth"] for result in scorable],
+    )
+
+    changed = []
+    for result, score in zip(scorable, scores):
+        if bool(result.get("score")) != score:
+            changed.append(result.get("task_id"))
+        result["score"] = score
+
+    by_level: Dict[str, List[int]] = {}
+    for result in results:
+        counts = by_level.setdefault(str(result.get("level")), [0, 0])
+        counts[0] += int(bool(result.get("score")))
+        counts[1] += 1
+
+    correct = sum(bool(result.get("score")) for result in results)
+    return {
+        "total": len(results),
+        "correct": correct,
+        "accuracy": correct / len(results) if results else 0,
+        "changed": len(changed),
+        "changed_task_ids": changed,
+        "accuracy_by_level": {
+            level: correct_count / total
+            for level, (correct_count, total) in sorted(by_level.items())
+        },
+    }
+
+
+def save_results(results: List[Dict[str, Any]], path: str) -> None:
+    r"""Save results as a JSON list, or as JSON Lines if :obj:`path` ends
+    with ``.jsonl``."""
+    if not path.endswith(".jsonl"):
+        write_json_atomic(path, results)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rescore saved GAIA results")
+    parser.add_argument("results", help="Results saved as JSON or JSON Lines")
+    parser.add_argument("--output", help="Where to save the rescored results")
+    parser.add_argument(
+        "--show-changed", action="store_true", help="List the tasks whose score changed"
+    )
+    args = parser.parse_args(argv)
+
+    results = load_results(args.results)
+    summary = rescore_results(results)
+    print(
+        f"{summary['correct']}/{summary['total']} correct "
+        f"(accuracy {summary['accuracy']:.4f}), {summary['changed']} scores changed"
+    )
+    for level, accuracy in summary["accuracy_by_level"].items():
+        print(f"  level {level}: {accuracy:.4f}")
+    if args.show_changed:
+        for task_id in summary["changed_task_ids"]:
+            print(f"  changed: {task_id}")
+
+    if args.output:
+        save_results(results, args.output)
+        print(f"Saved rescored results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,460 @@
+import json
+import os
+import random
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+STRUCTURED_EXTENSIONS = [".json", ".jsonl", ".jsonld", ".xml"]
+
+_READ_SIZE = 1024 * 1024
+_PATH_SEGMENT = re.compile(r"([^.\[\]]+)|\[(\*|\d+)\]")
+_SEPARATORS = re.compile(r"[\s,]*")
+_WHERE_PATTERN = re.compile(r"^\s*(.+?)\s*(==|!=|=|~)\s*(.*?)\s*$")
+
+
+def _extension(path: str) -> str:
+    return os.path.splitext(path)[1].lower()
+
+
+def _iter_json_lines(path: str) -> Iterator[Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                logger.debug(f"Skipping invalid line {line_number} of {path}: {e}")
+
+
+class _JsonStream:
+    r"""Decodes the values of a JSON document incrementally, keeping at most
+    one value (plus a read buffer) in memory."""
+
+    def __init__(self, f):
+        self.f = f
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> None:
+        chunk = self.f.read(_READ_SIZE)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+
+    def peek(self) -> str:
+        r"""Skip whitespace and commas, and return the next character."""
+        while True:
+            self.pos = _SEPARATORS.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos : self.pos + 1]
+            self._fill()
+
+    def expect(self, char: str) -> None:
+        while self.pos >= len(self.buffer) and not self.eof:
+            self._fill()
+        if not self.buffer.startswith(char, self.pos):
+            raise ValueError(f"Expected {char!r} in JSON document")
+        self.pos += 1
+
+    def decode(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number at the very end of the buffer may continue in the
+                # next read
+                complete = end < len(self.buffer) or self.eof
+            except ValueError:
+                if self.eof:
+                    raise
+                complete = False
+            if complete:
+                self.pos = end
+                return value
+            self._fill()
+
+    def items(self) -> Iterator[Any]:
+        r"""Decode the items of an array whose ``[`` was consumed."""
+        while self.peek() != "]":
+            if not self.peek():
+                raise ValueError("Unterminated JSON array")
+            yield self.decode()
+        self.pos += 1
+
+
+def _iter_json_stream(f) -> Iterator[Tuple[str, Any]]:
+    stream = _JsonStream(f)
+    first = stream.peek()
+    if first == "[":
+        stream.pos += 1
+        for item in stream.items():
+            yield "[*]", item
+        return
+    if first != "{":
+        yield "$", stream.decode()
+        return
+
+    stream.pos += 1
+    while stream.peek() != "}":
+        key = stream.decode()
+        stream.peek()
+        stream.expect(":")
+        if stream.peek() == "[":
+            stream.pos += 1
+            for item in stream.items():
+                yield f"{key}[*]", item
+        else:
+            yield key, {"key": key, "value": stream.decode()}
+
+
+def _build_ijson_value(event: str, value: Any, events: Iterator, ijson) -> Any:
+    if event not in ("start_map", "start_array"):
+        return value
+    builder = ijson.ObjectBuilder()
+    builder.event(event, value)
+    depth = 1
+    for _, event, value in events:
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+            if depth == 0:
+                break
+    return builder.value
+
+
+def _iter_ijson_items(events: Iterator, ijson) -> Iterator[Any]:
+    r"""Build the items of an array whose ``start_array`` was consumed."""
+    for _, event, value in events:
+        if event == "end_array":
+            return
+        yield _build_ijson_value(event, value, events, ijson)
+
+
+def _iter_ijson(f, ijson) -> Iterator[Tuple[str, Any]]:
+    events = ijson.parse(f, use_float=True)
+    _, event, value = next(events)
+    if event == "start_array":
+        for item in _iter_ijson_items(events, ijson):
+            yield "[*]", item
+        return
+    if event != "start_map":
+        yield "$", _build_ijson_value(event, value, events, ijson)
+        return
+
+    for _, event, key in events:
+        if event == "end_map":
+            return
+        _, event, value = next(events)
+        if event == "start_array":
+            for item in _iter_ijson_items(events, ijson):
+                yield f"{key}[*]", item
+        else:
+            yield key, {"key": key, "value": _build_ijson_value(event, value, events, ijson)}
+
+
+def _iter_json(path: str) -> Iterator[Tuple[str, Any]]:
+    r"""Yield the records of a JSON document with the path they are read
+    from: the items of a top-level array (``[*]``), the items of each array
+    member of a top-level object (e.g. ``data[*]`` for ``{"data": [...]}``)
+    and the other members as ``{"key": ..., "value": ...}`` records. Arrays
+    are streamed item by item, with ``ijson`` if installed."""
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    if ijson is not None:
+        with open(path, "rb") as f:
+            yield from _iter_ijson(f, ijson)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        yield from _iter_json_stream(f)
+
+
+def _element_to_dict(element: ElementTree.Element) -> Any:
+    r"""Convert an element in the layout of ``xmltodict``: attributes as
+    ``@name``, text as ``#text`` and repeated children as lists."""
+    result: Dict[str, Any] = {f"@{name}": value for name, value in element.attrib.items()}
+    for child in element:
+        value = _element_to_dict(child)
+        if child.tag in result:
+            if not isinstance(result[child.tag], list):
+                result[child.tag] = [result[child.tag]]
+            result[child.tag].append(value)
+        else:
+            result[child.tag] = value
+    text = (element.text or "").strip()
+    if not result:
+        return text or None
+    if text:
+        result["#text"] = text
+    return result
+
+
+def _iter_xml(path: str) -> Iterator[Tuple[str, Any]]:
+    r"""Yield the children of the root element as ``(tag, record)`` pairs,
+    freeing each one once converted."""
+    depth = 0
+    root = None
+    for event, element in ElementTree.iterparse(path, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if root is None:
+                root = element
+            continue
+        depth -= 1
+        if depth == 1:
+            yield element.tag, _element_to_dict(element)
+            # Drop the converted record from the tree
+            root.clear()
+
+
+def iter_records(path: str) -> Iterator[Any]:
+    r"""Stream the records of a JSON, JSON Lines or XML file.
+
+    Args:
+        path (str): The path of the file.
+
+    Yields:
+        Any: For JSON, the items of a top-level array or of the arrays in
+            a top-level object (see :func:`_iter_json`); for JSON Lines,
+            each line; for XML, each child of the root element as a
+            dictionary.
+    """
+    for _, record in _iter_sourced_records(path):
+        yield record
+
+
+def _iter_sourced_records(path: str) -> Iterator[Tuple[str, Any]]:
+    r"""Like :func:`iter_records`, with where each record is read from: its
+    JSON path, or its XML element as ``<tag>``."""
+    extension = _extension(path)
+    if extension == ".jsonl":
+        for record in _iter_json_lines(path):
+            yield "", record
+    elif extension == ".xml":
+        for tag, record in _iter_xml(path):
+            yield f"<{tag}>", record
+    else:
+        yield from _iter_json(path)
+
+
+def _type_name(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    return type(value).__name__
+
+
+def _collect_schema(
+    value: Any, path: str, schema: Dict[str, Dict[str, None]], max_items: int = 20
+) -> None:
+    r"""Collect the types at each path of a record, as ordered sets."""
+    schema.setdefault(path or "$", {})[_type_name(value)] = None
+    if isinstance(value, dict):
+        for key, child in value.items():
+            _collect_schema(child, f"{path}.{key}" if path else key, schema, max_items)
+    elif isinstance(value, list):
+        for child in value[:max_items]:
+            _collect_schema(child, f"{path}[]", schema, max_items)
+
+
+def _truncate(value: Any, max_chars: int = 500) -> str:
+    text = json.dumps(value, ensure_ascii=False, default=str)
+    return text if len(text) <= max_chars else text[:max_chars] + "..."
+
+
+def summarize_structured_file(
+    path: str,
+    sample_size: int = 5,
+    schema_records: int = 10000,
+    max_schema_paths: int = 100,
+) -> str:
+    r"""Describe a large JSON, JSON Lines or XML file in a single streaming
+    pass: its record count, a schema outline and sampled records.
+
+    Args:
+        path (str): The path of the file.
+        sample_size (int, optional): The number of records to show, the
+            first ones and a uniform sample of the rest.
+            (default: :obj:`5`)
+        schema_records (int, optional): The number of records the schema
+            is inferred from. (default: :obj:`10000`)
+        max_schema_paths (int, optional): The maximum number of schema
+            paths to list. (default: :obj:`100`)
+
+    Returns:
+        str: The summary.
+    """
+    # The types at each path, and the number of records that have it
+    schema: Dict[str, Counter] = defaultdict(Counter)
+    path_records: Counter = Counter()
+    head: List[Any] = []
+    reservoir: List[Any] = []
+    rng = random.Random(0)
+    count = 0
+    sources: Counter = Counter()
+
+    def counted_records() -> Iterator[Any]:
+        for source, record in _iter_sourced_records(path):
+            sources[source] += 1
+            yield record
+
+    head_size = (sample_size + 1) // 2
+    reservoir_size = sample_size - head_size
+    for record in counted_records():
+        if count < schema_records:
+            record_schema: Dict[str, Dict[str, None]] = {}
+            _collect_schema(record, "", record_schema)
+            for schema_path, types in record_schema.items():
+                path_records[schema_path] += 1
+                schema[schema_path].update(types.keys())
+        if count < head_size:
+            head.append(record)
+        elif reservoir_size:
+            # Reservoir sampling over the records after the head
+            seen = count - head_size
+            if seen < reservoir_size:
+                reservoir.append(record)
+            else:
+                slot = rng.randint(0, seen)
+                if slot < reservoir_size:
+                    reservoir[slot] = record
+        count += 1
+
+    analysed = min(count, schema_records)
+    lines = [
+        f"The file {path} ({os.path.getsize(path)} bytes) is too large to return "
+        f"in full. It contains {count} records."
+    ]
+    if set(sources) - {"", "[*]"}:
+        lines.append(
+            "Records by path: "
+            + ", ".join(f"{source} x{n}" for source, n in sources.most_common(10))
+        )
+    lines += [
+        "",
+        f"Schema (path: types, share of the first {analysed} records):",
+    ]
+    for schema_path, types in list(schema.items())[:max_schema_paths]:
+        type_list = "|".join(name for name, _ in types.most_common())
+        lines.append(f"  {schema_path}: {type_list} ({path_records[schema_path]}/{analysed})")
+    if len(schema) > max_schema_paths:
+        lines.append(f"  ... {len(schema) - max_schema_paths} more paths")
+
+    lines += ["", "Sample records:"]
+    for record in head + reservoir:
+        lines.append(f"  {_truncate(record)}")
+    lines += [
+        "",
+        "Use `query_data_file` with a path such as `user.name` or `items[*].id` "
+        "(relative to each record) and an optional filter to read specific values.",
+    ]
+    return "\n".join(lines)
+
+
+def _parse_path(path: str) -> List[str]:
+    path = path.strip()
+    if path in ("", "$"):
+        return []
+    if path.startswith("$."):
+        path = path[2:]
+    return [match.group(1) or f"[{match.group(2)}]" for match in _PATH_SEGMENT.finditer(path)]
+
+
+def resolve_path(value: Any, path: str) -> List[Any]:
+    r"""Resolve a dotted path like ``items[*].price`` in a record. Returns
+    every match, since ``[*]`` fans out over lists."""
+    matches = [value]
+    for segment in _parse_path(path):
+        next_matches = []
+        for match in matches:
+            if segment == "[*]":
+                if isinstance(match, list):
+                    next_matches.extend(match)
+            elif segment.startswith("["):
+                index = int(segment[1:-1])
+                if isinstance(match, list) and index < len(match):
+                    next_matches.append(match[index])
+            elif isinstance(match, dict) and segment in match:
+                next_matches.append(match[segment])
+            elif isinstance(match, list):
+                # Like xmltodict data, step into lists implicitly
+                next_matches.extend(
+                    item[segment]
+                    for item in match
+                    if isinstance(item, dict) and segment in item
+                )
+        matches = next_matches
+    return matches
+
+
+def _matches_filter(record: Any, where: Optional[str]) -> bool:
+    if not where:
+        return True
+    condition = _WHERE_PATTERN.match(where)
+    if condition is None:
+        raise ValueError(f"Invalid filter: {where}, expected e.g. `status == active`")
+    path, operator, expected = condition.groups()
+    values = [str(value) for value in resolve_path(record, path)]
+    if operator in ("=", "=="):
+        return expected in values
+    if operator == "!=":
+        return expected not in values
+    return any(expected.lower() in value.lower() for value in values)
+
+
+def query_structured_file(
+    path: str, query_path: str, where: Optional[str] = None, limit: int = 20
+) -> Dict[str, Any]:
+    r"""Stream a JSON, JSON Lines or XML file and collect the values at
+    :obj:`query_path` of the records matching :obj:`where`.
+
+    Args:
+        path (str): The path of the file.
+        query_path (str): A path relative to each record, see
+            :func:`resolve_path`. ``$`` selects the whole record.
+        where (str, optional): A filter like ``status == active``,
+            ``id != 3`` or ``name ~ smith`` (case-insensitive substring).
+            (default: :obj:`None`)
+        limit (int, optional): The maximum number of values to return.
+            (default: :obj:`20`)
+
+    Returns:
+        Dict[str, Any]: The values, the number of matching records and
+            whether the result was truncated.
+    """
+    values: List[Any] = []
+    matched = 0
+    truncated = False
+    for record in iter_records(path):
+        if not _matches_filter(record, where):
+            continue
+        matched += 1
+        if truncated:
+            continue
+        found = resolve_path(record, query_path)
+        # Only truncated once a value beyond the limit is actually found
+        truncated = len(values) + len(found) > limit
+        values.extend(found[: limit - len(values)])
+    return {"values": values, "matched_records": matched, "truncated": truncated}
@@ -0,0 +1,251 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import itertools
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from camel.toolkits.function_tool import FunctionTool
+from camel.logger import get_logger
+
+logger = get_logger(__name__)
+
+_MISSING = object()
+
+
+def _is_cacheable_result(result: Any) -> bool:
+    r"""Only successful tool results are cached: toolkits report failures
+    either as ``{"error": ...}`` dicts or as ``(False, message)`` tuples."""
+    if isinstance(result, dict) and "error" in result:
+        return False
+    if isinstance(result, tuple) and len(result) > 0 and result[0] is False:
+        return False
+    return True
+
+
+class ToolResultCache:
+    r"""A thread-safe, size-bounded LRU cache for tool call results with
+    per-tool time-to-live.
+
+    Args:
+        max_size (int, optional): The maximum number of cached results.
+            (default: :obj:`1024`)
+        default_ttl (float, optional): Time-to-live in seconds for tools
+            without an explicit entry in :obj:`ttl`. (default: :obj:`300`)
+        ttl (Dict[str, float], optional): Per-tool time-to-live in seconds,
+            keyed by tool name. A TTL of ``0`` disables caching for that tool.
+            (default: :obj:`None`)
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        default_ttl: float = 300,
+        ttl: Optional[Dict[str, float]] = None,
+    ):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.ttl = ttl or {}
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get_ttl(self, tool_name: str) -> float:
+        return self.ttl.get(tool_name, self.default_ttl)
+
+    def get(self, tool_name: str, args_key: str) -> Any:
+        r"""Return the cached result, or :obj:`_MISSING` if there is no fresh
+        entry."""
+        key = (tool_name, args_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            expires_at, result = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def set(self, tool_name: str, args_key: str, result: Any) -> None:
+        ttl = self.get_ttl(tool_name)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[(tool_name, args_key)] = (time.monotonic() + ttl, result)
+            self._entries.move_to_end((tool_name, args_key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_cache: Optional[ToolResultCache] = None
+
+
+def get_default_tool_cache() -> ToolResultCache:
+    r"""Return the process-wide cache shared across `run_society` sessions."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ToolResultCache()
+    return _default_cache
+
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+# Distinguishes toolkit instances whose configuration cannot be compared
+_instance_tokens: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+_instance_counter = itertools.count()
+_instance_lock = threading.Lock()
+
+
+def _is_scalar(value: Any) -> bool:
+    if isinstance(value, (list, tuple)):
+        return all(isinstance(item, _SCALAR_TYPES) for item in value)
+    return isinstance(value, _SCALAR_TYPES)
+
+
+def _instance_key(func: Callable) -> str:
+    r"""Identify the toolkit a tool is bound to, so that differently
+    configured toolkits (e.g. mainnet and testnet) do not share results.
+
+    Toolkits whose attributes are all plain values are keyed by their class
+    and those values, so equally configured instances share results.
+    Otherwise the instance itself is part of the key. The values are hashed,
+    since they include API keys and the key is logged. Wrappers made with
+    :func:`functools.wraps`, e.g. by ``compact_tool``, are unwrapped to find
+    the instance.
+    """
+    bound = inspect.unwrap(func, stop=lambda f: hasattr(f, "__self__"))
+    instance = getattr(bound, "__self__", None)
+    if instance is None:
+        return ""
+    cls = type(instance)
+    attributes = getattr(instance, "__dict__", {})
+    config = {name: value for name, value in attributes.items() if _is_scalar(value)}
+    digest = hashlib.sha256(
+        json.dumps(config, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:16]
+    key = f"{cls.__module__}.{cls.__qualname__}|{digest}"
+    if len(config) < len(attributes):
+        with _instance_lock:
+            try:
+                token = _instance_tokens.setdefault(instance, next(_instance_counter))
+            except TypeError:
+                token = id(instance)
+        key += f"|#{token}"
+    return key
+
+
+def _make_args_key(signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    try:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+    except TypeError:
+        arguments = {"args": args, "kwargs": kwargs}
+    return json.dumps(arguments, sort_keys=True, default=str)
+
+
+def cached_tool(
+    tool: FunctionTool,
+    cache: Optional[ToolResultCache] = None,
+    is_cacheable: Callable[[Any], bool] = _is_cacheable_result,
+) -> FunctionTool:
+    r"""Wrap a FunctionTool so that repeated calls with the same arguments
+    are served from the cache.
+
+    Args:
+        tool (FunctionTool): The tool to wrap.
+        cache (ToolResultCache, optional): The cache to use. Defaults to the
+            process-wide cache. (default: :obj:`None`)
+        is_cacheable (Callable[[Any], bool], optional): Decides whether a
+            result may be cached. By default error results are not cached.
+
+    Returns:
+        FunctionTool: The memoized tool, with the original schema.
+    """
+    if cache is None:
+        cache = get_default_tool_cache()
+    func = tool.func
+    tool_name = tool.get_function_name()
+    # Results are keyed by the arguments and the toolkit the tool is bound to
+    instance_key = _instance_key(func)
+    signature = inspect.signature(func)
+
+    if asyncio.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            args_key = instance_key + _make_args_key(signature, args, kwargs)
+            result = cache.get(tool_name, args_key)
+            if result is not _MISSING:
+                logger.debug(f"Tool cache hit for {tool_name}({args_key})")
+                return result
+            result = await func(*args, **kwargs)
+            if is_cacheable(result):
+                cache.set(tool_name, args_key, result)
+            return result
+
+        wrapper = async_wrapper
+
+    else:
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            args_key = instance_key + _make_args_key(signature, args, kwargs)
+            result = cache.get(tool_name, args_key)
+            if result is not _MISSING:
+                logger.debug(f"Tool cache hit for {tool_name}({args_key})")
+                return result
+            result = func(*args, **kwargs)
+            if is_cacheable(result):
+                cache.set(tool_name, args_key, result)
+            return result
+
+        wrapper = sync_wrapper
+
+    return FunctionTool(wrapper, openai_tool_schema=tool.get_openai_tool_schema())
+
+
+def cached_tools(
+    tools: List[FunctionTool],
+    cache: Optional[ToolResultCache] = None,
+    is_cacheable: Callable[[Any], bool] = _is_cacheable_result,
+) -> List[FunctionTool]:
+    r"""Memoize every tool returned by a toolkit's `get_tools()`.
+
+    Example:
+        tools = cached_tools(
+            InjectiveToolkit().get_tools(),
+            cache=ToolResultCache(ttl={"get_market_data": 15}),
+        )
+
+    Args:
+        tools (List[FunctionTool]): The tools to wrap.
+        cache (ToolResultCache, optional): The cache to use. Defaults to the
+            process-wide cache. (default: :obj:`None`)
+        is_cacheable (Callable[[Any], bool], optional): Decides whether a
+            result may be cached.
+
+    Returns:
+        List[FunctionTool]: The memoized tools.
+    """
+    return [cached_tool(tool, cache=cache, is_cacheable=is_cacheable) for tool in tools]
@@ -0,0 +1,333 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+import requests
+from camel.logger import get_logger
+from requests.adapters import HTTPAdapter
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class UrlMetadata:
+    r"""What the server reported about a URL.
+
+    Args:
+        url (str): The requested URL.
+        content_type (str): The lower-cased ``Content-Type`` header.
+        etag (str, optional): The ``ETag`` header.
+        last_modified (str, optional): The ``Last-Modified`` header.
+        content_length (int, optional): The ``Content-Length`` header.
+        fetched_at (float): When the metadata was fetched, as a UNIX time.
+    """
+
+    url: str
+    content_type: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_length: Optional[int] = None
+    fetched_at: float = 0.0
+
+    @classmethod
+    def from_response(cls, url: str, response: requests.Response) -> "UrlMetadata":
+        length = response.headers.get("Content-Length")
+        return cls(
+            url=url,
+            content_type=response.headers.get("Content-Type", "").lower(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            content_length=int(length) if length and length.isdigit() else None,
+            fetched_at=time.time(),
+        )
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+
+def _lock_holder_alive(lock_path: str) -> bool:
+    r"""Whether the process that wrote a lock file still runs. An empty lock
+    counts as held while it is being written."""
+    try:
+        with open(lock_path, "r") as f:
+            content = f.read().strip()
+        age = time.time() - os.path.getmtime(lock_path)
+    except FileNotFoundError:
+        return False
+    if not content.isdigit():
+        return age < 10
+    try:
+        os.kill(int(content), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class UrlMetadataCache:
+    r"""Caches HEAD metadata of URLs and downloads files over a pooled
+    :obj:`requests.Session`.
+
+    Metadata younger than :obj:`ttl` seconds is served without a request.
+    Downloads are conditional: a file already on disk is revalidated with
+    ``If-None-Match``/``If-Modified-Since`` and kept on ``304``, and an
+    interrupted download is resumed from its ``.part`` file with a
+    ``Range`` request, also by a later process. A ``.part.lock`` file
+    created with ``O_EXCL`` ensures one process at a time writes it.
+
+    Metadata is persisted by appending a JSON line per update, and the file
+    is rewritten with the live entries only once most of its lines are
+    superseded. At most :obj:`max_entries` URLs are kept, the least recently
+    fetched ones are dropped first.
+
+    Args:
+        cache_path (str, optional): A JSON Lines file to persist metadata
+            in. Metadata is kept in memory only if not given.
+            (default: :obj:`None`)
+        ttl (float, optional): How long metadata is trusted, in seconds.
+            (default: :obj:`3600`)
+        pool_size (int, optional): The number of pooled connections per
+            host. (default: :obj:`16`)
+        timeout (float, optional): The timeout of HEAD requests and of the
+            connection of downloads, in seconds. (default: :obj:`10`)
+        lock_timeout (float, optional): How long to wait for another
+            process downloading the same file, in seconds.
+            (default: :obj:`600`)
+        max_entries (int, optional): The maximum number of URLs kept.
+            (default: :obj:`10000`)
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        ttl: float = 3600,
+        pool_size: int = 16,
+        timeout: float = 10,
+        lock_timeout: float = 600,
+        max_entries: int = 10000,
+    ):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, UrlMetadata] = {}
+        # The number of lines of `cache_path`, superseded ones included
+        self._lines = 0
+        # Whether the file ends with a line cut short, e.g. by a crash
+        self._partial_line = False
+        # The lock of each file being downloaded and its number of users
+        self._download_locks: Dict[str, List] = {}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._load()
+
+    def _load(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._partial_line = not line.endswith("\n")
+                    try:
+                        entry = UrlMetadata(**json.loads(line))
+                    except (ValueError, TypeError):
+                        # E.g. a line cut short by a crash
+                        continue
+                    self._entries[entry.url] = entry
+                    self._lines += 1
+        except OSError:
+            self._entries = {}
+        if len(self._entries) > self.max_entries or self._should_compact():
+            self._prune()
+            self._compact()
+
+    def _should_compact(self) -> bool:
+        return self._lines > max(1024, 2 * len(self._entries))
+
+    def _prune(self) -> None:
+        r"""Drop the least recently fetched entries down to 90% of
+        :obj:`max_entries`, so that pruning is not repeated on every store."""
+        excess = len(self._entries) - int(self.max_entries * 0.9)
+        if excess <= 0:
+            return
+        oldest = sorted(self._entries.values(), key=lambda entry: entry.fetched_at)
+        for entry in oldest[:excess]:
+            del self._entries[entry.url]
+
+    def _compact(self) -> None:
+        r"""Rewrite :obj:`cache_path` with the live entries only."""
+        if self.cache_path is None:
+            return
+        directory = os.path.dirname(self.cache_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for entry in self._entries.values():
+                    f.write(json.dumps(asdict(entry)) + "\n")
+            os.replace(tmp_path, self.cache_path)
+            self._lines = len(self._entries)
+            self._partial_line = False
+        except OSError as e:
+            logger.warning(f"Failed to persist URL metadata: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _store(self, metadata: UrlMetadata) -> None:
+        with self._lock:
+            self._entries.pop(metadata.url, None)
+            self._entries[metadata.url] = metadata
+            if len(self._entries) > self.max_entries:
+                self._prune()
+                self._compact()
+                return
+            if self.cache_path is None:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+                with open(self.cache_path, "a", encoding="utf-8") as f:
+                    if self._partial_line:
+                        f.write("\n")
+                        self._partial_line = False
+                    f.write(json.dumps(asdict(metadata)) + "\n")
+                self._lines += 1
+            except OSError as e:
+                logger.warning(f"Failed to persist URL metadata: {e}")
+            if self._should_compact():
+                self._compact()
+
+    def get(self, url: str, refresh: bool = False) -> Optional[UrlMetadata]:
+        r"""Return the metadata of a URL, sending a HEAD request only if it
+        is unknown or older than :obj:`ttl`.
+
+        Returns:
+            Optional[UrlMetadata]: The metadata, or :obj:`None` if the
+                request failed.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is not None and not refresh and time.time() - entry.fetched_at < self.ttl:
+            return entry
+
+        response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+        metadata = UrlMetadata.from_response(url, response)
+        self._store(metadata)
+        return metadata
+
+    def fingerprint(self, url: str) -> Optional[str]:
+        r"""Fingerprint a URL by its validators, see
+        :meth:`DocumentCache.fingerprint_url`."""
+        try:
+            metadata = self.get(url)
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"Could not fingerprint {url}: {e}")
+            return None
+        if metadata is None or not metadata.has_validators:
+            return None
+        return f"{url}|{metadata.etag}|{metadata.last_modified}"
+
+    def download(self, url: str, file_path: str, chunk_size: int = 1024 * 1024) -> str:
+        r"""Download a URL to :obj:`file_path`, skipping the transfer if the
+        local copy is still current and resuming partial downloads.
+
+        Raises:
+            requests.exceptions.RequestException: If the download failed.
+        """
+        # Concurrent downloads of the same file would share its .part file
+        with self._lock:
+            entry = self._download_locks.setdefault(file_path, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                self._claim(file_path)
+                try:
+                    return self._download(url, file_path, chunk_size)
+                finally:
+                    os.remove(f"{file_path}.part.lock")
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._download_locks[file_path]
+
+    def _claim(self, file_path: str) -> None:
+        r"""Create the lock file of a download, waiting for another process
+        holding it and taking over locks of processes that no longer run."""
+        lock_path = f"{file_path}.part.lock"
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not _lock_holder_alive(lock_path):
+                    logger.debug(f"Taking over the stale lock {lock_path}")
+                    try:
+                        os.remove(lock_path)
+                    except FileNotFoundError:
+                        pass
+                    continue
+                if time.monotonic() > deadline:
+                    raise requests.exceptions.RequestException(
+                        f"Timed out waiting for another download of {file_path}"
+                    )
+                time.sleep(0.2)
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return
+
+    def _download(self, url: str, file_path: str, chunk_size: int) -> str:
+        with self._lock:
+            known = self._entries.get(url)
+
+        headers = {}
+        if os.path.isfile(file_path) and known is not None and known.has_validators:
+            if known.etag:
+                headers["If-None-Match"] = known.etag
+            if known.last_modified:
+                headers["If-Modified-Since"] = known.last_modified
+
+        part_path = f"{file_path}.part"
+        resume_from = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+        if resume_from and not headers and known is not None:
+            # Only resume if the remote file has not changed since; If-Range
+            # takes a strong ETag or else the modification date
+            if known.etag and not known.etag.startswith("W/"):
+                headers["If-Range"] = known.etag
+            elif known.last_modified:
+                headers["If-Range"] = known.last_modified
+            if headers:
+                headers["Range"] = f"bytes={resume_from}-"
+
+        with self.session.get(
+            url, headers=headers, stream=True, timeout=self.timeout
+        ) as response:
+            if response.status_code == 304:
+                logger.debug(f"{file_path} is up to date with {url}")
+                return file_path
+            response.raise_for_status()
+
+            mode = "ab" if response.status_code == 206 else "wb"
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+            os.replace(part_path, file_path)
+
+            metadata = UrlMetadata.from_response(url, response)
+            if response.status_code == 206 and known is not None:
+                # A partial response reports the length of the range only
+                metadata.content_length = known.content_length
+            self._store(metadata)
+        return file_path